@@ -0,0 +1,25 @@
+import subprocess
+import numpy as np
+
+DECODE_TIMEOUT = 10.0 # seconds; a 5 s WebM chunk decodes in a few milliseconds
+
+def ffmpeg_pcm_command(sample_rate: int, source: str = "pipe:0") -> list:
+    """ffmpeg arguments that decode ``source`` to mono float32 PCM at ``sample_rate`` on stdout."""
+    return [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-i', source,
+        '-f', 'f32le', '-acodec', 'pcm_f32le',
+        '-ac', '1', '-ar', str(sample_rate),
+        'pipe:1',
+    ]
+
+def decode_audio(audio_bytes: bytes, sample_rate: int) -> np.ndarray:
+    """
+    Decode an uploaded chunk (WebM/Opus, WAV, ...) to a float32 mono waveform in memory.
+
+    Bytes go in on ffmpeg's stdin and raw samples come back on stdout, so nothing touches the
+    disk and ffmpeg's resampler is the only one that runs.
+    """
+    proc = subprocess.run(ffmpeg_pcm_command(sample_rate), input=audio_bytes, capture_output=True,
+                          check=True, timeout=DECODE_TIMEOUT)
+    return np.frombuffer(proc.stdout, dtype=np.float32)
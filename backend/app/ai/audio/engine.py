@@ -1,28 +1,88 @@
 import logging
+import subprocess
 import numpy as np
-import os
-import onnxruntime as ort
+from collections import defaultdict
 from datetime import datetime
-from transformers import AutoFeatureExtractor
 from app.ai.base import BaseInferenceEngine
-from typing import Any, Dict
-import io
-import librosa
-import tempfile
+from app.ai.audio.decode import decode_audio
+from app.ai.audio.stream import DecoderPool
+from app.ai.audio.dsp import DspGate
+from app.ai.audio.features import Wav2Vec2Features
+from app.ai.audio.timeline import EmotionTimeline
+from app.ai.runtime import RuntimeConfig
+from app.ai.state import Counters, SessionRecord, SessionStore
+from app.core.config import settings
+from typing import Any, Dict, List, Optional
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+MAX_HELD_PIECES = 8 # out-of-order pieces buffered before a missing one is given up on
+STREAM_READ_TIMEOUT = 0.05 # seconds to wait for ffmpeg output after feeding a piece
+DISTRESS_EMOTIONS = ("angry", "fearful")
+
+class AudioSession(SessionRecord):
+    """Streaming state of one monitored user: piece ordering, PCM not yet analyzed and the emotion timeline."""
+    __slots__ = ("lock", "next_seq", "held", "pending", "timeline")
+
+    def __init__(self, timeline: EmotionTimeline):
+        super().__init__()
+        self.timeline = timeline
+        self.lock = threading.Lock()
+        self.next_seq = 0
+        self.held: Dict[int, bytes] = {}
+        self.pending = np.zeros(0, dtype=np.float32)
+
+    def accept(self, seq: int, data: bytes) -> List[tuple]:
+        """
+        Queue piece ``seq`` and return the (is_header, bytes) pieces now feedable in order.
+        Uploads run concurrently on the inference executor, so pieces can arrive out of order.
+        """
+        if seq == 0 and self.next_seq > 0:
+            # The browser started a new recording
+            self.held.clear()
+            self.next_seq = 0
+            self.pending = self.pending[:0]
+        elif seq < self.next_seq:
+            return []
+        self.held[seq] = data
+        if len(self.held) > MAX_HELD_PIECES:
+            self.next_seq = min(self.held)
+        ready = []
+        while self.next_seq in self.held:
+            ready.append((self.next_seq == 0, self.held.pop(self.next_seq)))
+            self.next_seq += 1
+        return ready
+
 class AudioEngine(BaseInferenceEngine):
-    def __init__(self, artifacts_dir: str):
+    def __init__(self, artifacts_dir: str, variant: str = "fp32", calibration_dir: str = None, runtime: RuntimeConfig = None,
+                 max_sessions: int = 4096, session_ttl: float = 600.0, window_seconds: float = 5.0,
+                 max_decoders: int = 64, decoder_idle_seconds: float = 30.0, dsp_gate: bool = True,
+                 silence_db: float = -45.0, min_speech_ratio: float = 0.1, scream_db: float = -15.0,
+                 ser_window_seconds: float = 2.0, ser_hop_seconds: float = 0.5, timeline_length: int = 32):
         self.artifacts_dir = artifacts_dir
+        self.variant = variant
+        self.calibration_dir = calibration_dir
+        self.runtime = runtime
         self.session = None
         self.feature_extractor = None
         self.sample_rate = 16000
-        self._latest_result = {"emotion": "neutral", "confidence": 0.0, "active": False, "timestamp": None}
+        self.window_seconds = window_seconds
+        self.decoders = DecoderPool(self.sample_rate, max_decoders, decoder_idle_seconds)
+        self.gate = DspGate(self.sample_rate, silence_db, min_speech_ratio, scream_db) if dsp_gate else None
+        self.ser_window = int(ser_window_seconds * self.sample_rate)
+        self.ser_hop = int(ser_hop_seconds * self.sample_rate)
+        self._counters = Counters("windows", "inferred", "gated")
         self.id2label = {0: "angry", 1: "disgust", 2: "fearful", 3: "happy", 4: "neutral", 5: "sad", 6: "surprised"}
+        labels = [self.id2label[i] for i in sorted(self.id2label)]
+        self.sessions = SessionStore(lambda: AudioSession(EmotionTimeline(timeline_length, labels)),
+                                     max_sessions=max_sessions, ttl_seconds=session_ttl,
+                                     on_evict=lambda key, record: self.decoders.close(key))
+        self._idle_result = {"emotion": "neutral", "confidence": 0.0, "active": False, "timestamp": None}
 
     def load_model(self, artifact_path: str = None) -> None:
-        from app.ai.model_downloader import ensure_audio_model
+        from app.ai.model_downloader import ensure_audio_model, ensure_audio_variant
         
         try:
             path = artifact_path or self.artifacts_dir
@@ -32,12 +92,20 @@ class AudioEngine(BaseInferenceEngine):
                 logger.error("❌ Failed to prepare audio model")
                 return
             
-            logger.info(f"📁 Loading Audio AI from: {path}")
-            self.feature_extractor = AutoFeatureExtractor.from_pretrained(path)
-            self.session = ort.InferenceSession(
-                os.path.join(path, "model.onnx"), 
-                providers=['CPUExecutionProvider']
-            )
+            model_path = ensure_audio_variant(path, self.variant, self.calibration_dir)
+            if model_path is None:
+                logger.error(f"❌ Failed to prepare {self.variant} audio model")
+                return
+
+            logger.info(f"📁 Loading Audio AI from: {path} ({self.variant})")
+            try:
+                self.feature_extractor = Wav2Vec2Features.from_pretrained(path)
+            except ValueError:
+                # Other extractor types (e.g. log-mel) still go through transformers
+                from transformers import AutoFeatureExtractor
+                extractor = AutoFeatureExtractor.from_pretrained(path)
+                self.feature_extractor = lambda audio, sampling_rate: extractor(audio, sampling_rate=sampling_rate, return_tensors="np")
+            self.session = self.create_session(model_path)
             # Warm up the model
             dummy_input = np.zeros((1, 16000), dtype=np.float32)
             self.predict(dummy_input[0])
@@ -49,70 +117,187 @@ class AudioEngine(BaseInferenceEngine):
         if not self.session: 
             logger.warning("🚫 Prediction skipped: Model not loaded")
             return {"emotion": "none", "confidence": 0.0, "active": False}
-        
+        return self.predict_batch([audio_data])[0]
+
+    def predict_batch(self, audio_batch: List[Any]) -> List[Dict[str, Any]]:
+        if not self.session:
+            return [{"emotion": "none", "confidence": 0.0, "active": False} for _ in audio_batch]
+
         try:
-            inputs = self.feature_extractor(audio_data, sampling_rate=self.sample_rate, return_tensors="np")
-            input_data = inputs.get("input_values") if "input_values" in inputs else inputs.get("input_features")
-            
-            # Run inference
-            outputs = self.session.run(None, {self.session.get_inputs()[0].name: input_data})
-            logits = outputs[0][0]
-            
-            # Softmax
-            probs = np.exp(logits - np.max(logits))
-            probs /= probs.sum()
-            
-            pred_id = np.argmax(probs)
-            result = {
-                "emotion": self.id2label.get(pred_id, "unknown"),
-                "confidence": float(probs[pred_id]),
-                "active": True,
-                "timestamp": datetime.now().isoformat()
-            }
-            return result
+            timestamp = datetime.now().isoformat()
+            return [self._label(probs, timestamp) for probs in self.probs_batch(audio_batch)]
         except Exception as e:
             logger.error(f"❌ Audio Prediction Error: {e}")
-            return {"emotion": "error", "confidence": 0.0, "active": False}
+            return [{"emotion": "error", "confidence": 0.0, "active": False} for _ in audio_batch]
+
+    def probs_batch(self, audio_batch: List[Any]) -> List[np.ndarray]:
+        """Emotion probabilities for each waveform, in ``id2label`` order."""
+        # Only equal-length inputs share a run: zero padding would change the utterance-level prediction
+        by_length = defaultdict(list)
+        for i, audio_data in enumerate(audio_batch):
+            by_length[len(audio_data)].append(i)
+        static_batch = self.session.get_inputs()[0].shape[0]
+        step = static_batch if isinstance(static_batch, int) else len(audio_batch)
+
+        results = [None] * len(audio_batch)
+        for indices in by_length.values():
+            for start in range(0, len(indices), step):
+                part = indices[start:start + step]
+                inputs = self.feature_extractor([audio_batch[i] for i in part], sampling_rate=self.sample_rate)
+                input_data = inputs["input_values"] if "input_values" in inputs else inputs["input_features"]
+                # Run inference
+                logits = self.session.run(None, {self.session.get_inputs()[0].name: input_data})[0]
+                # Softmax
+                probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+                probs /= probs.sum(axis=1, keepdims=True)
+                for i, row in zip(part, probs):
+                    results[i] = row
+        return results
+
+    def _label(self, probs: np.ndarray, timestamp: str) -> Dict[str, Any]:
+        pred_id = int(np.argmax(probs))
+        return {
+            "emotion": self.id2label.get(pred_id, "unknown"),
+            "confidence": float(probs[pred_id]),
+            "active": True,
+            "timestamp": timestamp
+        }
 
-    def process_audio(self, audio_bytes: bytes):
+    def window_starts(self, n: int) -> np.ndarray:
+        """Start offsets of the overlapping SER windows over ``n`` samples (one whole-clip window if shorter)."""
+        if n <= self.ser_window:
+            return np.zeros(1, dtype=np.int64)
+        return np.arange(0, n - self.ser_window + 1, self.ser_hop)
+
+    def analyze(self, y: np.ndarray, record: Optional[AudioSession] = None) -> Dict[str, Any]:
+        """
+        Sliding-window SER over a decoded clip. Windows the DSP gate finds neither speech nor a scream
+        in are skipped; the rest run as one batch. Every window goes into the session timeline, and the
+        clip is labelled with its strongest distress window, or else its mean emotion.
+        """
+        starts = self.window_starts(len(y))
+        windows = [y[s:s + self.ser_window] for s in starts]
+        features = [self.gate.analyze(w) for w in windows] if self.gate else [{} for _ in windows]
+        run = [i for i, f in enumerate(features) if not self.gate or self.gate.should_infer(f)]
+        self._counters.add(windows=len(windows), inferred=len(run), gated=len(windows) - len(run))
+
+        probs = np.zeros((len(windows), len(self.id2label)), dtype=np.float32)
+        if run and self.session:
+            try:
+                if self.batcher:
+                    futures = [self.batcher.submit(windows[i]) for i in run]
+                    probs[run] = [f.result() for f in futures]
+                else:
+                    probs[run] = self.probs_batch([windows[i] for i in run])
+            except Exception as e:
+                logger.error(f"❌ Audio Prediction Error: {e}")
+                return {"emotion": "error", "confidence": 0.0, "active": False}
+
+        now = time.time()
+        if record is not None:
+            for s, row, f in zip(starts, probs, features):
+                end = min(s + self.ser_window, len(y))
+                record.timeline.push(now - (len(y) - end) / self.sample_rate, row,
+                                     f.get("loudness_db", np.nan), f.get("scream", False))
+
+        timestamp = datetime.now().isoformat()
+        inferred = probs[run] if run and self.session else None
+        if inferred is None:
+            result = {"emotion": "neutral", "confidence": 0.0, "active": True, "timestamp": timestamp}
+        else:
+            top = inferred.argmax(axis=1)
+            distress = [j for j, k in enumerate(top) if self.id2label[int(k)] in DISTRESS_EMOTIONS]
+            if distress:
+                strongest = max(distress, key=lambda j: inferred[j, top[j]])
+                result = self._label(inferred[strongest], timestamp)
+            else:
+                result = self._label(inferred.mean(axis=0), timestamp)
+        if self.gate:
+            result.update({
+                "loudness_db": max(f["loudness_db"] for f in features),
+                "speech_ratio": round(float(np.mean([f["speech_ratio"] for f in features])), 3),
+                "scream": any(f["scream"] for f in features),
+                "scream_seconds": max(f["scream_seconds"] for f in features),
+                "voice": any(f["voice"] for f in features),
+            })
+        if record is not None:
+            result["timeline"] = record.timeline.entries()
+        return result
+
+    def process_audio(self, audio_bytes: bytes, session_id: str = "default", seq: Optional[int] = None) -> bool:
+        """
+        Analyze an uploaded chunk. Without ``seq`` the chunk is a self-contained file; with it, the
+        chunk is piece ``seq`` of the session's continuous WebM stream. Returns False when a streaming
+        session has lost its decoder and the client must restart its recording.
+        """
+        if seq is not None:
+            return self._process_stream(audio_bytes, session_id, seq)
         try:
             logger.info(f"📥 Received audio bytes: {len(audio_bytes)}")
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp_in:
-                tmp_in.write(audio_bytes)
-                in_path = tmp_in.name
-            
-            out_path = in_path + ".wav"
-            
-            # Convert webm to wav using ffmpeg directly
-            import subprocess
-            command = [
-                'ffmpeg', '-y', '-i', in_path, 
-                '-ar', str(self.sample_rate), 
-                '-ac', '1', 
-                out_path
-            ]
-            subprocess.run(command, capture_output=True, check=True)
-            
-            y, sr = librosa.load(out_path, sr=self.sample_rate)
-            
-            # Cleanup
-            if os.path.exists(in_path): os.remove(in_path)
-            if os.path.exists(out_path): os.remove(out_path)
-            
-            logger.info(f"🎵 Audio loaded: {len(y)} samples at {sr}Hz")
+            y = decode_audio(audio_bytes, self.sample_rate)
+            logger.info(f"🎵 Audio loaded: {len(y)} samples at {self.sample_rate}Hz")
             
             if len(y) > 1600: 
-                self._latest_result = self.predict(y)
-                logger.info(f"🧠 Prediction: {self._latest_result['emotion']} ({self._latest_result['confidence']:.2f})")
+                record = self.sessions.get_or_create(session_id)
+                with record.lock:
+                    result = self.analyze(y, record)
+                    record.last_result = result
+                logger.info(f"🧠 Prediction: {result['emotion']} ({result['confidence']:.2f})")
             else:
                 logger.warning("⚠️ Audio too short for prediction")
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ Audio decode failed: {e.stderr.decode(errors='replace').strip()}")
         except Exception as e: 
             logger.error(f"❌ Audio AI Error: {e}")
-            if 'in_path' in locals() and os.path.exists(in_path): os.remove(in_path)
-            if 'out_path' in locals() and os.path.exists(out_path): os.remove(out_path)
+        return True
+
+    def _process_stream(self, piece: bytes, session_id: str, seq: int) -> bool:
+        record: AudioSession = self.sessions.get_or_create(session_id)
+        with record.lock:
+            decoder = None
+            for is_header, data in record.accept(seq, piece):
+                decoder = self.decoders.get(session_id, reset=is_header)
+                if decoder is None:
+                    logger.warning(f"⚠️ No audio decoder for session {session_id}, requesting a new recording")
+                    return False
+                try:
+                    decoder.feed(data)
+                except BrokenPipeError:
+                    logger.error(f"❌ Audio decoder for session {session_id} exited")
+                    self.decoders.close(session_id)
+                    return False
+            if decoder is None:
+                return True
+            y = decoder.read(STREAM_READ_TIMEOUT)
+            if len(y):
+                record.pending = np.concatenate([record.pending, y])
+            if len(record.pending) >= int(self.window_seconds * self.sample_rate):
+                result = self.analyze(record.pending, record)
+                # Keep the tail so the next analysis continues the window grid without a gap
+                record.pending = record.pending[self.window_starts(len(record.pending))[-1] + self.ser_hop:]
+                record.last_result = result
+                logger.info(f"🧠 Prediction: {result['emotion']} ({result['confidence']:.2f})")
+        return True
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        counters = self._counters.snapshot()
+        windows = counters["windows"]
+        return {**counters, "gated_ratio": round(counters["gated"] / windows, 3) if windows else 0.0,
+                "sessions": len(self.sessions), "decoders": self.decoders.metrics}
 
     @property
     def status(self) -> Dict[str, Any]:
-        return self._latest_result
+        """Idle status; per-session results are read with ``status_for``."""
+        return self._idle_result
 
-audio_service = AudioEngine("app/artifacts/audio")
+audio_service = AudioEngine("app/artifacts/audio", variant=settings.AUDIO_MODEL_VARIANT, calibration_dir=settings.QUANT_CALIBRATION_DIR,
+                            runtime=RuntimeConfig.from_settings(settings.AUDIO_ORT_THREADS, settings.AUDIO_ORT_AFFINITY),
+                            max_sessions=settings.SESSION_MAX, session_ttl=settings.SESSION_TTL_SECONDS,
+                            window_seconds=settings.AUDIO_WINDOW_SECONDS, max_decoders=settings.AUDIO_MAX_DECODERS,
+                            decoder_idle_seconds=settings.AUDIO_DECODER_IDLE_SECONDS, dsp_gate=settings.AUDIO_DSP_GATE,
+                            silence_db=settings.AUDIO_SILENCE_DB, min_speech_ratio=settings.AUDIO_MIN_SPEECH_RATIO,
+                            scream_db=settings.AUDIO_SCREAM_DB, ser_window_seconds=settings.AUDIO_SER_WINDOW_SECONDS,
+                            ser_hop_seconds=settings.AUDIO_SER_HOP_SECONDS, timeline_length=settings.AUDIO_TIMELINE_LENGTH)
+if settings.INFERENCE_BATCHING:
+    audio_service.enable_batching(settings.INFERENCE_MAX_BATCH, settings.INFERENCE_MAX_WAIT_MS, run_batch=audio_service.probs_batch)
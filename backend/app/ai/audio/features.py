@@ -0,0 +1,102 @@
+"""
+NumPy implementation of the Wav2Vec2 feature extractor.
+
+Reads ``preprocessor_config.json`` and reproduces ``Wav2Vec2FeatureExtractor.__call__``
+(float32 cast, optional padding, per-utterance zero-mean/unit-variance normalization) so the
+audio engine does not import ``transformers`` at startup or on every call. Output is written
+into a per-thread buffer that is reused between calls.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+SUPPORTED_TYPES = ("Wav2Vec2FeatureExtractor",)
+
+
+class Wav2Vec2Features:
+    def __init__(self, sampling_rate: int = 16000, do_normalize: bool = True, padding_value: float = 0.0,
+                 padding_side: str = "right", return_attention_mask: bool = False):
+        self.sampling_rate = sampling_rate
+        self.do_normalize = do_normalize
+        self.padding_value = padding_value
+        self.padding_side = padding_side
+        self.return_attention_mask = return_attention_mask
+        self._local = threading.local()
+
+    @classmethod
+    def from_pretrained(cls, path: str) -> "Wav2Vec2Features":
+        """Build from an artifacts folder (or a preprocessor_config.json path)."""
+        config_path = path if path.endswith(".json") else os.path.join(path, "preprocessor_config.json")
+        with open(config_path) as f:
+            config = json.load(f)
+        kind = config.get("feature_extractor_type", "Wav2Vec2FeatureExtractor")
+        if kind not in SUPPORTED_TYPES:
+            raise ValueError(f"Unsupported feature extractor '{kind}', expected one of {SUPPORTED_TYPES}")
+        return cls(
+            sampling_rate=config.get("sampling_rate", 16000),
+            do_normalize=config.get("do_normalize", True),
+            padding_value=config.get("padding_value", 0.0),
+            padding_side=config.get("padding_side", "right"),
+            return_attention_mask=config.get("return_attention_mask", False),
+        )
+
+    def _buffer(self, batch: int, length: int) -> np.ndarray:
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < batch or buf.shape[1] < length:
+            rows = max(batch, buf.shape[0] if buf is not None else 0)
+            cols = max(length, buf.shape[1] if buf is not None else 0)
+            buf = self._local.buf = np.empty((rows, cols), dtype=np.float32)
+        return buf[:batch, :length]
+
+    def __call__(self, raw_speech, sampling_rate: int = None, padding: bool = False) -> Dict[str, np.ndarray]:
+        """
+        ``input_values`` of shape (batch, length) for one waveform or a list of them. Unequal
+        lengths need ``padding=True`` (pad to the longest). The returned array is only valid until
+        the next call from the same thread.
+        """
+        if sampling_rate is not None and sampling_rate != self.sampling_rate:
+            raise ValueError(f"Expected audio sampled at {self.sampling_rate} Hz, got {sampling_rate} Hz")
+        waves = self._as_list(raw_speech)
+        lengths = [len(w) for w in waves]
+        longest = max(lengths)
+        if not padding and min(lengths) != longest:
+            raise ValueError("Waveforms of different lengths need padding=True")
+
+        out = self._buffer(len(waves), longest)
+        # transformers only normalizes over the unpadded samples when it builds an attention mask
+        masked = padding and self.return_attention_mask
+        for row, wave, n in zip(out, waves, lengths):
+            if n < longest:
+                row.fill(self.padding_value)
+            (row[:n] if self.padding_side == "right" else row[longest - n:])[...] = wave
+            if self.do_normalize:
+                # Same float32 ops as transformers, so the tensors match bit for bit
+                stats = row[:n] if masked else row
+                mean, var = stats.mean(), stats.var()
+                np.subtract(row, mean, out=row)
+                np.divide(row, np.sqrt(var + 1e-7), out=row)
+                if masked and n < longest:
+                    row[n:] = self.padding_value
+        result = {"input_values": out}
+        if masked:
+            result["attention_mask"] = self._attention_mask(lengths, longest)
+        return result
+
+    def _attention_mask(self, lengths: Sequence[int], longest: int) -> np.ndarray:
+        mask = np.zeros((len(lengths), longest), dtype=np.int32)
+        for row, n in zip(mask, lengths):
+            (row[:n] if self.padding_side == "right" else row[longest - n:]).fill(1)
+        return mask
+
+    @staticmethod
+    def _as_list(raw_speech) -> List[np.ndarray]:
+        if isinstance(raw_speech, np.ndarray):
+            if raw_speech.ndim > 2:
+                raise ValueError("Only mono-channel audio is supported")
+            return list(raw_speech) if raw_speech.ndim == 2 else [raw_speech]
+        if isinstance(raw_speech, (list, tuple)) and len(raw_speech) and isinstance(raw_speech[0], (np.ndarray, list, tuple)):
+            return [np.asarray(w, dtype=np.float32) for w in raw_speech]
+        return [np.asarray(raw_speech, dtype=np.float32)]
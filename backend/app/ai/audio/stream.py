@@ -0,0 +1,159 @@
+"""
+Long-lived WebM/Opus decoders for streaming audio sessions.
+
+With a ``MediaRecorder`` timeslice the browser uploads one continuous WebM stream in pieces:
+only the first piece carries the container header. Each session therefore keeps one ffmpeg
+process open, feeds it every piece on stdin and collects PCM from stdout on a reader thread,
+so there is no process spawn per chunk and no gap at chunk boundaries. ``DecoderPool`` caps
+the number of open decoders (least recently fed closed first) and reaps idle ones.
+"""
+import logging
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+from app.ai.audio.decode import ffmpeg_pcm_command
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 1 << 16
+
+
+class StreamingDecoder:
+    def __init__(self, sample_rate: int):
+        # No probing delay: the stream is always WebM, and its header arrives with the first piece
+        command = ffmpeg_pcm_command(sample_rate)
+        inp = command.index('-i')
+        command[inp:inp] = ['-probesize', '32', '-analyzeduration', '0', '-fflags', 'nobuffer', '-f', 'matroska']
+        command[-1:-1] = ['-flush_packets', '1']
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, bufsize=0)
+        self.fed_at = time.monotonic()
+        self._pcm = bytearray()
+        self._cond = threading.Condition()
+        self._reader = threading.Thread(target=self._read, name="ffmpeg-reader", daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _read(self) -> None:
+        while True:
+            data = self.proc.stdout.read(READ_SIZE)
+            with self._cond:
+                if data:
+                    self._pcm += data
+                self._cond.notify_all()
+            if not data:
+                return
+
+    def feed(self, data: bytes) -> None:
+        """Write the next piece of the stream; raises ``BrokenPipeError`` if ffmpeg has exited."""
+        self.proc.stdin.write(data)
+        self.fed_at = time.monotonic()
+
+    def read(self, timeout: float = 0.0) -> np.ndarray:
+        """Samples decoded so far, waiting up to ``timeout`` seconds for output if none are ready."""
+        with self._cond:
+            if len(self._pcm) < 4 and timeout > 0:
+                self._cond.wait(timeout)
+            n = len(self._pcm) // 4 * 4
+            out = bytes(self._pcm[:n])
+            del self._pcm[:n]
+        return np.frombuffer(out, dtype=np.float32)
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class DecoderPool:
+    def __init__(self, sample_rate: int, max_decoders: int = 64, idle_seconds: float = 30.0):
+        self.sample_rate = sample_rate
+        self.max_decoders = max_decoders
+        self.idle_seconds = idle_seconds
+        self.counters = {"opened": 0, "evicted": 0, "reaped": 0}
+        self._decoders: "OrderedDict[Hashable, StreamingDecoder]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def get(self, key: Hashable, reset: bool = False) -> Optional[StreamingDecoder]:
+        """
+        The session's decoder. ``reset`` (a new recording, i.e. a new WebM header) starts a fresh one;
+        otherwise returns None if the session has none left (reaped, evicted or crashed), since a
+        mid-stream piece cannot be decoded without the header.
+        """
+        stale = []
+        with self._lock:
+            decoder = self._decoders.pop(key, None)
+            if decoder is not None and (reset or not decoder.alive):
+                stale.append(decoder)
+                decoder = None
+            if decoder is None and reset:
+                decoder = StreamingDecoder(self.sample_rate)
+                self.counters["opened"] += 1
+            if decoder is not None:
+                self._decoders[key] = decoder
+                while len(self._decoders) > self.max_decoders:
+                    _, oldest = self._decoders.popitem(last=False)
+                    stale.append(oldest)
+                    self.counters["evicted"] += 1
+                if self._reaper is None:
+                    self._reaper = threading.Thread(target=self._reap_loop, name="decoder-reaper", daemon=True)
+                    self._reaper.start()
+        for old in stale:
+            old.close()
+        return decoder
+
+    def close(self, key: Hashable) -> None:
+        with self._lock:
+            decoder = self._decoders.pop(key, None)
+        if decoder is not None:
+            decoder.close()
+
+    def reap_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [k for k, d in self._decoders.items() if d.fed_at < cutoff]
+            decoders = [self._decoders.pop(k) for k in idle]
+            self.counters["reaped"] += len(decoders)
+        for decoder in decoders:
+            decoder.close()
+        return len(decoders)
+
+    def close_all(self) -> None:
+        with self._lock:
+            decoders = list(self._decoders.values())
+            self._decoders.clear()
+        for decoder in decoders:
+            decoder.close()
+
+    def _reap_loop(self) -> None:
+        # Runs only while decoders are open; the next get() starts a new one
+        while True:
+            time.sleep(self.idle_seconds / 2)
+            reaped = self.reap_idle()
+            if reaped:
+                logger.info(f"🧹 Closed {reaped} idle audio decoder(s)")
+            with self._lock:
+                if not self._decoders:
+                    self._reaper = None
+                    return
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {**self.counters, "open": len(self._decoders), "max": self.max_decoders}
@@ -0,0 +1,45 @@
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+class EmotionTimeline:
+    """Fixed-size ring buffer of per-window SER results for one session, oldest overwritten first."""
+
+    def __init__(self, capacity: int, labels: Sequence[str]):
+        self.capacity = capacity
+        self.labels = list(labels)
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.probs = np.zeros((capacity, len(self.labels)), dtype=np.float32)
+        self.loudness = np.full(capacity, np.nan, dtype=np.float32)
+        self.scream = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, t: float, probs: np.ndarray, loudness: float = np.nan, scream: bool = False) -> None:
+        """Append one window ending at epoch time ``t``; all-zero ``probs`` marks a window the DSP gate skipped."""
+        i = self._head
+        self.times[i] = t
+        self.probs[i] = probs
+        self.loudness[i] = loudness
+        self.scream[i] = scream
+        self._head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def order(self) -> np.ndarray:
+        """Buffer indices from oldest to newest."""
+        return (np.arange(self.size) + self._head - self.size) % self.capacity
+
+    def entries(self) -> List[Dict[str, Any]]:
+        idx = self.order()
+        top = self.probs[idx].argmax(axis=1)
+        conf = self.probs[idx].max(axis=1)
+        return [{
+            "t": datetime.fromtimestamp(self.times[i]).isoformat(timespec="milliseconds"),
+            "emotion": self.labels[k] if c > 0 else "none",
+            "confidence": round(float(c), 3),
+            "loudness_db": None if np.isnan(self.loudness[i]) else round(float(self.loudness[i]), 1),
+            "scream": bool(self.scream[i]),
+        } for i, k, c in zip(idx, top, conf)]
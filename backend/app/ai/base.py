@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
+from app.ai.batching import MicroBatcher
+from app.ai.runtime import RuntimeConfig, create_session
+from app.ai.state import SessionStore
 
 class BaseInferenceEngine(ABC):
+    runtime: Optional[RuntimeConfig] = None
+    batcher: Optional[MicroBatcher] = None
+    sessions: Optional[SessionStore] = None
+
     @abstractmethod
     def load_model(self, artifact_path: str) -> None:
         pass
@@ -12,3 +19,24 @@ class BaseInferenceEngine(ABC):
     @abstractmethod
     def status(self) -> Dict[str, Any]:
         pass
+
+    def status_for(self, session_id: str) -> Dict[str, Any]:
+        """Latest result of one session, or the idle status if it has none (or has expired)."""
+        record = self.sessions.get(session_id) if self.sessions is not None else None
+        if record is None or record.last_result is None:
+            return self.status
+        return record.last_result
+
+    def predict_batch(self, inputs: List[Any]) -> List[Dict[str, Any]]:
+        """Engines with a batched model path override this; the default runs inputs one by one."""
+        return [self.predict(x) for x in inputs]
+
+    def enable_batching(self, max_batch: int, max_wait_ms: float, run_batch: Callable[[List[Any]], List[Any]] = None) -> None:
+        """Route scheduled inference through a cross-session micro-batcher (``predict_batch`` by default)."""
+        self.batcher = MicroBatcher(type(self).__name__, run_batch or self.predict_batch, max_batch, max_wait_ms)
+
+    def create_session(self, model_path: str):
+        """onnxruntime session built from this engine's shared runtime configuration."""
+        if self.runtime is None:
+            self.runtime = RuntimeConfig()
+        return create_session(model_path, self.runtime)
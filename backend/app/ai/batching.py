@@ -0,0 +1,141 @@
+"""
+Cross-session micro-batching for inference engines.
+
+Requests from many concurrent users are queued; a single worker thread takes the first one,
+keeps collecting until ``max_batch`` items or ``max_wait_ms`` after the first arrival, runs
+one batched inference through the engine and resolves each caller's future.
+"""
+import bisect
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style) with thread-safe observe()."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        n = running + counts[-1]
+        cumulative["+Inf"] = n
+        return {"count": n, "sum": round(total, 3), "mean": round(total / n, 3) if n else 0.0, "buckets": cumulative}
+
+
+class _Request:
+    __slots__ = ("item", "future", "enqueued_at")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(self, name: str, run_batch: Callable[[List[Any]], List[Any]], max_batch: int = 8, max_wait_ms: float = 10.0):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(MS_BUCKETS)
+        self.latency_ms = Histogram(MS_BUCKETS)
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def submit(self, item: Any) -> Future:
+        """Queue one input; the returned future resolves to its entry of the batched result."""
+        request = _Request(item)
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def __call__(self, item: Any) -> Any:
+        return self.submit(item).result()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stopped = False
+                self._worker = threading.Thread(target=self._loop, name=f"{self.name}-batcher", daemon=True)
+                self._worker.start()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._queue.put(None)
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._stopped = True
+                break
+            batch.append(request)
+        return batch
+
+    def _loop(self) -> None:
+        while not self._stopped:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            started = time.perf_counter()
+            self.batch_size.observe(len(batch))
+            for request in batch:
+                self.queue_wait_ms.observe((started - request.enqueued_at) * 1000)
+            try:
+                results = self.run_batch([request.item for request in batch])
+                for request, result in zip(batch, results):
+                    request.future.set_result(result)
+            except Exception as e:
+                logger.error(f"❌ {self.name} batch of {len(batch)} failed: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+            finished = time.perf_counter()
+            for request in batch:
+                self.latency_ms.observe((finished - request.enqueued_at) * 1000)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize(),
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
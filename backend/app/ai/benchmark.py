@@ -0,0 +1,186 @@
+"""
+Accuracy-vs-latency harness for model variants.
+
+Runs every requested variant over a local labeled clip set, each in a fresh process so
+memory numbers are not polluted by the previous variant, and reports latency, peak memory
+and agreement with the FP32 outputs (plus label accuracy when labels are present).
+
+Clip set layout:
+    clips/vision/*.jpg|png|webp|mp4|webm   frames, or videos sampled every --frame-stride frames
+    clips/audio/*.wav|flac|ogg|webm|mp3    split into --chunk-seconds chunks like the Monitor page
+    clips/labels.json                      optional: {"vision/a.jpg": {"people_count": 2, "pose_risk": false},
+                                                      "audio/b.wav": {"emotion": "angry"}}
+
+Usage:
+    python -m app.ai.benchmark --clips ./clips --variants fp32,int8-dynamic,int8-static
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".avi", ".mov")
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".webm", ".mp3")
+
+
+def _vision_frames(clips_dir: Path, stride: int):
+    import cv2
+    folder = clips_dir / "vision"
+    if not folder.is_dir():
+        return
+    for path in sorted(folder.iterdir()):
+        key = f"vision/{path.name}"
+        suffix = path.suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield key, frame
+        elif suffix in VIDEO_EXTENSIONS:
+            cap = cv2.VideoCapture(str(path))
+            index = 0
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if index % stride == 0:
+                    yield f"{key}#{index}", frame
+                index += 1
+            cap.release()
+
+
+def _audio_chunks(clips_dir: Path, chunk_seconds: float, sample_rate: int = 16000):
+    import librosa
+    folder = clips_dir / "audio"
+    if not folder.is_dir():
+        return
+    chunk = int(chunk_seconds * sample_rate)
+    for path in sorted(folder.iterdir()):
+        if path.suffix.lower() not in AUDIO_EXTENSIONS:
+            continue
+        y, _ = librosa.load(str(path), sr=sample_rate)
+        for i, start in enumerate(range(0, max(len(y) - sample_rate // 10, 1), chunk)):
+            yield f"audio/{path.name}#{i}", y[start:start + chunk]
+
+
+def _run_variant(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Child-process body: load one variant, time it over the clip set, return raw outputs."""
+    from app.ai.vision.engine import VisionEngine
+    from app.ai.audio.engine import AudioEngine
+
+    clips_dir = Path(args["clips"])
+    variant = args["variant"]
+    report: Dict[str, Any] = {"variant": variant, "vision": {}, "audio": {}, "frame_ms": [], "chunk_ms": []}
+
+    start = time.perf_counter()
+    vision = VisionEngine(args["vision_artifacts"], backend="onnxruntime", variant=variant, calibration_dir=args["calibration_dir"])
+    vision.load_model()
+    audio = AudioEngine(args["audio_artifacts"], variant=variant, calibration_dir=args["calibration_dir"])
+    audio.load_model()
+    report["load_s"] = time.perf_counter() - start
+
+    if vision.model_people is not None:
+        for key, frame in _vision_frames(clips_dir, args["frame_stride"]):
+            t0 = time.perf_counter()
+            result = vision.predict(frame)
+            report["frame_ms"].append((time.perf_counter() - t0) * 1000)
+            report["vision"][key] = {"people_count": result["people_count"], "pose_risk": result["pose_risk"]}
+
+    if audio.session is not None:
+        for key, chunk in _audio_chunks(clips_dir, args["chunk_seconds"]):
+            t0 = time.perf_counter()
+            result = audio.predict(chunk)
+            report["chunk_ms"].append((time.perf_counter() - t0) * 1000)
+            report["audio"][key] = {"emotion": result["emotion"]}
+
+    report["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return report
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    arr = np.asarray(samples)
+    return {"mean": round(float(arr.mean()), 2), "p50": round(float(np.percentile(arr, 50)), 2), "p95": round(float(np.percentile(arr, 95)), 2)}
+
+
+def _match_rate(outputs: Dict[str, Dict], reference: Dict[str, Dict], field: str):
+    keys = [k for k in outputs if k in reference and field in reference[k]]
+    if not keys:
+        return None
+    return round(sum(outputs[k][field] == reference[k][field] for k in keys) / len(keys), 4)
+
+
+def _lookup_labels(labels: Dict[str, Dict], outputs: Dict[str, Dict]) -> Dict[str, Dict]:
+    # Video frames / audio chunks ("a.mp4#12") fall back to the label of the whole clip
+    return {k: labels.get(k, labels.get(k.split("#")[0], {})) for k in outputs}
+
+
+def summarize(reports: List[Dict[str, Any]], labels: Dict[str, Dict]) -> List[Dict[str, Any]]:
+    baseline = next((r for r in reports if r["variant"] == "fp32"), reports[0])
+    rows = []
+    for r in reports:
+        row = {
+            "variant": r["variant"],
+            "load_s": round(r["load_s"], 2),
+            "max_rss_mb": round(r["max_rss_mb"], 1),
+            "frame_ms": _latency(r["frame_ms"]),
+            "chunk_ms": _latency(r["chunk_ms"]),
+            "agreement": {
+                "people_count": _match_rate(r["vision"], baseline["vision"], "people_count"),
+                "pose_risk": _match_rate(r["vision"], baseline["vision"], "pose_risk"),
+                "emotion": _match_rate(r["audio"], baseline["audio"], "emotion"),
+            },
+        }
+        if labels:
+            row["accuracy"] = {
+                "people_count": _match_rate(r["vision"], _lookup_labels(labels, r["vision"]), "people_count"),
+                "pose_risk": _match_rate(r["vision"], _lookup_labels(labels, r["vision"]), "pose_risk"),
+                "emotion": _match_rate(r["audio"], _lookup_labels(labels, r["audio"]), "emotion"),
+            }
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    from app.ai.model_downloader import MODEL_VARIANTS
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Compare model variants on a local labeled clip set")
+    parser.add_argument("--clips", required=True, help="Clip set folder (vision/, audio/, labels.json)")
+    parser.add_argument("--variants", default="fp32,int8-dynamic", help=f"Comma-separated subset of {','.join(MODEL_VARIANTS)}")
+    parser.add_argument("--vision-artifacts", default="app/artifacts/vision")
+    parser.add_argument("--audio-artifacts", default="app/artifacts/audio")
+    parser.add_argument("--calibration-dir", default=settings.QUANT_CALIBRATION_DIR)
+    parser.add_argument("--frame-stride", type=int, default=15, help="Use every Nth frame of video clips")
+    parser.add_argument("--chunk-seconds", type=float, default=5.0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    if "fp32" not in variants:
+        variants.insert(0, "fp32") # agreement is measured against FP32
+    labels_path = Path(args.clips) / "labels.json"
+    labels = json.loads(labels_path.read_text()) if labels_path.exists() else {}
+
+    ctx = multiprocessing.get_context("spawn")
+    reports = []
+    for variant in variants:
+        job = {**vars(args), "variant": variant}
+        with ctx.Pool(1) as pool:
+            reports.append(pool.apply(_run_variant, (job,)))
+
+    rows = summarize(reports, labels)
+    for row in rows:
+        print(json.dumps(row))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
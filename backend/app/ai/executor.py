@@ -0,0 +1,133 @@
+"""
+Dedicated inference executor with admission control.
+
+Endpoints hand blocking inference (model runs, ffmpeg decodes) to a small pool of worker
+threads instead of running it on the event loop, so `/emergency/sos` and friends stay
+responsive while frames are being analyzed. The queue is bounded: when it is full new work
+is rejected immediately (``ExecutorBusy`` -> HTTP 429) instead of piling up. Work submitted
+with a coalescing key replaces that key's job if it is still queued, so a session streaming
+camera frames only ever has its newest frame waiting, and never runs while another job with
+the same key is running: per-session stream state is only ever touched by one worker.
+"""
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusy(Exception):
+    """The inference queue is full; the caller should back off and retry."""
+
+
+class Superseded(Exception):
+    """A newer submission with the same coalescing key replaced this one before it ran."""
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future")
+
+    def __init__(self, fn: Callable, args: tuple):
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+
+
+class InferenceExecutor:
+    def __init__(self, name: str = "inference", workers: int = 2, max_pending: int = 64):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "superseded": 0}
+        # Keyed jobs keep their key; unkeyed ones get a unique token. Insertion order == FIFO.
+        self._pending: "OrderedDict[Hashable, _Job]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._running = 0
+        self._running_keys = set()
+        self._stopped = False
+        self._seq = 0
+
+    def submit(self, fn: Callable, *args: Any, key: Optional[Hashable] = None) -> Future:
+        """Queue ``fn(*args)``. With ``key``, a still-queued job for the same key is replaced
+        (its future fails with ``Superseded``); without room in the queue raises ``ExecutorBusy``."""
+        job = _Job(fn, args)
+        replaced = None
+        with self._cond:
+            if self._stopped:
+                raise ExecutorBusy(f"{self.name} executor is shut down")
+            if key is not None and key in self._pending:
+                replaced = self._pending.pop(key)
+                self.counters["superseded"] += 1
+            elif len(self._pending) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ExecutorBusy(f"{self.name} queue full ({self.max_pending} pending)")
+            if key is None:
+                self._seq += 1
+                key = ("_", self._seq)
+            self._pending[key] = job
+            self.counters["submitted"] += 1
+            self._ensure_workers()
+            self._cond.notify()
+        if replaced is not None and not replaced.future.cancelled():
+            replaced.future.set_exception(Superseded())
+        return job.future
+
+    async def run(self, fn: Callable, *args: Any, key: Optional[Hashable] = None) -> Any:
+        """Awaitable ``submit``: the event loop is free while the job waits and runs."""
+        return await asyncio.wrap_future(self.submit(fn, *args, key=key))
+
+    def _ensure_workers(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._loop, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    # Oldest job whose key is not already running; a held job waits for its predecessor
+                    key = next((k for k in self._pending if k not in self._running_keys), None)
+                    if key is not None:
+                        break
+                    if self._stopped and not self._pending:
+                        return
+                    self._cond.wait()
+                job = self._pending.pop(key)
+                self._running_keys.add(key)
+                self._running += 1
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.fn(*job.args))
+                        self.counters["completed"] += 1
+                    except Exception as e:
+                        self.counters["failed"] += 1
+                        logger.error(f"❌ {self.name} job {getattr(job.fn, '__name__', job.fn)} failed: {e}")
+                        job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._running_keys.discard(key)
+                    self._cond.notify_all()
+
+    def shutdown(self) -> None:
+        """Stop accepting work; workers drain what is already queued and exit."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.counters, "pending": len(self._pending), "running": self._running,
+                "workers": self.workers, "max_pending": self.max_pending}
+
+
+inference_executor = InferenceExecutor("inference", settings.INFERENCE_WORKERS, settings.INFERENCE_MAX_PENDING)
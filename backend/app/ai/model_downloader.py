@@ -39,7 +39,8 @@ def ensure_vision_models(artifacts_dir: str = "app/artifacts/vision") -> bool:
         if not os.path.exists(model_people):
             logger.info("⬇️  Downloading yolov8n.pt and exporting to ONNX...")
             yolo_detect = YOLO('yolov8n.pt')
-            export_path = yolo_detect.export(format='onnx', simplify=True)
+            # Dynamic batch axis so micro-batched frames from several sessions run in one call
+            export_path = yolo_detect.export(format='onnx', simplify=True, dynamic=True)
             
             # Move to artifacts directory
             if os.path.exists(export_path):
@@ -53,7 +54,8 @@ def ensure_vision_models(artifacts_dir: str = "app/artifacts/vision") -> bool:
         if not os.path.exists(model_pose):
             logger.info("⬇️  Downloading yolov8n-pose.pt and exporting to ONNX...")
             yolo_pose = YOLO('yolov8n-pose.pt')
-            export_path = yolo_pose.export(format='onnx', simplify=True)
+            # Dynamic batch axis so the cascade can run all person crops of a frame in one call
+            export_path = yolo_pose.export(format='onnx', simplify=True, dynamic=True)
             
             # Move to artifacts directory
             if os.path.exists(export_path):
@@ -138,3 +140,144 @@ def ensure_audio_model(artifacts_dir: str = "app/artifacts/audio") -> bool:
     except Exception as e:
         logger.error(f"❌ Failed to prepare audio model: {e}")
         return False
+
+
+# ------------------------------------------------------------------------------
+# Quantized variants
+# ------------------------------------------------------------------------------
+MODEL_VARIANTS = ("fp32", "int8-dynamic", "int8-static", "fp16")
+CALIBRATION_EXTENSIONS = {
+    "vision": (".jpg", ".jpeg", ".png", ".webp"),
+    "audio": (".wav", ".flac", ".ogg", ".webm", ".mp3"),
+}
+
+
+def variant_path(model_path: str, variant: str) -> str:
+    """File name of a variant next to its FP32 model, e.g. ``yolov8n.int8-static.onnx``."""
+    if variant == "fp32":
+        return model_path
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.{variant}{ext}"
+
+
+class _CalibrationReader:
+    """Feeds preprocessed samples from a local folder to ``onnxruntime.quantization.quantize_static``."""
+
+    def __init__(self, input_name: str, files, preprocess):
+        self.input_name = input_name
+        self.preprocess = preprocess
+        self._files = iter(files)
+
+    def get_next(self):
+        for path in self._files:
+            sample = self.preprocess(path)
+            if sample is not None:
+                return {self.input_name: sample}
+        return None
+
+    def rewind(self):
+        pass
+
+
+def _calibration_files(calibration_dir: str, modality: str, limit: int = 200):
+    folder = Path(calibration_dir) / modality
+    if not folder.is_dir():
+        return []
+    files = sorted(p for p in folder.iterdir() if p.suffix.lower() in CALIBRATION_EXTENSIONS[modality])
+    return [str(p) for p in files[:limit]]
+
+
+def _vision_sample(imgsz: int):
+    import cv2
+    from app.ai.vision.backends import letterbox
+
+    def preprocess(path: str):
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        return letterbox(image, imgsz) if image is not None else None
+    return preprocess
+
+
+def _audio_sample(artifacts_dir: str, sample_rate: int = 16000):
+    import librosa
+    from app.ai.audio.features import Wav2Vec2Features
+    extractor = Wav2Vec2Features.from_pretrained(artifacts_dir)
+
+    def preprocess(path: str):
+        y, _ = librosa.load(path, sr=sample_rate, duration=5.0)
+        # Copy out of the extractor's reusable buffer: calibration keeps every sample
+        return extractor(y, sampling_rate=sample_rate)["input_values"].copy()
+    return preprocess
+
+
+def ensure_model_variant(model_path: str, variant: str, calibration=None) -> Optional[str]:
+    """
+    Produce a quantized variant of an FP32 ONNX model if it does not exist yet.
+
+    Args:
+        model_path: Path to the FP32 ONNX model
+        variant: One of ``MODEL_VARIANTS``
+        calibration: ``(files, preprocess)`` for ``int8-static``; ``preprocess(path)`` returns one input tensor
+
+    Returns:
+        Path to the variant, or None if it could not be produced
+    """
+    if variant not in MODEL_VARIANTS:
+        logger.error(f"❌ Unknown model variant '{variant}', expected one of {MODEL_VARIANTS}")
+        return None
+    out_path = variant_path(model_path, variant)
+    if os.path.exists(out_path):
+        return out_path
+
+    try:
+        logger.info(f"⚙️  Building {variant} variant of {os.path.basename(model_path)}...")
+        if variant == "int8-dynamic":
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(model_path, out_path, weight_type=QuantType.QInt8)
+        elif variant == "int8-static":
+            from onnxruntime.quantization import quantize_static, CalibrationMethod, QuantFormat, QuantType
+            import onnxruntime as ort
+            files, preprocess = calibration or ([], None)
+            if not files:
+                logger.error(f"❌ No calibration samples for {os.path.basename(model_path)}; cannot build int8-static")
+                return None
+            input_name = ort.InferenceSession(model_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+            quantize_static(
+                model_path, out_path, _CalibrationReader(input_name, files, preprocess),
+                quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+                per_channel=True, calibrate_method=CalibrationMethod.MinMax,
+            )
+        elif variant == "fp16":
+            # FP16 weights with FP32 inputs/outputs; needs the optional onnxconverter-common package
+            import onnx
+            from onnxconverter_common import float16
+            model = float16.convert_float_to_float16(onnx.load(model_path), keep_io_types=True)
+            onnx.save(model, out_path)
+        logger.info(f"✅ {variant} variant saved to {out_path}")
+        return out_path
+    except Exception as e:
+        logger.error(f"❌ Failed to build {variant} variant of {model_path}: {e}")
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        return None
+
+
+def ensure_vision_variant(artifacts_dir: str, variant: str, calibration_dir: Optional[str] = None, imgsz: int = 640):
+    """Paths of the (detector, pose) models for ``variant``, building them if needed; None on failure."""
+    paths = []
+    for name in ("yolov8n.onnx", "yolov8n-pose.onnx"):
+        calibration = None
+        if variant == "int8-static" and calibration_dir:
+            calibration = (_calibration_files(calibration_dir, "vision"), _vision_sample(imgsz))
+        path = ensure_model_variant(os.path.join(artifacts_dir, name), variant, calibration)
+        if path is None:
+            return None
+        paths.append(path)
+    return tuple(paths)
+
+
+def ensure_audio_variant(artifacts_dir: str, variant: str, calibration_dir: Optional[str] = None) -> Optional[str]:
+    """Path of the SER model for ``variant``, building it if needed; None on failure."""
+    calibration = None
+    if variant == "int8-static" and calibration_dir:
+        calibration = (_calibration_files(calibration_dir, "audio"), _audio_sample(artifacts_dir))
+    return ensure_model_variant(os.path.join(artifacts_dir, "model.onnx"), variant, calibration)
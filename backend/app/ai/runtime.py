@@ -0,0 +1,117 @@
+"""
+Shared onnxruntime session configuration for every inference engine.
+
+Each engine gets its own thread budget (by default the cores are split evenly between the
+engines, so their pools do not oversubscribe the machine) and every session is built from
+the same options. The graph ORT produces after optimization is serialized to
+``ORT_OPTIMIZED_CACHE_DIR`` on first load and reused afterwards, skipping the optimizer on
+cold start.
+"""
+import hashlib
+import logging
+import os
+import platform
+from typing import Optional
+
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+ENGINE_COUNT = 2 # vision + audio share the machine
+
+_OPT_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+_EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+
+class RuntimeConfig:
+    def __init__(self, intra_op_threads: int = 0, inter_op_threads: int = 1, execution_mode: str = "sequential",
+                 graph_optimization: str = "all", cpu_mem_arena: bool = True, mem_pattern: bool = True,
+                 allow_spinning: bool = False, intra_op_affinity: str = "", cache_dir: Optional[str] = None):
+        if execution_mode not in _EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}', expected one of {sorted(_EXECUTION_MODES)}")
+        if graph_optimization not in _OPT_LEVELS:
+            raise ValueError(f"Unknown graph optimization level '{graph_optimization}', expected one of {sorted(_OPT_LEVELS)}")
+        self.intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // ENGINE_COUNT)
+        # ORT format: ";"-separated logical processor lists, one per intra-op thread after the first
+        if intra_op_affinity and len(intra_op_affinity.split(";")) != self.intra_op_threads - 1:
+            raise ValueError(f"Intra-op affinity '{intra_op_affinity}' needs {self.intra_op_threads - 1} entries "
+                             f"(one per intra-op thread after the first, {self.intra_op_threads} threads)")
+        self.inter_op_threads = inter_op_threads
+        self.execution_mode = execution_mode
+        self.graph_optimization = graph_optimization
+        self.cpu_mem_arena = cpu_mem_arena
+        self.mem_pattern = mem_pattern
+        self.allow_spinning = allow_spinning
+        self.intra_op_affinity = intra_op_affinity
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def from_settings(cls, intra_op_threads: int = 0, intra_op_affinity: str = "") -> "RuntimeConfig":
+        """Global ORT_* settings, with the engine's own thread count (overriding ORT_INTRA_OP_THREADS) and core pinning."""
+        from app.core.config import settings
+        return cls(
+            intra_op_threads=intra_op_threads or settings.ORT_INTRA_OP_THREADS,
+            inter_op_threads=settings.ORT_INTER_OP_THREADS,
+            execution_mode=settings.ORT_EXECUTION_MODE,
+            graph_optimization=settings.ORT_GRAPH_OPTIMIZATION,
+            cpu_mem_arena=settings.ORT_CPU_MEM_ARENA,
+            mem_pattern=settings.ORT_MEM_PATTERN,
+            allow_spinning=settings.ORT_ALLOW_SPINNING,
+            intra_op_affinity=intra_op_affinity,
+            cache_dir=settings.ORT_OPTIMIZED_CACHE_DIR or None,
+        )
+
+    def session_options(self) -> ort.SessionOptions:
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = self.intra_op_threads
+        opts.inter_op_num_threads = self.inter_op_threads
+        opts.execution_mode = _EXECUTION_MODES[self.execution_mode]
+        opts.graph_optimization_level = _OPT_LEVELS[self.graph_optimization]
+        opts.enable_cpu_mem_arena = self.cpu_mem_arena
+        opts.enable_mem_pattern = self.mem_pattern
+        # Idle spinning threads burn the cores the other engine's pool is trying to use
+        opts.add_session_config_entry("session.intra_op.allow_spinning", "1" if self.allow_spinning else "0")
+        opts.add_session_config_entry("session.inter_op.allow_spinning", "1" if self.allow_spinning else "0")
+        if self.intra_op_affinity:
+            opts.add_session_config_entry("session.intra_op_thread_affinities", self.intra_op_affinity)
+        return opts
+
+    def cache_path(self, model_path: str) -> Optional[str]:
+        """Optimized-graph cache file, keyed on the source model, optimization level, ORT version and CPU."""
+        if not self.cache_dir or self.graph_optimization == "disable":
+            return None
+        stat = os.stat(model_path)
+        key = f"{os.path.abspath(model_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.graph_optimization}|{ort.__version__}|{platform.machine()}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(self.cache_dir, f"{name}.{self.graph_optimization}.{digest}.onnx")
+
+
+def create_session(model_path: str, config: Optional[RuntimeConfig] = None) -> ort.InferenceSession:
+    config = config or RuntimeConfig()
+    opts = config.session_options()
+    cache_path = config.cache_path(model_path)
+    if cache_path and os.path.exists(cache_path):
+        # Already optimized for this machine: load it as-is instead of re-running the optimizer
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(cache_path, sess_options=opts, providers=['CPUExecutionProvider'])
+        except Exception as e:
+            logger.warning(f"⚠️ Discarding unreadable optimized graph {cache_path}: {e}")
+            os.remove(cache_path)
+            opts = config.session_options()
+    if cache_path:
+        os.makedirs(config.cache_dir, exist_ok=True)
+        opts.optimized_model_filepath = cache_path
+    session = ort.InferenceSession(model_path, sess_options=opts, providers=['CPUExecutionProvider'])
+    if cache_path:
+        logger.info(f"💾 Optimized graph for {os.path.basename(model_path)} cached at {cache_path}")
+    return session
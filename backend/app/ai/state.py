@@ -0,0 +1,99 @@
+"""
+Bounded per-session inference state.
+
+Every monitored user (or stream) gets one compact ``__slots__`` record. Records live in an
+insertion-ordered map kept in last-touched order, so LRU eviction, TTL expiry of idle
+sessions and lookups are all O(1); a single short critical section guards the map.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class Counters:
+    """Metric counters bumped from inference worker threads; ``+=`` on a shared dict can lose updates."""
+
+    def __init__(self, *names: str):
+        self._values = dict.fromkeys(names, 0)
+        self._lock = threading.Lock()
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._values[name] += delta
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+class SessionRecord:
+    """Base record: engines subclass it and add their own slots."""
+    __slots__ = ("touched_at", "last_result")
+
+    def __init__(self):
+        self.touched_at = time.monotonic()
+        self.last_result: Optional[Dict[str, Any]] = None
+
+
+class SessionStore:
+    def __init__(self, factory: Callable[[], SessionRecord], max_sessions: int = 4096, ttl_seconds: float = 600.0,
+                 on_evict: Callable[[Hashable, SessionRecord], None] = None):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.on_evict = on_evict
+        self.evictions = 0
+        self._records: "OrderedDict[Hashable, SessionRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: Hashable) -> Optional[SessionRecord]:
+        """Read-only lookup; does not refresh the session. Idle-expired records read as missing."""
+        record = self._records.get(key)
+        if record is None or time.monotonic() - record.touched_at > self.ttl:
+            return None
+        return record
+
+    def get_or_create(self, key: Hashable) -> SessionRecord:
+        """Fetch (or create) a session's record and mark it as the most recently active."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            record = self._records.get(key)
+            if record is None or now - record.touched_at > self.ttl:
+                if record is not None:
+                    evicted.append((key, self._records.pop(key)))
+                record = self._records[key] = self.factory()
+            else:
+                self._records.move_to_end(key)
+            record.touched_at = now
+            evicted.extend(self._evict_locked(now))
+        self._notify(evicted)
+        return record
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+        self._notify(evicted)
+        return len(evicted)
+
+    def _evict_locked(self, now: float):
+        evicted = []
+        # Oldest-touched first: stop at the first live record, so this is amortized O(1)
+        while self._records:
+            key, record = next(iter(self._records.items()))
+            if len(self._records) <= self.max_sessions and now - record.touched_at <= self.ttl:
+                break
+            self._records.popitem(last=False)
+            evicted.append((key, record))
+        self.evictions += len(evicted)
+        return evicted
+
+    def _notify(self, evicted) -> None:
+        if self.on_evict:
+            for key, record in evicted:
+                self.on_evict(key, record)
@@ -0,0 +1,202 @@
+"""
+Interchangeable model runtimes for the vision engine.
+
+Backends are built as ``cls(model_path, create_session)``, where ``create_session`` is the
+engine's shared onnxruntime session factory. Every backend exposes the same two objects:
+  - a person detector: ``detect_batch(frames) -> [(boxes, scores)]`` with ``boxes`` as (N, 4) xyxy in frame pixels
+  - a pose estimator: ``keypoints(images) -> [array (K, 17, 3)]``, one array per input image,
+    with undetected keypoints zeroed like ``ultralytics.engine.results.Keypoints``.
+"""
+import threading
+import cv2
+import numpy as np
+import onnxruntime as ort
+from typing import Callable, List, Sequence, Tuple
+
+CONF_THRESHOLD = 0.4
+IOU_THRESHOLD = 0.7
+KPT_VISIBLE = 0.5
+PAD_VALUE = 114
+
+def onnx_batch_size(session: ort.InferenceSession) -> int:
+    """Static batch dimension of an exported model, or 0 when it was exported with dynamic axes."""
+    batch = session.get_inputs()[0].shape[0]
+    return batch if isinstance(batch, int) else 0
+
+def onnx_file_batch_size(model_path: str) -> int:
+    """``onnx_batch_size`` read from the model file's graph inputs, without building a session or loading weights."""
+    import onnx
+    dim = onnx.load(model_path, load_external_data=False).graph.input[0].type.tensor_type.shape.dim[0]
+    return dim.dim_value if dim.HasField("dim_value") else 0
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy non-maximum suppression; returns kept indices ordered by score."""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+def letterbox_layout(h: int, w: int, imgsz: int) -> Tuple[float, int, int, int, int]:
+    """Scale, resized (width, height) and (left, top) padding of ultralytics' square letterbox."""
+    gain = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * gain)), int(round(h * gain))
+    left = int(round((imgsz - new_w) / 2 - 0.1))
+    top = int(round((imgsz - new_h) / 2 - 0.1))
+    return gain, new_w, new_h, left, top
+
+def letterbox(image: np.ndarray, imgsz: int) -> np.ndarray:
+    """One-off letterbox to a (1, 3, imgsz, imgsz) float32 RGB tensor, e.g. for calibration data."""
+    gain, new_w, new_h, left, top = letterbox_layout(*image.shape[:2], imgsz)
+    canvas = np.full((imgsz, imgsz, 3), PAD_VALUE, dtype=np.uint8)
+    canvas[top:top + new_h, left:left + new_w] = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    return (canvas[..., ::-1].transpose(2, 0, 1)[None] / 255.0).astype(np.float32)
+
+def xywh_to_xyxy(xywh: np.ndarray) -> np.ndarray:
+    xyxy = np.empty_like(xywh)
+    half_w, half_h = xywh[:, 2] / 2, xywh[:, 3] / 2
+    xyxy[:, 0] = xywh[:, 0] - half_w
+    xyxy[:, 1] = xywh[:, 1] - half_h
+    xyxy[:, 2] = xywh[:, 0] + half_w
+    xyxy[:, 3] = xywh[:, 1] + half_h
+    return xyxy
+
+class _OnnxYolo:
+    """Shared letterbox preprocessing for exported YOLOv8 graphs, with reusable input buffers."""
+    def __init__(self, model_path: str, create_session: Callable[[str], ort.InferenceSession] = None, session: ort.InferenceSession = None):
+        self.session = session or (create_session(model_path) if create_session else ort.InferenceSession(model_path, providers=['CPUExecutionProvider']))
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        self.imgsz = inp.shape[2] if isinstance(inp.shape[2], int) else 640
+        self.batch = onnx_batch_size(self.session)
+        self._canvas = np.full((self.imgsz, self.imgsz, 3), PAD_VALUE, dtype=np.uint8)
+        self._canvas_layout = None
+        self._input = np.empty((max(self.batch, 1), 3, self.imgsz, self.imgsz), dtype=np.float32)
+        self._lock = threading.Lock() # the canvas/input buffers are shared by every caller
+
+    def _letterbox_into(self, image: np.ndarray, slot: int) -> Tuple[float, int, int]:
+        """Letterbox ``image`` into input slot ``slot``; returns the scale and (left, top) padding."""
+        h, w = image.shape[:2]
+        gain, new_w, new_h, left, top = letterbox_layout(h, w, self.imgsz)
+        layout = (new_w, new_h, left, top)
+        if layout != self._canvas_layout:
+            self._canvas.fill(PAD_VALUE)
+            self._canvas_layout = layout
+        resized = image if (new_w, new_h) == (w, h) else cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        self._canvas[top:top + new_h, left:left + new_w] = resized
+        # BGR HWC uint8 -> RGB CHW float32 in [0, 1], written straight into the preallocated batch
+        np.multiply(self._canvas[..., ::-1].transpose(2, 0, 1), 1 / 255.0, out=self._input[slot], casting="unsafe")
+        return gain, left, top
+
+    def _ensure_batch(self, n: int) -> None:
+        if self._input.shape[0] < n:
+            self._input = np.empty((n, 3, self.imgsz, self.imgsz), dtype=np.float32)
+
+    def _run(self, images: Sequence[np.ndarray]) -> Tuple[np.ndarray, List[Tuple[float, int, int]]]:
+        """Run ``images`` through the graph, chunked to the model's static batch size if it has one."""
+        step = self.batch or len(images)
+        outputs, layouts = [], []
+        with self._lock:
+            for start in range(0, len(images), step):
+                chunk = images[start:start + step]
+                self._ensure_batch(len(chunk))
+                layouts.extend(self._letterbox_into(img, i) for i, img in enumerate(chunk))
+                outputs.append(self.session.run(None, {self.input_name: self._input[:len(chunk)]})[0])
+        return np.concatenate(outputs), layouts
+
+    @staticmethod
+    def _unletterbox(xy: np.ndarray, layout: Tuple[float, int, int], shape) -> np.ndarray:
+        gain, left, top = layout
+        xy[..., 0] = np.clip((xy[..., 0] - left) / gain, 0, shape[1])
+        xy[..., 1] = np.clip((xy[..., 1] - top) / gain, 0, shape[0])
+        return xy
+
+class OnnxPersonDetector(_OnnxYolo):
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        if not frames: return []
+        output, layouts = self._run(frames)
+        return [self._decode(preds.T, layout, frame.shape) for preds, layout, frame in zip(output, layouts, frames)]
+
+    def _decode(self, preds: np.ndarray, layout, shape) -> Tuple[np.ndarray, np.ndarray]:
+        # preds: (anchors, 4 + classes)
+        class_scores = preds[:, 4:]
+        cls = class_scores.argmax(axis=1)
+        conf = class_scores[np.arange(len(cls)), cls]
+        mask = (conf > CONF_THRESHOLD) & (cls == 0)
+        if not mask.any():
+            return np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        boxes, scores = xywh_to_xyxy(preds[mask, :4]), conf[mask]
+        keep = nms(boxes, scores, IOU_THRESHOLD)
+        boxes = self._unletterbox(boxes[keep].reshape(-1, 2, 2), layout, shape).reshape(-1, 4)
+        return boxes, scores[keep]
+
+class OnnxPoseEstimator(_OnnxYolo):
+    def keypoints(self, images: Sequence[np.ndarray]) -> List[np.ndarray]:
+        if not images: return []
+        output, layouts = self._run(images)
+        results = []
+        for preds, layout, image in zip(output, layouts, images):
+            preds = preds.T  # (anchors, 4 + 1 + 17 * 3)
+            mask = preds[:, 4] > CONF_THRESHOLD
+            if not mask.any():
+                results.append(np.zeros((0, 17, 3), dtype=np.float32))
+                continue
+            preds = preds[mask]
+            keep = nms(xywh_to_xyxy(preds[:, :4]), preds[:, 4], IOU_THRESHOLD)
+            kpts = preds[keep, 5:].reshape(-1, 17, 3).copy()
+            kpts[..., :2] = self._unletterbox(kpts[..., :2], layout, image.shape)
+            kpts[..., :2][kpts[..., 2] < KPT_VISIBLE] = 0
+            results.append(kpts)
+        return results
+
+class UltralyticsPersonDetector:
+    # ultralytics builds its own onnxruntime session, so the shared runtime settings do not apply here
+    def __init__(self, model_path: str, create_session: Callable = None):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path, task="detect")
+
+    def detect(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        boxes = self.model(frame, conf=CONF_THRESHOLD, verbose=False)[0].boxes
+        if not len(boxes):
+            return np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        people = boxes.cls.cpu().numpy().astype(int) == 0
+        return boxes.xyxy.cpu().numpy()[people], boxes.conf.cpu().numpy()[people]
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        return [self.detect(frame) for frame in frames]
+
+class UltralyticsPoseEstimator:
+    def __init__(self, model_path: str, create_session: Callable = None):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path, task="pose")
+        self.batch = onnx_file_batch_size(model_path)
+
+    def keypoints(self, images: Sequence[np.ndarray]) -> List[np.ndarray]:
+        step = self.batch or max(len(images), 1)
+        results = []
+        for start in range(0, len(images), step):
+            for pose in self.model(list(images[start:start + step]), conf=CONF_THRESHOLD, verbose=False):
+                if pose.keypoints is None:
+                    results.append(np.zeros((0, 17, 3), dtype=np.float32))
+                    continue
+                xy = pose.keypoints.xy.cpu().numpy()
+                results.append(np.concatenate([xy, np.ones_like(xy[..., :1])], axis=-1))
+        return results
+
+BACKENDS = {
+    "onnxruntime": (OnnxPersonDetector, OnnxPoseEstimator),
+    "ultralytics": (UltralyticsPersonDetector, UltralyticsPoseEstimator),
+}
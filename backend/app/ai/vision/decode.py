@@ -0,0 +1,62 @@
+import struct
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+# Largest reduction first; JPEG applies these during DCT decoding, so the full frame is never materialized
+_REDUCED_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def image_size(data: np.ndarray) -> Optional[Tuple[int, int]]:
+    """(width, height) read from a JPEG, PNG or WebP header without decoding pixels."""
+    head = data[:32].tobytes()
+    if head[:2] == b"\xff\xd8":
+        return _jpeg_size(data)
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 24:
+        return struct.unpack(">II", head[16:24])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", head[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(head[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+def _jpeg_size(data: np.ndarray) -> Optional[Tuple[int, int]]:
+    i, n = 2, len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            return None
+        marker = int(data[i + 1])
+        if marker == 0xFF:
+            i += 1
+            continue
+        length = (int(data[i + 2]) << 8) | int(data[i + 3])
+        if marker in _JPEG_SOF:
+            h = (int(data[i + 5]) << 8) | int(data[i + 6])
+            w = (int(data[i + 7]) << 8) | int(data[i + 8])
+            return w, h
+        i += 2 + length
+    return None
+
+def decode_flag(data: np.ndarray, target: int) -> int:
+    """Strongest IMREAD_REDUCED_* mode that still leaves the long side at or above ``target`` pixels."""
+    size = image_size(data)
+    if size is None:
+        return cv2.IMREAD_COLOR
+    longest = max(size)
+    for factor, flag in _REDUCED_FLAGS:
+        if longest // factor >= target:
+            return flag
+    return cv2.IMREAD_COLOR
+
+def decode_frame(frame_bytes, target: int) -> Optional[np.ndarray]:
+    """Decode an uploaded image straight to roughly model-input scale; ``frame_bytes`` is viewed, not copied."""
+    data = np.frombuffer(frame_bytes, np.uint8)
+    if not data.size:
+        return None
+    return cv2.imdecode(data, decode_flag(data, target))
@@ -1,59 +1,218 @@
-import cv2
 import numpy as np
-import os
+import time
 from datetime import datetime
-from ultralytics import YOLO
 from app.ai.base import BaseInferenceEngine
-from typing import Any, Dict
+from app.ai.runtime import RuntimeConfig
+from app.ai.state import Counters, SessionRecord, SessionStore
+from app.ai.vision.backends import BACKENDS
+from app.ai.vision.decode import decode_frame
+from app.ai.vision.motion import MotionDetector
+from app.ai.vision.tracker import PersonTracker
+from app.core.config import settings
+from typing import Any, Dict, List
+
+def keypoints_risky(kpts) -> bool:
+    """Wrist above shoulder on either side (keypoints at 0 are undetected)."""
+    if len(kpts) <= 10: return False
+    l_sh_y, r_sh_y = kpts[5][1], kpts[6][1]
+    l_wr_y, r_wr_y = kpts[9][1], kpts[10][1]
+    if l_wr_y > 0 and l_sh_y > 0 and l_wr_y < l_sh_y: return True
+    if r_wr_y > 0 and r_sh_y > 0 and r_wr_y < r_sh_y: return True
+    return False
+
+def padded_crops(frame: np.ndarray, boxes: np.ndarray, padding: float):
+    """Cut padded person crops; returns the crops, their (x0, y0) offsets in the frame and their box indices."""
+    h, w = frame.shape[:2]
+    crops, offsets, indices = [], [], []
+    for i, (x1, y1, x2, y2) in enumerate(boxes):
+        pad_x, pad_y = (x2 - x1) * padding, (y2 - y1) * padding
+        x0, y0 = max(int(x1 - pad_x), 0), max(int(y1 - pad_y), 0)
+        x3, y3 = min(int(x2 + pad_x), w), min(int(y2 + pad_y), h)
+        if x3 - x0 < 2 or y3 - y0 < 2: continue
+        crops.append(frame[y0:y3, x0:x3])
+        offsets.append((x0, y0))
+        indices.append(i)
+    return crops, offsets, indices
+
+def assign_poses(boxes: np.ndarray, poses: np.ndarray):
+    """Match full-frame poses to person boxes by the box holding most of each pose's visible keypoints."""
+    assigned = [None] * len(boxes)
+    for kpts in poses:
+        xy = kpts[:, :2][(kpts[:, :2] > 0).all(axis=1)]
+        if not len(xy) or not len(boxes): continue
+        inside = ((xy[None, :, 0] >= boxes[:, None, 0]) & (xy[None, :, 0] <= boxes[:, None, 2]) &
+                  (xy[None, :, 1] >= boxes[:, None, 1]) & (xy[None, :, 1] <= boxes[:, None, 3])).sum(axis=1)
+        best = int(inside.argmax())
+        if inside[best] and assigned[best] is None: assigned[best] = kpts
+    return assigned
+
+class VisionStream(SessionRecord):
+    """Per-stream state kept between frames."""
+    __slots__ = ("motion", "tracker", "static_frames", "since_detect")
+
+    def __init__(self, motion: MotionDetector, tracker: PersonTracker):
+        super().__init__()
+        self.motion = motion
+        self.tracker = tracker
+        self.static_frames = 0
+        self.since_detect = 0
 
 class VisionEngine(BaseInferenceEngine):
-    def __init__(self, artifacts_dir: str):
+    def __init__(self, artifacts_dir: str, backend: str = "onnxruntime", cascade: bool = True, crop_padding: float = 0.15,
+                 motion_gate: bool = True, motion_area: float = 0.01, max_static_frames: int = 15,
+                 detect_every: int = 3, track_min_confidence: float = 0.5, decode_target: int = 640,
+                 variant: str = "fp32", calibration_dir: str = None, runtime: RuntimeConfig = None,
+                 max_sessions: int = 4096, session_ttl: float = 600.0):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown vision backend '{backend}', expected one of {sorted(BACKENDS)}")
         self.artifacts_dir = artifacts_dir
+        self.backend = backend
+        self.cascade = cascade
+        self.crop_padding = crop_padding
+        self.motion_gate = motion_gate
+        self.motion_area = motion_area
+        self.max_static_frames = max_static_frames
+        self.detect_every = detect_every
+        self.track_min_confidence = track_min_confidence
+        self.decode_target = decode_target
+        self.variant = variant
+        self.calibration_dir = calibration_dir
+        self.runtime = runtime
         self.model_people = None
         self.model_pose = None
-        self._latest_result = {
+        self.sessions = SessionStore(lambda: VisionStream(MotionDetector(area_ratio=motion_area), PersonTracker()),
+                                     max_sessions=max_sessions, ttl_seconds=session_ttl)
+        self._counters = Counters("frames", "inferred", "tracked", "gated")
+        self._idle_result = {
             "people_count": 0, "pose_risk": False, "motion_detected": False, "active": False, "timestamp": None
         }
 
     def load_model(self, artifact_path: str = None) -> None:
-        from app.ai.model_downloader import ensure_vision_models
+        from app.ai.model_downloader import ensure_vision_models, ensure_vision_variant
         import logging
         logger = logging.getLogger(__name__)
-        
+
         path = artifact_path or self.artifacts_dir
-        
+
         # Ensure models are downloaded
         if not ensure_vision_models(path):
             logger.error("❌ Failed to prepare vision models")
             return
-        
-        logger.info(f"📁 Loading Vision models from {path}")
-        self.model_people = YOLO(os.path.join(path, "yolov8n.onnx"), task="detect")
-        self.model_pose = YOLO(os.path.join(path, "yolov8n-pose.onnx"), task="pose")
-        logger.info("✅ Vision models loaded successfully")
+
+        paths = ensure_vision_variant(path, self.variant, self.calibration_dir)
+        if paths is None:
+            logger.error(f"❌ Failed to prepare {self.variant} vision models")
+            return
+
+        logger.info(f"📁 Loading Vision models from {path} ({self.backend}, {self.variant})")
+        detector_cls, pose_cls = BACKENDS[self.backend]
+        self.model_people = detector_cls(paths[0], self.create_session)
+        self.model_pose = pose_cls(paths[1], self.create_session)
+        logger.info(f"✅ Vision models loaded successfully (cascade={self.cascade})")
 
     def predict(self, frame: Any) -> Dict[str, Any]:
         if self.model_people is None: return {}
-        results = self.model_people(frame, conf=0.4, verbose=False)
-        count = sum(1 for box in results[0].boxes if int(box.cls[0]) == 0)
-        poses = self.model_pose(frame, conf=0.4, verbose=False)
-        risky = False
-        if poses and poses[0].keypoints is not None:
-            for kpts in poses[0].keypoints.xy:
-                if len(kpts) > 10:
-                    l_sh_y, r_sh_y = kpts[5][1], kpts[6][1]
-                    l_wr_y, r_wr_y = kpts[9][1], kpts[10][1]
-                    if l_wr_y > 0 and l_sh_y > 0 and l_wr_y < l_sh_y: risky = True
-                    if r_wr_y > 0 and r_sh_y > 0 and r_wr_y < r_sh_y: risky = True
-        return {"people_count": count, "pose_risk": risky, "motion_detected": False, "active": True, "timestamp": datetime.now().isoformat()}
-
-    def process_frame(self, frame_bytes: bytes):
-        nparr = np.frombuffer(frame_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if frame is not None: self._latest_result = self.predict(frame)
+        boxes, _, _, _, risky = self._analyze(frame)
+        return {"people_count": len(boxes), "pose_risk": risky, "motion_detected": False, "active": True, "timestamp": datetime.now().isoformat()}
+
+    def _analyze(self, frame: np.ndarray):
+        """Full model pass, through the micro-batcher when one is enabled."""
+        return self.batcher(frame) if self.batcher else self._analyze_batch([frame])[0]
+
+    def predict_batch(self, frames: List[Any]) -> List[Dict[str, Any]]:
+        now = datetime.now().isoformat()
+        return [{"people_count": len(boxes), "pose_risk": risky, "motion_detected": False, "active": True, "timestamp": now}
+                for boxes, _, _, _, risky in self._analyze_batch(frames)]
+
+    def _analyze_batch(self, frames: List[np.ndarray]):
+        """
+        Full model pass over several frames (possibly from different sessions) in one detector call
+        and one pose call. Per frame: person boxes, scores, per-person keypoints, per-person and
+        frame-level pose risk.
+        """
+        detections = self.model_people.detect_batch(frames)
+        if self.cascade:
+            return self._pose_on_crops(frames, detections)
+        results = []
+        for frame, (boxes, scores), poses in zip(frames, detections, self.model_pose.keypoints(frames)):
+            keypoints = assign_poses(boxes, poses)
+            risky = [kpts is not None and keypoints_risky(kpts) for kpts in keypoints]
+            # Every pose in the frame counts, matched to a person box or not
+            results.append((boxes, scores, keypoints, risky, any(keypoints_risky(kpts) for kpts in poses)))
+        return results
+
+    def _pose_on_crops(self, frames: List[np.ndarray], detections):
+        crops, owners = [], []
+        results = []
+        for f, (frame, (boxes, scores)) in enumerate(zip(frames, detections)):
+            results.append((boxes, scores, [None] * len(boxes), [False] * len(boxes)))
+            frame_crops, offsets, indices = padded_crops(frame, boxes, self.crop_padding)
+            crops.extend(frame_crops)
+            owners.extend((f, i, offset) for offset, i in zip(offsets, indices))
+        # Frames with nobody in them contribute no crops, so the pose model never sees them
+        for poses, (f, i, (x0, y0)) in zip(self.model_pose.keypoints(crops) if crops else [], owners):
+            _, _, keypoints, risky = results[f]
+            for j, kpts in enumerate(poses):
+                # Shift detected keypoints back into frame coordinates; undetected ones stay at 0
+                kpts[:, :2] = np.where(kpts[:, :2] > 0, kpts[:, :2] + (x0, y0), 0)
+                if j == 0: keypoints[i] = kpts
+                if keypoints_risky(kpts): risky[i] = True
+        return [(boxes, scores, keypoints, risky, any(risky)) for boxes, scores, keypoints, risky in results]
+
+    def process_frame(self, frame_bytes: bytes, stream_id: str = "default"):
+        frame = decode_frame(frame_bytes, self.decode_target)
+        if frame is None or self.model_people is None: return
+        stream = self.sessions.get_or_create(stream_id)
+        self._counters.add(frames=1)
+        now = time.monotonic()
+        moving = stream.motion.update(frame) if self.motion_gate else True
+        if not moving and stream.last_result is not None and stream.static_frames < self.max_static_frames:
+            # Static scene: the models would see the same picture, so reuse their last answer
+            result = dict(stream.last_result, timestamp=datetime.now().isoformat())
+            stream.static_frames += 1
+            self._counters.add(gated=1)
+        elif (stream.static_frames < self.max_static_frames # at the cap a model pass is due, not more extrapolation
+              and stream.since_detect < self.detect_every - 1 and stream.tracker.confidence >= self.track_min_confidence):
+            tracks = stream.tracker.predict(now)
+            result = self._tracks_result(tracks, len(tracks), any(t.risky for t in tracks), now, tracked=True)
+            stream.since_detect += 1
+            self._counters.add(tracked=1)
+        else:
+            boxes, scores, keypoints, risky, frame_risky = self._analyze(frame)
+            tracks = stream.tracker.update(boxes, scores, keypoints, risky, now)
+            result = self._tracks_result(tracks, len(boxes), frame_risky, now, tracked=False)
+            stream.static_frames = 0
+            stream.since_detect = 0
+            self._counters.add(inferred=1)
+        result["motion_detected"] = moving
+        stream.last_result = result
+
+    @staticmethod
+    def _tracks_result(tracks, count: int, risky: bool, now: float, tracked: bool) -> Dict[str, Any]:
+        return {
+            "people_count": count, "pose_risk": risky, "motion_detected": False, "active": True, "timestamp": datetime.now().isoformat(),
+            "pose_risk_seconds": round(max((t.risk_seconds(now) for t in tracks), default=0.0), 1),
+            "track_ids": [t.track_id for t in tracks], "tracked": tracked,
+        }
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        counters = self._counters.snapshot()
+        frames = counters["frames"]
+        return {**counters, "gated_ratio": round(counters["gated"] / frames, 3) if frames else 0.0, "streams": len(self.sessions), "evicted": self.sessions.evictions}
 
     @property
     def status(self) -> Dict[str, Any]:
-        return self._latest_result
+        """Idle status; per-session results are read with ``status_for``."""
+        return self._idle_result
 
-vision_service = VisionEngine("app/artifacts/vision")
+vision_service = VisionEngine("app/artifacts/vision", backend=settings.VISION_BACKEND, cascade=settings.VISION_CASCADE, crop_padding=settings.VISION_CROP_PADDING,
+                              motion_gate=settings.VISION_MOTION_GATE, motion_area=settings.VISION_MOTION_AREA,
+                              max_static_frames=settings.VISION_MOTION_MAX_STATIC,
+                              detect_every=settings.VISION_DETECT_EVERY, track_min_confidence=settings.VISION_TRACK_MIN_CONFIDENCE,
+                              decode_target=settings.VISION_INGEST_WIDTH,
+                              variant=settings.VISION_MODEL_VARIANT, calibration_dir=settings.QUANT_CALIBRATION_DIR,
+                              runtime=RuntimeConfig.from_settings(settings.VISION_ORT_THREADS, settings.VISION_ORT_AFFINITY),
+                              max_sessions=settings.SESSION_MAX, session_ttl=settings.SESSION_TTL_SECONDS)
+if settings.INFERENCE_BATCHING:
+    vision_service.enable_batching(settings.INFERENCE_MAX_BATCH, settings.INFERENCE_MAX_WAIT_MS, run_batch=vision_service._analyze_batch)
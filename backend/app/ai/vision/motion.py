@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+from typing import Tuple
+
+class MotionDetector:
+    """
+    Frame differencing on a downscaled grayscale copy against a running-average background.
+    All working arrays are allocated once per stream, so a frame costs one resize and a few
+    in-place ops on ``size`` pixels.
+    """
+    def __init__(self, size: Tuple[int, int] = (64, 48), alpha: float = 0.05, pixel_threshold: float = 25.0, area_ratio: float = 0.01):
+        w, h = size
+        self.size = size
+        self.alpha = alpha
+        self.pixel_threshold = pixel_threshold
+        self.area_ratio = area_ratio
+        self.changed_ratio = 0.0
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._gray_f = np.empty((h, w), dtype=np.float32)
+        self._diff = np.empty((h, w), dtype=np.float32)
+        self._background = np.zeros((h, w), dtype=np.float32)
+        self._initialized = False
+
+    def update(self, frame: np.ndarray) -> bool:
+        """Feed one BGR frame; returns True when enough of the scene changed against the background."""
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        np.copyto(self._gray_f, self._gray, casting="unsafe")
+        if not self._initialized:
+            # Nothing to compare against yet, so the first frame always goes to the models
+            np.copyto(self._background, self._gray_f)
+            self._initialized = True
+            self.changed_ratio = 1.0
+            return True
+        cv2.absdiff(self._gray_f, self._background, dst=self._diff)
+        cv2.threshold(self._diff, self.pixel_threshold, 1.0, cv2.THRESH_BINARY, dst=self._diff)
+        self.changed_ratio = cv2.countNonZero(self._diff) / self._diff.size
+        cv2.accumulateWeighted(self._gray_f, self._background, self.alpha)
+        return self.changed_ratio >= self.area_ratio
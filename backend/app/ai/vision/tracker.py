@@ -0,0 +1,110 @@
+import itertools
+import numpy as np
+from typing import List, Optional
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes."""
+    xx1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xx2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-7)
+
+class Track:
+    __slots__ = ("track_id", "box", "detected_box", "detected_at", "velocity", "keypoints", "confidence", "misses", "risky", "risky_since", "updated_at")
+
+    def __init__(self, track_id: int, box: np.ndarray, keypoints: Optional[np.ndarray], confidence: float, now: float):
+        self.track_id = track_id
+        self.box = box.astype(np.float32)
+        # Last detector box; ``box`` moves with every prediction, so velocity is measured against this
+        self.detected_box = self.box.copy()
+        self.detected_at = now
+        self.velocity = np.zeros(4, dtype=np.float32) # box units per second
+        self.keypoints = keypoints
+        self.confidence = confidence
+        self.misses = 0
+        self.risky = False
+        self.risky_since = None
+        self.updated_at = now
+
+    def risk_seconds(self, now: float) -> float:
+        return now - self.risky_since if self.risky_since is not None else 0.0
+
+class PersonTracker:
+    """
+    IoU tracker with constant-velocity motion between detector runs.
+
+    ``update`` associates fresh detections with existing tracks; ``predict`` moves the tracks
+    (and their keypoints) along their velocity without touching the models and decays their
+    confidence, so the caller knows when a new detector pass is due.
+    """
+    def __init__(self, iou_threshold: float = 0.3, decay: float = 0.85, max_misses: int = 2, smoothing: float = 0.5):
+        self.iou_threshold = iou_threshold
+        self.decay = decay
+        self.max_misses = max_misses
+        self.smoothing = smoothing
+        self.tracks: List[Track] = []
+        self._ids = itertools.count(1)
+
+    @property
+    def confidence(self) -> float:
+        """Weakest track confidence; 0 with no tracks, since someone entering would go unseen."""
+        return min((t.confidence for t in self.tracks), default=0.0)
+
+    def update(self, boxes: np.ndarray, scores: np.ndarray, keypoints: List[Optional[np.ndarray]], risky: List[bool], now: float) -> List[Track]:
+        matched_tracks, matched_dets = set(), set()
+        if self.tracks and len(boxes):
+            ious = iou_matrix(np.stack([t.box for t in self.tracks]), boxes)
+            # Greedy assignment, best overlap first
+            for flat in np.argsort(ious, axis=None)[::-1]:
+                ti, di = divmod(int(flat), ious.shape[1])
+                if ious[ti, di] < self.iou_threshold: break
+                if ti in matched_tracks or di in matched_dets: continue
+                matched_tracks.add(ti)
+                matched_dets.add(di)
+                track = self.tracks[ti]
+                dt = now - track.detected_at
+                if dt > 0:
+                    track.velocity = (1 - self.smoothing) * track.velocity + self.smoothing * (boxes[di] - track.detected_box) / dt
+                track.box = boxes[di].astype(np.float32)
+                track.detected_box = track.box.copy()
+                track.detected_at = now
+                track.keypoints = keypoints[di]
+                track.confidence = float(scores[di])
+                track.misses = 0
+                track.updated_at = now
+                self._set_risk(track, risky[di], now)
+        survivors = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+                track.confidence *= self.decay
+                if track.misses > self.max_misses: continue
+            survivors.append(track)
+        for di in range(len(boxes)):
+            if di in matched_dets: continue
+            track = Track(next(self._ids), boxes[di], keypoints[di], float(scores[di]), now)
+            self._set_risk(track, risky[di], now)
+            survivors.append(track)
+        self.tracks = survivors
+        return [t for t in self.tracks if t.misses == 0]
+
+    def predict(self, now: float) -> List[Track]:
+        for track in self.tracks:
+            shift = track.velocity * (now - track.updated_at)
+            track.box = track.box + shift
+            if track.keypoints is not None:
+                visible = track.keypoints[:, :2] > 0
+                track.keypoints[:, :2] += np.where(visible, shift[:2], 0)
+            track.confidence *= self.decay
+            track.updated_at = now
+        return [t for t in self.tracks if t.misses == 0]
+
+    @staticmethod
+    def _set_risk(track: Track, risky: bool, now: float) -> None:
+        if risky and track.risky_since is None: track.risky_since = now
+        if not risky: track.risky_since = None
+        track.risky = risky
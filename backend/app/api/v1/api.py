@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import emergency, contacts, settings, dashboard, login, users, responder
+from app.api.v1.endpoints import emergency, contacts, settings, dashboard, login, users, responder, zones
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -8,4 +8,5 @@ api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboar
 api_router.include_router(emergency.router, prefix="/emergency", tags=["Emergency"])
 api_router.include_router(contacts.router, prefix="/contacts", tags=["Contacts"])
 api_router.include_router(settings.router, prefix="/settings", tags=["Settings"])
-api_router.include_router(responder.router, prefix="/responder", tags=["Responder"])
\ No newline at end of file
+api_router.include_router(responder.router, prefix="/responder", tags=["Responder"])
+api_router.include_router(zones.router, prefix="/zones", tags=["Zones"])
\ No newline at end of file
@@ -1,16 +1,21 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+import asyncio
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 from app.core import security
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models.user import User
 from app.schemas.user import TokenData
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
+WS_AUTH_TIMEOUT = 10.0
 
 def get_db() -> Generator:
     try:
@@ -19,12 +24,52 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)) -> User:
+    return user_from_token(db, token)
+
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)) -> User:
+    """``get_current_user`` for endpoints on ``get_async_db``: the lookup reuses the endpoint's session and connection."""
+    user = await db.scalar(select(User).where(User.email == token_subject(token)))
+    if not user: raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+def get_stream_user(token: str = Query(..., description="JWT; EventSource cannot send an Authorization header")) -> User:
+    """Auth for long-lived streams: the DB session is closed right away instead of living as long as the response."""
+    db = SessionLocal()
+    try:
+        return user_from_token(db, token)
+    finally:
+        db.close()
+
+def token_subject(token: str) -> str:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         token_data = TokenData(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
-    user = db.query(User).filter(User.email == token_data.sub).first()
+    return token_data.sub
+
+def user_from_token(db: Session, token: str) -> User:
+    user = db.query(User).filter(User.email == token_subject(token)).first()
     if not user: raise HTTPException(status_code=404, detail="User not found")
     return user
+
+
+async def websocket_user(websocket: WebSocket) -> Optional[User]:
+    """Authenticate an accepted WebSocket once, from its first message {"token": "<jwt>"}; closes it (1008) on failure."""
+    try:
+        message = await asyncio.wait_for(websocket.receive_json(), timeout=WS_AUTH_TIMEOUT)
+        db = SessionLocal()
+        try:
+            return await run_in_threadpool(user_from_token, db, str(message.get("token", "")))
+        finally:
+            db.close()
+    except WebSocketDisconnect:
+        return None # gone during the handshake: nothing left to close
+    except (asyncio.TimeoutError, HTTPException, ValueError, AttributeError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return None
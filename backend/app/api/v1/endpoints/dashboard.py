@@ -1,25 +1,97 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+import asyncio
+import json
+import struct
+from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from typing import List, Optional, Tuple
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.api.v1 import deps
+from app.ai.executor import inference_executor, ExecutorBusy, Superseded
 from app.ai.vision.engine import vision_service
 from app.ai.audio.engine import audio_service
 from app.services.decision import decision_engine
+from app.services.notifier import status_notifier
+from app.services.broker import event_broker
+from app.services.hotspots import hotspot_grid
 from app.models.user import User
+from app.core.config import settings
 
 router = APIRouter()
 
+# WebSocket ingest records: 1-byte tag + 4-byte big-endian payload length + payload
+RECORD_HEADER = struct.Struct(">BI")
+TAG_VIDEO = 0x01 # one encoded camera frame
+TAG_AUDIO = 0x02 # next timeslice of the current audio recording
+TAG_AUDIO_START = 0x03 # first timeslice (WebM header) of a new audio recording
+
 def startup_ai_services():
     print("🤖 AI Services: Loading Models...")
     vision_service.load_model()
     audio_service.load_model()
     print("✅ AI Models Loaded (Passive Mode)")
 
-def shutdown_ai_services(): pass
+def shutdown_ai_services():
+    inference_executor.shutdown()
+    audio_service.decoders.close_all()
+    for engine in (vision_service, audio_service):
+        if engine.batcher: engine.batcher.stop()
 
 @router.get("/status")
 def get_system_status(current_user: User = Depends(deps.get_current_user)):
-    v_stat = vision_service.status
-    a_stat = audio_service.status
-    risk = decision_engine.compute_risk(v_stat, a_stat)
+    return build_status(str(current_user.id))
+
+@router.get("/status/stream")
+async def stream_system_status(request: Request, current_user: User = Depends(deps.get_stream_user)):
+    """
+    Server-sent events carrying the ``/status`` payload, sent only when it changed (see
+    ``status_change_key``) and at most once per ``STATUS_PUSH_INTERVAL``; a comment line keeps
+    idle connections open.
+    """
+    session_id = str(current_user.id)
+
+    async def events():
+        changed = status_notifier.subscribe(session_id)
+        last = None
+        try:
+            while not await request.is_disconnected():
+                status = build_status(session_id)
+                key = status_change_key(status)
+                if key != last:
+                    last = key
+                    yield f"data: {json.dumps(status)}\n\n"
+                else:
+                    yield ": keepalive\n\n"
+                # Coalescing window: updates landing in it go out together on the next pass
+                await asyncio.sleep(settings.STATUS_PUSH_INTERVAL)
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=settings.STATUS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    pass # also re-checks sessions that went idle
+                changed.clear()
+        finally:
+            status_notifier.unsubscribe(session_id, changed)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def observe(session_id: str) -> None:
+    """After new inference results for a session: feed the risk fuser once, then wake its status streams."""
+    decision_engine.assess(session_id, vision_service.status_for(session_id), audio_service.status_for(session_id), observe=True)
+    status_notifier.notify(session_id)
+
+def status_change_key(status: dict) -> tuple:
+    """What a client would notice: leaves out timestamps, which every processed (even motion-gated) frame refreshes."""
+    v, a, r = status["vision"], status["audio"], status["risk"]
+    return (
+        v.get("people_count"), v.get("pose_risk"), v.get("motion_detected"),
+        a.get("emotion"), round(a.get("confidence") or 0.0, 2),
+        r["threat_level"], r.get("alerting"), round(r.get("fused_score", r["threat_score"]), 2),
+        tuple(status["system"].values()),
+    )
+
+def build_status(session_id: str):
+    v_stat = vision_service.status_for(session_id)
+    a_stat = audio_service.status_for(session_id)
+    risk = decision_engine.assess(session_id, v_stat, a_stat)
     return {
         "vision": v_stat, 
         "audio": a_stat, 
@@ -32,18 +104,147 @@ def get_system_status(current_user: User = Depends(deps.get_current_user)):
         }
     }
 
+@router.get("/metrics")
+def get_inference_metrics(current_user: User = Depends(deps.get_current_user)):
+    return {
+        "vision": vision_service.metrics,
+        "executor": inference_executor.metrics,
+        "audio": audio_service.metrics,
+        "status_subscribers": status_notifier.subscribers,
+        "event_broker": event_broker.metrics,
+        "hotspots": hotspot_grid.metrics,
+        "batching": {
+            "vision": vision_service.batcher.metrics if vision_service.batcher else None,
+            "audio": audio_service.batcher.metrics if audio_service.batcher else None,
+        },
+    }
+
+@router.get("/ingest/config")
+def get_ingest_config():
+    """Capture format the Monitor page should send, so clients stop uploading full camera frames."""
+    return {
+        "vision": {
+            "width": settings.VISION_INGEST_WIDTH,
+            "format": settings.VISION_INGEST_FORMAT,
+            "quality": settings.VISION_INGEST_QUALITY,
+            "accepted_formats": ["image/jpeg", "image/webp", "image/png"],
+        }
+    }
+
 @router.post("/ingest/vision")
 async def ingest_vision(file: UploadFile = File(...), current_user: User = Depends(deps.get_current_user)):
     try:
         contents = await file.read()
-        vision_service.process_frame(contents)
+        session_id = str(current_user.id)
+        # Only the newest frame of a session waits in the queue; an older queued one is dropped
+        await inference_executor.run(vision_service.process_frame, contents, session_id, key=("vision", session_id))
+        observe(session_id)
         return {"status": "ok"}
+    except Superseded: return {"status": "dropped"}
+    except ExecutorBusy: return JSONResponse(status_code=429, content={"status": "busy"})
     except Exception as e: return {"status": "error", "detail": str(e)}
 
 @router.post("/ingest/audio")
-async def ingest_audio(file: UploadFile = File(...), current_user: User = Depends(deps.get_current_user)):
+async def ingest_audio(file: UploadFile = File(...), seq: Optional[int] = Form(None),
+                       current_user: User = Depends(deps.get_current_user)):
+    """``seq`` numbers the timeslices of one continuous recording; omit it to send a standalone file."""
     try:
         contents = await file.read()
-        audio_service.process_audio(contents)
+        ok = await inference_executor.run(audio_service.process_audio, contents, str(current_user.id), seq)
+        observe(str(current_user.id))
+        if not ok:
+            return {"status": "restart"}
         return {"status": "ok"}
+    except ExecutorBusy: return JSONResponse(status_code=429, content={"status": "busy"})
     except Exception as e: return {"status": "error", "detail": str(e)}
+
+
+def parse_records(data: bytes) -> List[Tuple[int, memoryview]]:
+    """Split one binary WebSocket message into (tag, payload) records; payloads are views, not copies."""
+    view = memoryview(data)
+    records, offset = [], 0
+    while offset < len(view):
+        if offset + RECORD_HEADER.size > len(view):
+            raise ValueError("Truncated record header")
+        tag, length = RECORD_HEADER.unpack_from(view, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > len(view):
+            raise ValueError("Truncated record payload")
+        records.append((tag, view[offset:offset + length]))
+        offset += length
+    return records
+
+@router.websocket("/ingest/ws")
+async def ingest_stream(websocket: WebSocket):
+    """
+    Combined audio/video ingest over one socket. The first message authenticates ({"token": "<jwt>"});
+    after that every binary message carries one or more tagged records (see ``parse_records``) and
+    each record is answered with a JSON message carrying the session's updated status. At most
+    ``INGEST_WS_MAX_IN_FLIGHT`` records are processed at once; further messages wait unread.
+    """
+    await websocket.accept()
+    current_user = await deps.websocket_user(websocket)
+    if current_user is None:
+        return
+    session_id = str(current_user.id)
+    send_lock = asyncio.Lock()
+    in_flight = set()
+    audio_seq = 0
+
+    async def reply(message: dict):
+        try:
+            async with send_lock:
+                await websocket.send_json(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass # client went away while inference was running
+
+    async def handle(tag: int, payload: memoryview, seq: int):
+        kind = "vision" if tag == TAG_VIDEO else "audio"
+        try:
+            if tag == TAG_VIDEO:
+                await inference_executor.run(vision_service.process_frame, payload, session_id, key=("vision", session_id))
+                observe(session_id)
+                await reply({"type": kind, "status": "ok", "result": vision_service.status_for(session_id)})
+            else:
+                ok = await inference_executor.run(audio_service.process_audio, bytes(payload), session_id, seq)
+                observe(session_id)
+                await reply({"type": kind, "status": "ok" if ok else "restart", "result": audio_service.status_for(session_id)})
+        except Superseded: await reply({"type": kind, "status": "dropped"})
+        except ExecutorBusy: await reply({"type": kind, "status": "busy"})
+        except Exception as e: await reply({"type": kind, "status": "error", "detail": str(e)})
+
+    await reply({"type": "ready"})
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is None:
+                continue
+            try:
+                records = parse_records(message["bytes"])
+            except ValueError as e:
+                await reply({"type": "error", "detail": str(e)})
+                continue
+            for tag, payload in records:
+                if tag == TAG_AUDIO_START:
+                    audio_seq = 0
+                elif tag not in (TAG_VIDEO, TAG_AUDIO):
+                    await reply({"type": "error", "detail": f"Unknown record tag {tag}"})
+                    continue
+                # The socket preserves order, so audio pieces are numbered here instead of by the client
+                seq = audio_seq if tag != TAG_VIDEO else -1
+                if tag != TAG_VIDEO:
+                    audio_seq += 1
+                # Backpressure: stop reading the socket until a record finishes, so a fast client
+                # is slowed by TCP flow control instead of piling up tasks and "busy" replies
+                while len(in_flight) >= settings.INGEST_WS_MAX_IN_FLIGHT:
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                task = asyncio.create_task(handle(tag, payload, seq))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in in_flight:
+            task.cancel()
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import Optional, List
 from app.api.v1 import deps
 from app.models.user import User
@@ -11,8 +13,14 @@ from app.schemas.user import User as UserResponse
 from app.ai.audio.engine import audio_service
 from app.ai.vision.engine import vision_service
 from app.services.decision import decision_engine
+from app.services.notifier import status_notifier
+from app.services.events import publish_event
+from app.services.hotspots import hotspot_grid
+from app.core.config import settings
+from app.utils.phone import normalize_phone
 from datetime import datetime
 from pydantic import BaseModel
+from app.ai.executor import inference_executor, ExecutorBusy, Superseded
 
 import logging
 router = APIRouter()
@@ -29,8 +37,8 @@ from app.schemas.emergency import EmergencyEventResponse, AlertResponse
 async def trigger_sos(
     latitude: float = Form(...), 
     longitude: float = Form(...), 
-    db: Session = Depends(deps.get_db), 
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db), 
+    current_user: User = Depends(deps.get_current_user_async)
 ):
     logger.info(f"🚨 SOS RECEIVED from {current_user.full_name} (ID: {current_user.id})")
     logger.info(f"📍 Location: {latitude}, {longitude}")
@@ -43,8 +51,7 @@ async def trigger_sos(
         status="triggered"
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.flush()
     logger.info(f"✅ Event created with ID: {event.id}")
 
     # Log to responder action logs
@@ -55,10 +62,12 @@ async def trigger_sos(
         note=f"SOS triggered by {current_user.full_name}"
     )
     db.add(log)
-    db.commit()
+    await db.commit()
     logger.info(f"📝 Action log created for event {event.id}")
 
     await simulate_alerts(db, current_user, event)
+    event = await load_event(db, event.id)
+    publish_event("created", event, current_user)
     return event
 
 @router.post("/ml-inference", response_model=EmergencyEventResponse)
@@ -67,32 +76,44 @@ async def ml_inference(
     longitude: float = Form(...), 
     audio: Optional[UploadFile] = File(None), 
     video: Optional[UploadFile] = File(None), 
-    db: Session = Depends(deps.get_db), 
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db), 
+    current_user: User = Depends(deps.get_current_user_async)
 ):
-    if audio:
-        audio_content = await audio.read()
-        audio_service.process_audio(audio_content)
-    
-    if video:
-        video_content = await video.read()
-        vision_service.process_frame(video_content)
+    try:
+        if audio:
+            audio_content = await audio.read()
+            await inference_executor.run(audio_service.process_audio, audio_content, str(current_user.id))
+
+        if video:
+            video_content = await video.read()
+            await inference_executor.run(vision_service.process_frame, video_content, str(current_user.id), key=("vision", str(current_user.id)))
+    except Superseded:
+        pass # A newer frame of this session replaced ours; assess on what that one produces
+    except ExecutorBusy:
+        raise HTTPException(status_code=429, detail="Inference is busy, retry shortly")
     
-    v_stat = vision_service.status
-    a_stat = audio_service.status
-    risk_data = decision_engine.compute_risk(v_stat, a_stat)
-    risk_score = risk_data["threat_score"]
+    session_id = str(current_user.id)
+    v_stat = vision_service.status_for(session_id)
+    a_stat = audio_service.status_for(session_id)
+    # Streaming ingest of this session scores with the same location from here on
+    decision_engine.set_context(session_id, {"location_risk": hotspot_grid.risk_at(latitude, longitude, user_id=current_user.id)})
+    # A manual scan is one deliberate reading, not a stream sample: it does not feed the session's fused
+    # state (streaming ingest does) and alerts on its own level, or when the live session already alerts
+    risk_data = decision_engine.assess(session_id, v_stat, a_stat)
+    if audio or video:
+        status_notifier.notify(session_id)
+    alerting = risk_data["instant_level"] == "HIGH" or risk_data["alerting"]
+    risk_score = max(risk_data["threat_score"], risk_data["fused_score"])
     
     event = EmergencyEvent(
         user_id=current_user.id, 
         latitude=latitude, 
         longitude=longitude, 
         risk_score=risk_score,
-        status="triggered" if risk_score >= 0.7 else "monitored"
+        status="triggered" if alerting else "monitored"
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.flush()
     
     if event.status == "triggered":
         # Log to responder action logs
@@ -103,23 +124,46 @@ async def ml_inference(
             note=f"AI detected threat (Score: {risk_score:.2f}) for {current_user.full_name}"
         )
         db.add(log)
-        db.commit()
+    await db.commit()
+    if event.status == "triggered":
         await simulate_alerts(db, current_user, event)
+    event = await load_event(db, event.id)
+    # "monitored" readings arrive on every sensor tick and need no responder: keep them off the live feed
+    if event.status == "triggered":
+        publish_event("created", event, current_user)
         
     return event
 
+async def load_event(db: AsyncSession, event_id: int) -> EmergencyEvent:
+    """The event with everything the response and the live feed read, since an AsyncSession cannot lazy-load."""
+    result = await db.execute(
+        select(EmergencyEvent)
+        .options(joinedload(EmergencyEvent.user), selectinload(EmergencyEvent.alerts), selectinload(EmergencyEvent.action_logs))
+        .where(EmergencyEvent.id == event_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
 @router.get("/history", response_model=List[EmergencyEventResponse])
 def get_history(
     db: Session = Depends(deps.get_db), 
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user),
+    limit: int = Query(settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
-    events = db.query(EmergencyEvent).filter(EmergencyEvent.user_id == current_user.id).order_by(EmergencyEvent.timestamp.desc()).all()
+    # Three queries per page whatever its size: events, their alerts, their logs joined with the responder
+    events = (db.query(EmergencyEvent)
+              .filter(EmergencyEvent.user_id == current_user.id)
+              .options(selectinload(EmergencyEvent.alerts),
+                       selectinload(EmergencyEvent.action_logs).joinedload(ResponderActionLog.responder))
+              .order_by(EmergencyEvent.timestamp.desc(), EmergencyEvent.id.desc())
+              .offset(offset).limit(limit).all())
     results = []
     for event in events:
         results.append({
             "id": event.id,
             "user_id": event.user_id,
-            "user_name": event.user.full_name,
+            "user_name": current_user.full_name,
             "latitude": event.latitude,
             "longitude": event.longitude,
             "risk_score": event.risk_score,
@@ -143,7 +187,7 @@ def get_history(
                     "action": log.action,
                     "note": log.note,
                     "timestamp": log.timestamp
-                } for log in db.query(ResponderActionLog).filter(ResponderActionLog.event_id == event.id).all()
+                } for log in event.action_logs
             ]
         })
     return results
@@ -151,36 +195,46 @@ def get_history(
 @router.get("/received")
 def get_received_alerts(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_user),
+    limit: int = Query(settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
 ):
-    if not current_user.phone_number:
+    phone = current_user.phone_e164 or normalize_phone(current_user.phone_number)
+    if not phone:
         return []
     
-    # Find alerts sent to current user's phone number
-    alerts = db.query(Alert).filter(Alert.contact_phone == current_user.phone_number).all()
+    # Alerts sent to the current user's number (any formatting), with their event and victim, in one query
+    rows = (db.query(Alert.id, Alert.message, Alert.sent_at, Alert.latitude, Alert.longitude, Alert.media_path,
+                     EmergencyEvent.latitude, EmergencyEvent.longitude, EmergencyEvent.risk_score, EmergencyEvent.status,
+                     User.full_name, User.phone_number)
+            .join(EmergencyEvent, Alert.event_id == EmergencyEvent.id)
+            .join(User, EmergencyEvent.user_id == User.id)
+            .filter(Alert.phone_e164 == phone)
+            .order_by(Alert.sent_at.desc(), Alert.id.desc())
+            .offset(offset).limit(limit).all())
     
-    # Group by event and include user info
     results = []
-    for alert in alerts:
-        event = db.query(EmergencyEvent).filter(EmergencyEvent.id == alert.event_id).first()
-        victim = db.query(User).filter(User.id == event.user_id).first()
+    for (alert_id, message, sent_at, alert_lat, alert_lon, media_path,
+         event_lat, event_lon, risk_score, status, victim_name, victim_phone) in rows:
         results.append({
-            "alert_id": alert.id,
-            "message": alert.message,
-            "timestamp": alert.sent_at,
-            "victim_name": victim.full_name,
-            "victim_phone": victim.phone_number,
-            "latitude": alert.latitude or event.latitude,
-            "longitude": alert.longitude or event.longitude,
-            "risk_score": event.risk_score,
-            "status": event.status,
-            "media_path": getattr(alert, 'media_path', None)
+            "alert_id": alert_id,
+            "message": message,
+            "timestamp": sent_at,
+            "victim_name": victim_name,
+            "victim_phone": victim_phone,
+            "latitude": alert_lat or event_lat,
+            "longitude": alert_lon or event_lon,
+            "risk_score": risk_score,
+            "status": status,
+            "media_path": media_path
         })
-    return sorted(results, key=lambda x: x["timestamp"], reverse=True)
+    return results
 
-async def simulate_alerts(db: Session, user: User, event: EmergencyEvent):
+async def simulate_alerts(db: AsyncSession, user: User, event: EmergencyEvent):
 
-    contacts = db.query(EmergencyContact).filter(EmergencyContact.owner_id == user.id, EmergencyContact.is_active == True).all()
+    contacts = (await db.scalars(
+        select(EmergencyContact).where(EmergencyContact.owner_id == user.id, EmergencyContact.is_active == True)
+    )).all()
 
     for contact in contacts:
 
@@ -208,4 +262,4 @@ async def simulate_alerts(db: Session, user: User, event: EmergencyEvent):
 
         logger.info(f"📤 [SIMULATED ALERT] To: {contact.name} ({contact.phone_number})")
 
-    db.commit()
+    await db.commit()
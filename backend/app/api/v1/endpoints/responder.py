@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
+import asyncio
+import json
 from app.api.v1 import deps
+from app.api.v1.pagination import keyset_page
 from app.models.user import User
 from app.models.event import EmergencyEvent, Alert
 from app.models.responder import ResponderActionLog
 from app.schemas.responder import ResponderActionLogResponse, ResponderActionLogCreate, AlertUpdate
 from app.schemas.emergency import EmergencyEventResponse # Need to make sure this exists
+from app.services.broker import event_broker
+from app.services.events import RESPONDER_TOPIC, publish_event
+from app.core.config import settings
 from datetime import datetime
 
 router = APIRouter()
@@ -16,17 +23,38 @@ def check_responder_role(current_user: User = Depends(deps.get_current_user)):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
 
+def check_stream_responder_role(current_user: User = Depends(deps.get_stream_user)):
+    return check_responder_role(current_user)
+
 @router.get("/events", response_model=List[EmergencyEventResponse])
 def get_all_events(
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(check_responder_role),
-    status: str = Query(None)
+    status: str = Query(None),
+    user_id: Optional[int] = Query(None),
+    min_risk: Optional[float] = Query(None, ge=0, le=1),
+    max_risk: Optional[float] = Query(None, ge=0, le=1),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE)
 ):
-    query = db.query(EmergencyEvent)
+    query = db.query(EmergencyEvent).options(joinedload(EmergencyEvent.user), selectinload(EmergencyEvent.alerts))
     if status:
         query = query.filter(EmergencyEvent.status == status)
+    if user_id is not None:
+        query = query.filter(EmergencyEvent.user_id == user_id)
+    if min_risk is not None:
+        query = query.filter(EmergencyEvent.risk_score >= min_risk)
+    if max_risk is not None:
+        query = query.filter(EmergencyEvent.risk_score <= max_risk)
+    if since:
+        query = query.filter(EmergencyEvent.timestamp >= since)
+    if until:
+        query = query.filter(EmergencyEvent.timestamp < until)
     
-    events = query.order_by(EmergencyEvent.timestamp.desc()).all()
+    events = keyset_page(query, EmergencyEvent.timestamp, EmergencyEvent.id, cursor, limit, response)
     
     results = []
     for event in events:
@@ -77,6 +105,7 @@ def acknowledge_event(
     )
     db.add(log)
     db.commit()
+    publish_event("acknowledged", event, current_user)
     return {"message": "Event acknowledged"}
 
 @router.post("/events/{event_id}/resolve")
@@ -104,14 +133,60 @@ def resolve_event(
     )
     db.add(log)
     db.commit()
+    publish_event("resolved", event, current_user)
     return {"message": "Event resolved"}
 
+@router.get("/events/stream")
+async def stream_events(request: Request, current_user: User = Depends(check_stream_responder_role)):
+    """
+    Server-sent events for the incident lifecycle (``event.created``, ``event.acknowledged``,
+    ``event.resolved``). A responder that falls too far behind is disconnected; the client
+    reconnects and reloads ``/events`` to catch up.
+    """
+    async def events():
+        sub = event_broker.subscribe(RESPONDER_TOPIC)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(sub.get(), timeout=settings.STATUS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    break # dropped as a slow consumer
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            event_broker.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @router.get("/logs", response_model=List[ResponderActionLogResponse])
 def get_responder_logs(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(check_responder_role)
+    current_user: User = Depends(check_responder_role),
+    responder_id: Optional[int] = Query(None),
+    event_id: Optional[int] = Query(None),
+    action: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE)
 ):
-    logs = db.query(ResponderActionLog).order_by(ResponderActionLog.timestamp.desc()).all()
+    query = db.query(ResponderActionLog).options(joinedload(ResponderActionLog.responder))
+    if responder_id is not None:
+        query = query.filter(ResponderActionLog.responder_id == responder_id)
+    if event_id is not None:
+        query = query.filter(ResponderActionLog.event_id == event_id)
+    if action:
+        query = query.filter(ResponderActionLog.action == action)
+    if since:
+        query = query.filter(ResponderActionLog.timestamp >= since)
+    if until:
+        query = query.filter(ResponderActionLog.timestamp < until)
+
+    logs = keyset_page(query, ResponderActionLog.timestamp, ResponderActionLog.id, cursor, limit, response)
     results = []
     for log in logs:
         results.append({
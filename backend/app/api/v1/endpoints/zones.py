@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+from app.api.v1 import deps
+from app.models.zone import UnsafeZone
+from app.models.user import User
+from app.schemas.zone import UnsafeZone as UnsafeZoneResponse, UnsafeZoneCreate
+from app.services.hotspots import hotspot_grid
+
+router = APIRouter()
+
+@router.get("/", response_model=List[UnsafeZoneResponse])
+def read_zones(db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)):
+    return db.query(UnsafeZone).filter(UnsafeZone.owner_id == current_user.id).all()
+
+@router.post("/", response_model=UnsafeZoneResponse)
+def create_zone(zone_in: UnsafeZoneCreate, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)):
+    zone = UnsafeZone(**zone_in.model_dump(), owner_id=current_user.id)
+    db.add(zone)
+    db.commit()
+    db.refresh(zone)
+    hotspot_grid.request_refresh()
+    return zone
+
+@router.delete("/{zone_id}")
+def delete_zone(zone_id: int, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)):
+    zone = db.query(UnsafeZone).filter(UnsafeZone.id == zone_id, UnsafeZone.owner_id == current_user.id).first()
+    if not zone: raise HTTPException(status_code=404, detail="Not found")
+    db.delete(zone)
+    db.commit()
+    hotspot_grid.request_refresh()
+    return {"ok": True}
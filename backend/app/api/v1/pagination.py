@@ -0,0 +1,41 @@
+"""
+Keyset ("seek") pagination over ``(timestamp, id)``, newest first.
+
+A page is ``ORDER BY timestamp DESC, id DESC LIMIT n+1`` starting strictly after the cursor
+row, so every page costs the same index range scan no matter how deep it is. The cursor for
+the next page goes out in the ``X-Next-Cursor`` response header (absent on the last page).
+"""
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, timestamp_column, id_column, cursor: Optional[str], limit: int, response: Response) -> List:
+    """Apply the cursor, ordering and limit to ``query``; sets the next-page header on ``response``."""
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        query = query.filter(or_(timestamp_column < ts, and_(timestamp_column == ts, id_column < row_id)))
+    rows = query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+    return rows
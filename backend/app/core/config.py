@@ -1,3 +1,4 @@
+import re
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -12,17 +13,118 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str = "wsa"
     DATABASE_URL: Optional[str] = None
+    ASYNC_DATABASE_URL: Optional[str] = None # Defaults to DATABASE_URL with its async driver (asyncpg / aiosqlite)
 
     # Auth
     SECRET_KEY: str = "INDUSTRY_READY_SECRET_KEY_CHANGE_IN_PROD"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7 # 1 week
 
+    # onnxruntime sessions (shared by every engine)
+    ORT_INTRA_OP_THREADS: int = 0 # 0 = split the cores evenly between the engines
+    ORT_INTER_OP_THREADS: int = 1
+    ORT_EXECUTION_MODE: str = "sequential" # "sequential" or "parallel"
+    ORT_GRAPH_OPTIMIZATION: str = "all" # "disable", "basic", "extended" or "all"
+    ORT_CPU_MEM_ARENA: bool = True
+    ORT_MEM_PATTERN: bool = True
+    ORT_ALLOW_SPINNING: bool = False
+    ORT_OPTIMIZED_CACHE_DIR: str = "app/artifacts/ort_cache" # "" disables the optimized-graph cache
+    VISION_ORT_THREADS: int = 0 # Per-engine override of ORT_INTRA_OP_THREADS
+    AUDIO_ORT_THREADS: int = 0
+    # Per-engine core pinning, one ";"-separated entry per intra-op thread after the first,
+    # e.g. VISION "1;2;3" / AUDIO "5;6;7" keeps the two pools on disjoint cores
+    VISION_ORT_AFFINITY: str = ""
+    AUDIO_ORT_AFFINITY: str = ""
+
+    # Per-session inference state (one record per monitored user in each engine)
+    SESSION_MAX: int = 4096 # Hard cap; least recently active sessions are evicted first
+    SESSION_TTL_SECONDS: float = 600.0 # Sessions idle this long are dropped
+
+    # Streaming audio: one long-lived ffmpeg decoder per session fed with MediaRecorder timeslices
+    AUDIO_WINDOW_SECONDS: float = 5.0 # Decoded audio is analyzed in windows of this length
+    AUDIO_MAX_DECODERS: int = 64 # Open decoder processes; least recently fed closed first
+    AUDIO_DECODER_IDLE_SECONDS: float = 30.0 # Decoders not fed for this long are reaped
+
+    # Sliding-window SER: each analyzed clip is split into overlapping windows run as one batch
+    AUDIO_SER_WINDOW_SECONDS: float = 2.0
+    AUDIO_SER_HOP_SECONDS: float = 0.5
+    AUDIO_TIMELINE_LENGTH: int = 32 # Per-session ring buffer of window results (16 s at a 0.5 s hop)
+
+    # DSP pre-stage: windows with neither speech nor a scream skip the SER model
+    AUDIO_DSP_GATE: bool = True
+    AUDIO_SILENCE_DB: float = -45.0 # Frames quieter than this (dBFS RMS) count as silence
+    AUDIO_MIN_SPEECH_RATIO: float = 0.1 # Fraction of speech-like frames needed to run SER
+    AUDIO_SCREAM_DB: float = -15.0 # Minimum frame loudness for the scream detector
+
+    # List endpoints
+    LIST_PAGE_SIZE: int = 50
+    LIST_MAX_PAGE_SIZE: int = 200
+
+    # Phone numbers are matched in E.164 form; national numbers get this country code
+    PHONE_DEFAULT_COUNTRY_CODE: str = "91"
+    PHONE_NATIONAL_DIGITS: int = 10
+
+    # Inference executor: blocking model/ffmpeg work runs here, off the event loop
+    INFERENCE_WORKERS: int = 8 # >= INFERENCE_MAX_BATCH so concurrent sessions can fill a batch
+    INFERENCE_MAX_PENDING: int = 64 # Queue bound; beyond it ingest answers 429 "busy"
+    INGEST_WS_MAX_IN_FLIGHT: int = 4 # Records one ingest socket may have in flight; beyond it the socket stops reading
+
+    # Status push (/dashboard/status/stream)
+    STATUS_PUSH_INTERVAL: float = 1.0 # At most one update per client per interval
+    STATUS_KEEPALIVE_SECONDS: float = 15.0
+
+    # Temporal risk fusion: per-session decayed average of threat_score with hysteresis
+    RISK_FUSION_TAU_SECONDS: float = 6.0 # Time constant of the exponential average
+    RISK_FUSION_MAX_STEP_SECONDS: float = 2.0 # Most evidence one reading can stand for
+    RISK_ESCALATE_THRESHOLD: float = 0.55 # Fused score that raises an alert
+    RISK_DEESCALATE_THRESHOLD: float = 0.35 # Fused score below which the alert clears
+
+    # Location context: incident/unsafe-zone hotspot grid
+    HOTSPOT_GEOHASH_PRECISION: int = 6 # ~1.2 km x 0.6 km cells
+    HOTSPOT_BUCKET_HOURS: int = 3 # Time-of-day bucket width
+    HOTSPOT_SATURATION_EVENTS: float = 5.0 # Incidents at which a cell's context risk reaches ~0.63
+    HOTSPOT_REFRESH_SECONDS: float = 60.0 # Background pass picking up new incidents and zones
+
+    # Live responder feed (/responder/events/stream)
+    EVENT_BROKER_BACKEND: str = "local" # "local" (single worker) or "postgres" (LISTEN/NOTIFY across workers)
+    EVENT_BROKER_CHANNEL: str = "guardia_events"
+    EVENT_SUBSCRIBER_QUEUE: int = 100 # Undelivered messages a responder may fall behind before it is dropped
+
+    # Cross-session micro-batching of model calls
+    INFERENCE_BATCHING: bool = True
+    INFERENCE_MAX_BATCH: int = 8
+    INFERENCE_MAX_WAIT_MS: float = 15.0 # How long the first request of a batch waits for company
+
+    # Model variants: "fp32", "int8-dynamic", "int8-static" (calibrated from QUANT_CALIBRATION_DIR/<vision|audio>) or "fp16"
+    VISION_MODEL_VARIANT: str = "fp32"
+    AUDIO_MODEL_VARIANT: str = "fp32"
+    QUANT_CALIBRATION_DIR: str = "app/artifacts/calibration"
+
+    # Vision AI
+    VISION_BACKEND: str = "onnxruntime" # "onnxruntime" (native sessions) or "ultralytics"
+    VISION_CASCADE: bool = True # Pose model runs only on person crops; False = dual full-frame pass
+    VISION_CROP_PADDING: float = 0.15 # Fraction of box size added around each person crop
+    VISION_MOTION_GATE: bool = True # Reuse the last result instead of running the models on static scenes
+    VISION_MOTION_AREA: float = 0.01 # Fraction of downscaled pixels that must change to count as motion
+    VISION_MOTION_MAX_STATIC: int = 15 # Force a model pass after this many gated frames in a row
+    VISION_DETECT_EVERY: int = 3 # Full detector/pose pass every Nth moving frame; tracker fills the rest
+    VISION_TRACK_MIN_CONFIDENCE: float = 0.5 # Re-detect early once the weakest track decays below this
+    VISION_INGEST_WIDTH: int = 640 # Frame width advertised to clients; uploads are also decoded down towards it
+    VISION_INGEST_FORMAT: str = "image/jpeg" # Preferred upload encoding ("image/jpeg" or "image/webp")
+    VISION_INGEST_QUALITY: float = 0.6
+
     def get_database_url(self):
         if self.DATABASE_URL:
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    def get_async_database_url(self):
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        url = self.get_database_url()
+        url = re.sub(r"^postgres(ql)?(\+\w+)?://", "postgresql+asyncpg://", url)
+        return re.sub(r"^sqlite(\+\w+)?://", "sqlite+aiosqlite://", url)
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,39 @@
+from sqlalchemy import inspect, text
+from app.db.session import engine, SessionLocal
+from app.db.base import User, Alert # base imports every model, so relationships resolve
+from app.utils.phone import normalize_phone
+
+BATCH_SIZE = 1000
+
+def add_columns():
+    """Add the indexed phone_e164 columns to databases created before they existed."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in ("users", "alerts"):
+            if "phone_e164" not in {c["name"] for c in inspector.get_columns(table)}:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN phone_e164 VARCHAR"))
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_phone_e164 ON {table} (phone_e164)"))
+
+def backfill(model, phone_column):
+    db = SessionLocal()
+    updated, last_id = 0, 0
+    try:
+        while True:
+            rows = db.query(model).filter(model.id > last_id).order_by(model.id).limit(BATCH_SIZE).all()
+            if not rows:
+                break
+            for row in rows:
+                phone = normalize_phone(getattr(row, phone_column))
+                if row.phone_e164 != phone:
+                    row.phone_e164 = phone
+                    updated += 1
+            last_id = rows[-1].id
+            db.commit()
+    finally:
+        db.close()
+    return updated
+
+if __name__ == "__main__":
+    add_columns()
+    print(f"Users updated: {backfill(User, 'phone_number')}")
+    print(f"Alerts updated: {backfill(Alert, 'contact_phone')}")
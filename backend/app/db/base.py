@@ -5,3 +5,4 @@ from app.models.setting import SystemSetting
 from app.models.threat import ThreatLog
 from app.models.event import EmergencyEvent, Alert
 from app.models.responder import ResponderActionLog
+from app.models.zone import UnsafeZone
@@ -0,0 +1,15 @@
+from app.db.base import Base # base imports every model, so all tables' indexes are known
+from app.db.session import engine
+
+def create_indexes():
+    """Create indexes declared on the models that an existing database does not have yet (create_all skips existing tables)."""
+    created = 0
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if all(column.name in table.c for column in index.columns):
+                index.create(bind=engine, checkfirst=True)
+                created += 1
+    return created
+
+if __name__ == "__main__":
+    print(f"Indexes checked: {create_indexes()}")
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -10,4 +11,26 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async engine for async endpoints; created on first use so scripts (seed.py, reset_db.py) never need the async driver
+_async_engine = None
+_async_sessionmaker = None
+
+def get_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        _async_engine = create_async_engine(settings.get_async_database_url(), pool_pre_ping=True)
+        # expire_on_commit=False: objects stay readable after commit without an implicit (sync) reload
+        _async_sessionmaker = async_sessionmaker(_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_sessionmaker()
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
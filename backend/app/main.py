@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.session import engine
+from app.db.session import engine, dispose_async_engine
 from app.db.base_class import Base
 from app.api.v1.api import api_router
 from app.api.v1.endpoints.dashboard import startup_ai_services, shutdown_ai_services
+from app.services.broker import event_broker
+from app.services.hotspots import hotspot_grid
 import app.models
 import logging
 
@@ -29,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -36,9 +39,14 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.on_event("startup")
 async def startup():
     startup_ai_services()
+    await event_broker.start()
+    hotspot_grid.start()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await event_broker.stop()
+    hotspot_grid.stop()
+    await dispose_async_engine()
     shutdown_ai_services()
 
 @app.get("/")
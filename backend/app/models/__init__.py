@@ -2,4 +2,6 @@ from .user import User
 from .contact import EmergencyContact
 from .setting import SystemSetting
 from .threat import ThreatLog
-from .event import EmergencyEvent, Alert
\ No newline at end of file
+from .event import EmergencyEvent, Alert
+from .responder import ResponderActionLog
+from .zone import UnsafeZone
\ No newline at end of file
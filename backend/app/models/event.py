@@ -1,9 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, func, Enum, Index
+from sqlalchemy.orm import relationship, validates
 from app.db.base_class import Base
+from app.utils.phone import normalize_phone
 
 class EmergencyEvent(Base):
     __tablename__ = "emergency_events"
+    # Keyset pagination (timestamp, id) newest first, alone or after an equality filter; the risk
+    # index serves the responder feed's min_risk/max_risk range, carrying the page keys along
+    __table_args__ = (
+        Index("ix_emergency_events_timestamp_id", "timestamp", "id"),
+        Index("ix_emergency_events_status_timestamp_id", "status", "timestamp", "id"),
+        Index("ix_emergency_events_user_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_emergency_events_risk_timestamp_id", "risk_score", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -15,14 +24,16 @@ class EmergencyEvent(Base):
 
     user = relationship("User", back_populates="events")
     alerts = relationship("Alert", back_populates="event", cascade="all, delete-orphan")
+    action_logs = relationship("ResponderActionLog", back_populates="event", order_by="ResponderActionLog.id")
 
 class Alert(Base):
     __tablename__ = "alerts"
 
     id = Column(Integer, primary_key=True, index=True)
-    event_id = Column(Integer, ForeignKey("emergency_events.id"))
+    event_id = Column(Integer, ForeignKey("emergency_events.id"), index=True)
     contact_name = Column(String)
     contact_phone = Column(String)
+    phone_e164 = Column(String, index=True, nullable=True) # Derived from contact_phone
     message = Column(String)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
@@ -33,4 +44,9 @@ class Alert(Base):
         default="sent"
     )
 
-    event = relationship("EmergencyEvent", back_populates="alerts")
\ No newline at end of file
+    event = relationship("EmergencyEvent", back_populates="alerts")
+
+    @validates("contact_phone")
+    def _set_phone_e164(self, key, value):
+        self.phone_e164 = normalize_phone(value)
+        return value
\ No newline at end of file
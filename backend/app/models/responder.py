@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class ResponderActionLog(Base):
     __tablename__ = "responder_action_logs"
+    # Keyset pagination (timestamp, id) newest first, alone or per responder / per event
+    __table_args__ = (
+        Index("ix_responder_action_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_responder_action_logs_responder_timestamp_id", "responder_id", "timestamp", "id"),
+        Index("ix_responder_action_logs_event_timestamp_id", "event_id", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     responder_id = Column(Integer, ForeignKey("users.id"))
@@ -13,4 +19,4 @@ class ResponderActionLog(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
     responder = relationship("User")
-    event = relationship("EmergencyEvent")
+    event = relationship("EmergencyEvent", back_populates="action_logs")
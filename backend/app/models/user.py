@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Boolean, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.db.base_class import Base
+from app.utils.phone import normalize_phone
 
 class User(Base):
     __tablename__ = "users"
@@ -9,6 +10,7 @@ class User(Base):
     full_name = Column(String, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     phone_number = Column(String, unique=True, index=True, nullable=True)
+    phone_e164 = Column(String, index=True, nullable=True) # Derived from phone_number
     hashed_password = Column(String, nullable=False)
     role = Column(
         Enum("user", "responder", "admin", name="user_roles"),
@@ -19,4 +21,10 @@ class User(Base):
     contacts = relationship("EmergencyContact", back_populates="owner", cascade="all, delete-orphan")
     settings = relationship("SystemSetting", back_populates="owner", cascade="all, delete-orphan")
     threat_logs = relationship("ThreatLog", back_populates="owner", cascade="all, delete-orphan")
-    events = relationship("EmergencyEvent", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    events = relationship("EmergencyEvent", back_populates="user", cascade="all, delete-orphan")
+    unsafe_zones = relationship("UnsafeZone", back_populates="owner", cascade="all, delete-orphan")
+
+    @validates("phone_number")
+    def _set_phone_e164(self, key, value):
+        self.phone_e164 = normalize_phone(value)
+        return value
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, func, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class UnsafeZone(Base):
+    __tablename__ = "unsafe_zones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    radius_m = Column(Float, default=200.0)
+    risk = Column(Float, default=1.0) # Context risk (0-1) inside the zone, at any hour
+    created_at = Column(DateTime, default=func.now())
+
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner = relationship("User", back_populates="unsafe_zones")
@@ -1,18 +1,21 @@
+from app.risk_engine.scoring import RiskWeights, score_one
+
 class RiskEngine:
     def __init__(self, w1=0.4, w2=0.4, w3=0.2, threshold=0.7):
         self.w1 = w1
         self.w2 = w2
         self.w3 = w3
         self.threshold = threshold
+        # Same core as ThreatDecisionEngine: audio emotion (w1) + graded pose risk (w2) + crowd density over 10 people (w3)
+        self.weights = RiskWeights(
+            vision=1.0, audio=w1, context=0.0,
+            crowd=w3, crowd_saturation=10.0, motion=0.0, pose=w2,
+            emotion_gain={"panic": 1.0, "fear": 0.8, "distress": 0.6, "neutral": 0.2, "calm": 0.0}, emotion_bias={},
+            other_gain=0.2, scream=0.0, loudness=0.0, high=threshold,
+        )
 
     def calculate_risk(self, audio_result: dict, video_result: dict) -> float:
-        emotion_map = {"panic": 1.0, "fear": 0.8, "distress": 0.6, "neutral": 0.2, "calm": 0.0}
-        audio_emotion_score = emotion_map.get(audio_result.get("emotion", "neutral"), 0.2) * audio_result.get("confidence", 0)
-        pose_risk_score = video_result.get("pose_risk_score", 0)
-        people_count = video_result.get("people_count", 0)
-        crowd_density_score = min(people_count / 10.0, 1.0)
-        risk_score = (self.w1 * audio_emotion_score + self.w2 * pose_risk_score + self.w3 * crowd_density_score)
-        return round(risk_score, 2)
+        return round(score_one(video_result, audio_result, None, self.weights)["threat_score"], 2)
 
     def should_trigger_emergency(self, risk_score: float) -> bool:
         return risk_score >= self.threshold
@@ -0,0 +1,220 @@
+"""
+Replay recorded observations through the scoring core with candidate weights.
+
+Loads observation columns once (see ``app.risk_engine.scoring`` for the column names), scores
+them with every candidate, then runs each session's scores in order through a ``RiskFuser`` (the
+EWMA with hysteresis that raises live alerts) with the configured time constant and thresholds.
+Reports the fused alert rate (``trigger_rate``) and how many alerts were raised, the share of
+readings that were HIGH on their own (``instant_high_rate``), the instantaneous level mix,
+agreement of the alert state with the first candidate, and scoring / fusion latency.
+
+Besides the scoring columns, sources may carry:
+    session_id     rows are grouped into sessions by it (default: one session)
+    timestamp      seconds, ISO-8601 or datetime; orders a session's rows and spaces them for the
+                   fuser (default: file order, ``--step`` seconds apart)
+
+Sources:
+    --file obs.npz      one array per column (fastest)
+    --file obs.csv      header row with column names
+    --file obs.jsonl    per line either flat columns or {"vision": {...status...}, "audio": {...status...},
+                        "context": {"location_risk": ...}, "session_id": ..., "timestamp": ...}
+    --db-query SQL      any query whose result columns are named like the scoring columns
+                        (against --db-url, default: the app database)
+
+Candidates: a JSON list of ``RiskWeights`` keyword sets, each optionally with a "name" and with
+``RiskFuser`` settings (``tau_seconds``, ``max_step_seconds``, ``escalate``, ``deescalate``), e.g.
+    [{"name": "audio-heavy", "vision": 0.4, "audio": 0.5}, {"name": "slow", "tau_seconds": 10}]
+The current defaults are always scored first as "current".
+
+Usage:
+    python -m app.risk_engine.replay --file observations.npz --candidates candidates.json
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+
+from app.risk_engine.scoring import COLUMNS, RiskWeights, columns_from_status, score_batch, threat_levels
+
+KEY_COLUMNS = ("session_id", "timestamp")
+FUSION_PARAMS = ("tau_seconds", "max_step_seconds", "escalate", "deescalate")
+
+
+def load_file(path: str) -> Dict[str, np.ndarray]:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".npz":
+        with np.load(path) as data:
+            return {k: data[k] for k in data.files if k in COLUMNS + KEY_COLUMNS}
+    if suffix == ".csv":
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            names = [c for c in reader.fieldnames or () if c in COLUMNS + KEY_COLUMNS]
+            values = {c: [] for c in names}
+            for row in reader:
+                for c in names:
+                    values[c].append(row[c])
+        return _typed(values)
+    with open(path) as fh:
+        rows = [json.loads(line) for line in fh if line.strip()]
+    if rows and ("vision" in rows[0] or "audio" in rows[0]):
+        columns = columns_from_status([r.get("vision") for r in rows], [r.get("audio") for r in rows],
+                                      [r.get("context") for r in rows])
+        columns.update(_typed({c: [r.get(c) for r in rows] for c in KEY_COLUMNS if c in rows[0]}))
+        return columns
+    return _typed({c: [r.get(c) for r in rows] for c in COLUMNS + KEY_COLUMNS if rows and c in rows[0]})
+
+
+def load_db(query: str, url: str) -> Dict[str, np.ndarray]:
+    from sqlalchemy import create_engine, text
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text(query))
+            names = list(result.keys())
+            rows = result.fetchall()
+    finally:
+        engine.dispose()
+    values = dict(zip(names, map(list, zip(*rows)))) if rows else {n: [] for n in names}
+    return _typed({c: v for c, v in values.items() if c in COLUMNS + KEY_COLUMNS})
+
+
+def _typed(values: Mapping[str, List[Any]]) -> Dict[str, np.ndarray]:
+    columns = {}
+    for name, v in values.items():
+        if name in ("emotion", "session_id"):
+            columns[name] = np.array(["" if e is None else e for e in v], dtype=str)
+        elif name == "timestamp":
+            columns[name] = np.array([_seconds(x) for x in v], dtype=np.float64)
+        else:
+            # CSV gives strings; booleans may come as true/false
+            columns[name] = np.array([_number(x) for x in v], dtype=np.float64)
+    return columns
+
+
+def _number(x) -> float:
+    if x is None or x == "":
+        return np.nan
+    if isinstance(x, str) and x.lower() in ("true", "false"):
+        return float(x.lower() == "true")
+    return float(x)
+
+
+def _seconds(x) -> float:
+    if isinstance(x, datetime):
+        return x.timestamp()
+    try:
+        return _number(x)
+    except ValueError:
+        return datetime.fromisoformat(x).timestamp()
+
+
+def sessions(columns: Mapping[str, np.ndarray], step_seconds: float = 1.0):
+    """Row order grouped by session (each in time order), session boundaries and the fuser's clock per row."""
+    n = len(next(iter(columns.values()))) if columns else 0
+    session = columns.get("session_id")
+    codes = np.unique(session, return_inverse=True)[1].reshape(-1) if session is not None else np.zeros(n, dtype=np.int64)
+    at = columns.get("timestamp")
+    if at is None:
+        at = np.arange(n, dtype=np.float64) * step_seconds
+    order = np.lexsort((np.arange(n), at, codes))
+    starts = np.flatnonzero(np.diff(codes[order], prepend=-1)) if n else np.array([], dtype=np.int64)
+    return order, starts, at[order]
+
+
+def fuse(score: np.ndarray, order: np.ndarray, starts: np.ndarray, at: np.ndarray, fuser_params: Mapping[str, float]) -> np.ndarray:
+    """Alert state after each reading, running every session through its own ``RiskFuser``."""
+    from app.services.fusion import RiskFuser
+    alerting = np.zeros(len(score), dtype=bool)
+    for s, (start, end) in enumerate(zip(starts, np.append(starts[1:], len(order)))):
+        # One fuser per session, so its records never expire or get evicted mid-replay
+        fuser = RiskFuser(max_sessions=1, session_ttl=float("inf"), **fuser_params)
+        for i in range(start, end):
+            alerting[order[i]] = fuser.update(s, float(score[order[i]]), now=float(at[i]))["alerting"]
+    return alerting
+
+
+def replay(columns: Mapping[str, np.ndarray], candidates: List[Dict[str, Any]], repeat: int = 3,
+           step_seconds: float = 1.0) -> List[Dict[str, Any]]:
+    from app.core.config import settings
+    defaults = {"tau_seconds": settings.RISK_FUSION_TAU_SECONDS, "max_step_seconds": settings.RISK_FUSION_MAX_STEP_SECONDS,
+                "escalate": settings.RISK_ESCALATE_THRESHOLD, "deescalate": settings.RISK_DEESCALATE_THRESHOLD}
+    n = len(next(iter(columns.values()))) if columns else 0
+    order, starts, at = sessions(columns, step_seconds)
+    rows, baseline = [], None
+    for candidate in candidates:
+        params = {k: v for k, v in candidate.items() if k != "name"}
+        weights = RiskWeights.from_dict({k: v for k, v in params.items() if k not in FUSION_PARAMS})
+        fuser_params = {**defaults, **{k: v for k, v in params.items() if k in FUSION_PARAMS}}
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            score = score_batch(columns, weights)["threat_score"]
+            timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        triggered = fuse(score, order, starts, at, fuser_params)
+        fusion_seconds = time.perf_counter() - start
+        # An alert is raised whenever a session's state turns on
+        ordered = triggered[order]
+        before = np.concatenate(([False], ordered[:-1]))
+        before[starts] = False
+        raised = int(np.count_nonzero(ordered & ~before))
+        levels = threat_levels(score, weights)
+        if baseline is None:
+            baseline = triggered
+        best = min(timings)
+        rows.append({
+            "name": candidate.get("name", json.dumps(params, sort_keys=True)),
+            "observations": n,
+            "sessions": len(starts),
+            "trigger_rate": round(float(triggered.mean()), 4) if n else 0.0,
+            "alerts": raised,
+            "instant_high_rate": round(float((score >= weights.high).mean()), 4) if n else 0.0,
+            "levels": {lvl: round(float((levels == lvl).mean()), 4) if n else 0.0 for lvl in ("LOW", "MEDIUM", "HIGH")},
+            "mean_score": round(float(score.mean()), 4) if n else 0.0,
+            "p95_score": round(float(np.percentile(score, 95)), 4) if n else 0.0,
+            "agreement": round(float((triggered == baseline).mean()), 4) if n else 1.0,
+            "latency_s": round(best, 4),
+            "us_per_observation": round(best / n * 1e6, 3) if n else 0.0,
+            "fusion_s": round(fusion_seconds, 4),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded observations through candidate risk weights")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help=".npz, .csv or .jsonl observations")
+    source.add_argument("--db-query", help="SQL returning observation columns")
+    parser.add_argument("--db-url", help="Database URL for --db-query (default: the app database)")
+    parser.add_argument("--candidates", help="JSON file with a list of weight sets")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per candidate (best is reported)")
+    parser.add_argument("--step", type=float, default=1.0, help="Seconds between readings without a timestamp column")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.file:
+        columns = load_file(args.file)
+    else:
+        from app.core.config import settings
+        columns = load_db(args.db_query, args.db_url or settings.get_database_url())
+    load_seconds = time.perf_counter() - start
+
+    candidates = [{"name": "current"}]
+    if args.candidates:
+        candidates += json.loads(Path(args.candidates).read_text())
+    rows = replay(columns, candidates, repeat=args.repeat, step_seconds=args.step)
+    print(json.dumps({"load_s": round(load_seconds, 3), "columns": sorted(columns)}))
+    for row in rows:
+        print(json.dumps(row))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Columnar risk scoring.
+
+One scoring core for every risk formula in the app: observations are passed as NumPy columns
+(one entry per observation) and scored in a handful of vectorized passes (``score_batch``, used
+by the replay of millions of recorded observations in ``app.risk_engine.replay``). A single live
+status (``ThreatDecisionEngine.compute_risk``, ``RiskEngine``) goes through ``score_one``, which
+feeds the same formula (``_risk``) plain floats instead of one-row arrays: building arrays for one
+row costs far more than the arithmetic, and it runs on the event loop for every ingest and status
+push. Status dicts become rows in one place, ``observation``, for both paths.
+
+Columns (missing ones default to zeros / quiet):
+    people_count   float   persons in frame
+    motion_detected float  0/1
+    pose_risk      float   0..1 (boolean flag or a graded score)
+    emotion        str or int codes into ``RiskWeights.emotions`` (anything else scores as "other")
+    confidence     float   SER confidence of ``emotion``
+    scream         float   0/1
+    loudness_db    float   dBFS
+    context_risk   float   0..1 location context (``app.services.hotspots``)
+"""
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+COLUMNS = ("people_count", "motion_detected", "pose_risk", "emotion", "confidence", "scream", "loudness_db", "context_risk")
+NUMERIC_COLUMNS = tuple(c for c in COLUMNS if c != "emotion")
+
+
+class RiskWeights:
+    """Every tunable of the scoring formula; ``from_dict`` takes the same names for replay candidates."""
+
+    def __init__(self, vision: float = 0.5, audio: float = 0.4, context: float = 0.1,
+                 crowd: float = 0.5, crowd_saturation: float = 5.0, motion: float = 0.25, pose: float = 0.25,
+                 emotion_gain: Optional[Mapping[str, float]] = None, emotion_bias: Optional[Mapping[str, float]] = None,
+                 other_gain: float = 0.4, other_bias: float = 0.0,
+                 scream: float = 0.5, loudness: float = 0.2, loudness_range_db=(-30.0, -10.0),
+                 high: float = 0.7, medium: float = 0.4):
+        self.vision, self.audio, self.context = vision, audio, context
+        self.crowd, self.crowd_saturation, self.motion, self.pose = crowd, crowd_saturation, motion, pose
+        # Distress emotions count fully plus a bias; the rest contribute a fraction of their confidence
+        self.emotion_gain = dict(emotion_gain if emotion_gain is not None else {"angry": 1.0, "fearful": 1.0})
+        self.emotion_bias = dict(emotion_bias if emotion_bias is not None else {"angry": 0.3, "fearful": 0.3})
+        self.other_gain, self.other_bias = other_gain, other_bias
+        self.scream, self.loudness = scream, loudness
+        self.loudness_range_db = tuple(loudness_range_db) # conversational speech .. shouting
+        self.high, self.medium = high, medium
+
+    @classmethod
+    def from_dict(cls, values: Mapping[str, Any]) -> "RiskWeights":
+        return cls(**values)
+
+    @property
+    def emotions(self) -> List[str]:
+        return sorted(set(self.emotion_gain) | set(self.emotion_bias))
+
+    def emotion_tables(self):
+        """Gain and bias per emotion code; the last entry is "other"."""
+        names = self.emotions
+        gain = np.array([self.emotion_gain.get(e, self.other_gain) for e in names] + [self.other_gain])
+        bias = np.array([self.emotion_bias.get(e, self.other_bias) for e in names] + [self.other_bias])
+        return gain, bias
+
+    def emotion_code(self, label) -> int:
+        """``encode_emotions`` for a single label."""
+        names = self.emotions
+        label = str(label).lower()
+        return names.index(label) if label in names else len(names)
+
+
+def encode_emotions(labels, vocabulary: List[str]) -> np.ndarray:
+    """Map emotion labels (case-insensitive) to codes into ``vocabulary``; unknown labels get ``len(vocabulary)``."""
+    labels = np.asarray(labels)
+    if labels.dtype.kind in "iu":
+        return labels
+    unique, inverse = np.unique(np.char.lower(labels.astype(str)), return_inverse=True)
+    index = {e: i for i, e in enumerate(vocabulary)}
+    return np.array([index.get(e, len(vocabulary)) for e in unique], dtype=np.int64)[inverse.reshape(-1)]
+
+
+def score_batch(columns: Mapping[str, Any], weights: RiskWeights) -> Dict[str, np.ndarray]:
+    """Component risks and ``threat_score`` for every observation (unrounded float64 arrays)."""
+    n = len(next(iter(columns.values()))) if columns else 0
+
+    def col(name):
+        values, default = columns.get(name), _default(name, weights)
+        if values is None:
+            return np.full(n, default, dtype=np.float64)
+        return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=default)
+
+    gain, bias = weights.emotion_tables()
+    if columns.get("emotion") is None:
+        codes = np.full(n, len(gain) - 1)
+    else:
+        codes = encode_emotions(columns["emotion"], weights.emotions)
+    return _risk({name: col(name) for name in NUMERIC_COLUMNS}, gain[codes], bias[codes], weights)
+
+
+def score_one(vision: Optional[dict], audio: Optional[dict], context: Optional[dict], weights: RiskWeights) -> Dict[str, float]:
+    """``score_batch`` for one observation given as status dicts, without the cost of building arrays for one row."""
+    row = dict(zip(COLUMNS, observation(vision, audio, context)))
+    gain, bias = weights.emotion_tables()
+    code = weights.emotion_code(row["emotion"])
+    risk = _risk({name: _num(row[name], _default(name, weights)) for name in NUMERIC_COLUMNS}, gain[code], bias[code], weights)
+    return {k: float(v) for k, v in risk.items()}
+
+
+def _risk(x: Mapping[str, Any], gain, bias, weights: RiskWeights) -> Dict[str, Any]:
+    """The scoring formula. Inputs are float64 arrays (one entry per observation) or floats, with gaps already filled."""
+    crowd = np.minimum(x["people_count"] / weights.crowd_saturation, 1.0)
+    vision_risk = weights.crowd * crowd + weights.motion * x["motion_detected"] + weights.pose * x["pose_risk"]
+
+    audio_risk = np.minimum(gain * x["confidence"] + bias, 1.0)
+    quiet, loud = weights.loudness_range_db
+    loudness = np.clip((x["loudness_db"] - quiet) / (loud - quiet), 0.0, 1.0)
+    audio_risk = np.minimum(audio_risk + weights.scream * x["scream"] + weights.loudness * loudness, 1.0)
+
+    context_risk = np.clip(x["context_risk"], 0.0, 1.0)
+    score = weights.vision * vision_risk + weights.audio * audio_risk + weights.context * context_risk
+    return {"vision_risk": vision_risk, "audio_risk": audio_risk, "context_risk": context_risk, "threat_score": score}
+
+
+def _default(name: str, weights: RiskWeights) -> float:
+    """Value of a missing reading: quiet for loudness, zero otherwise."""
+    return weights.loudness_range_db[0] if name == "loudness_db" else 0.0
+
+
+def _num(x, default: float) -> float:
+    if x is None:
+        return default
+    x = float(x)
+    return default if x != x else x # NaN, as np.nan_to_num in score_batch
+
+
+def threat_levels(score: np.ndarray, weights: RiskWeights) -> np.ndarray:
+    return np.where(score >= weights.high, "HIGH", np.where(score >= weights.medium, "MEDIUM", "LOW"))
+
+
+def observation(vision: Optional[dict], audio: Optional[dict], context: Optional[dict] = None) -> Tuple:
+    """One row of ``COLUMNS`` from engine status dicts (``None`` or ``{}`` means the modality is idle)."""
+    v, a, c = vision or {}, audio or {}, context or {}
+    return (
+        v.get("people_count", 0), bool(v.get("motion_detected")),
+        v["pose_risk_score"] if "pose_risk_score" in v else bool(v.get("pose_risk")),
+        a.get("emotion") or "", a.get("confidence", 0.0), bool(a.get("scream")),
+        np.nan if a.get("loudness_db") is None else a["loudness_db"],
+        c.get("location_risk", 0.0),
+    )
+
+
+def columns_from_status(vision_statuses: Iterable[Optional[dict]], audio_statuses: Iterable[Optional[dict]],
+                        contexts: Optional[Iterable[Optional[dict]]] = None) -> Dict[str, np.ndarray]:
+    """Columns from engine status dicts and optional context dicts, row by row as in ``observation``."""
+    rows = list(zip(*(observation(v, a, c) for v, a, c in zip(vision_statuses, audio_statuses, contexts if contexts is not None else repeat(None)))))
+    columns = {name: np.array(rows[i] if rows else [], dtype=str if name == "emotion" else np.float64) for i, name in enumerate(COLUMNS)}
+    if contexts is None:
+        del columns["context_risk"]
+    return columns
@@ -0,0 +1,19 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+class UnsafeZoneBase(BaseModel):
+    name: str
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius_m: float = Field(200.0, gt=0, le=5000)
+    risk: float = Field(1.0, ge=0, le=1)
+
+class UnsafeZoneCreate(UnsafeZoneBase):
+    pass
+
+class UnsafeZone(UnsafeZoneBase):
+    id: int
+    owner_id: int
+    created_at: Optional[datetime] = None
+    class Config: from_attributes = True
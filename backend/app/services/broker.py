@@ -0,0 +1,188 @@
+"""
+In-process publish/subscribe with a pluggable transport.
+
+Subscribers get a bounded ``asyncio.Queue`` each. A subscriber whose queue is full is
+disconnected rather than blocking delivery to everyone else (its stream ends and the
+client reconnects and re-syncs). The backend decides how messages reach the brokers of
+all API workers: ``local`` delivers in this process only, ``postgres`` goes through
+Postgres ``LISTEN``/``NOTIFY`` on ``EVENT_BROKER_CHANNEL``.
+"""
+import asyncio
+import json
+import logging
+import re
+import select
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, Dict[str, Any]], None]
+
+
+class Subscription:
+    def __init__(self, topic: str, queue_size: int):
+        self.topic = topic
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=queue_size)
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Next message, or None once the broker has dropped this subscriber."""
+        return await self.queue.get()
+
+    def close(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class LocalBackend:
+    """Single-process stand-in: messages only reach subscribers of this worker."""
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        self._deliver(topic, message)
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresBackend:
+    """Fan-out across API workers through ``pg_notify``; a listener thread per worker feeds its broker."""
+    def __init__(self, database_url: str, channel: str):
+        # SQLAlchemy URL -> libpq DSN
+        self.dsn = re.sub(r"^postgresql\+\w+://", "postgresql://", database_url)
+        self.channel = channel
+        self._listener = None
+        self._stopping = threading.Event()
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+
+    async def start(self, deliver: Deliver) -> None:
+        loop = asyncio.get_running_loop()
+        self._stopping.clear()
+        self._listener = threading.Thread(target=self._listen, args=(loop, deliver), name="event-listener", daemon=True)
+        self._listener.start()
+
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _listen(self, loop: asyncio.AbstractEventLoop, deliver: Deliver) -> None:
+        while not self._stopping.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                logger.info(f"📡 Listening for events on '{self.channel}'")
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            data = json.loads(conn.notifies.pop(0).payload)
+                            loop.call_soon_threadsafe(deliver, data["topic"], data["message"])
+                conn.close()
+            except Exception as e:
+                logger.error(f"❌ Event listener error, reconnecting: {e}")
+                self._stopping.wait(2.0)
+
+    def _notify(self, payload: str) -> None:
+        with self._publish_lock:
+            if self._publisher is None or self._publisher.closed:
+                self._publisher = self._connect()
+            try:
+                with self._publisher.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except Exception:
+                self._publisher.close()
+                raise
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        # NOTIFY payloads are capped at 8000 bytes: messages carry summaries, not full records
+        await run_in_threadpool(self._notify, json.dumps({"topic": topic, "message": message}, default=str))
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._publisher is not None:
+            self._publisher.close()
+
+
+class EventBroker:
+    def __init__(self, backend, queue_size: int = 100):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.counters = {"published": 0, "delivered": 0, "dropped_subscribers": 0}
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        for subs in self._subscribers.values():
+            for sub in subs:
+                sub.close()
+        self._subscribers.clear()
+
+    def subscribe(self, topic: str) -> Subscription:
+        sub = Subscription(topic, self.queue_size)
+        self._subscribers[topic].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers[sub.topic].discard(sub)
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        """Fire-and-forget; safe to call from the event loop or from sync endpoints in the threadpool."""
+        if self._loop is None:
+            return # not started (e.g. scripts, tests without lifespan)
+        self.counters["published"] += 1
+        coro = self._publish(topic, message)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _publish(self, topic: str, message: Dict[str, Any]) -> None:
+        try:
+            await self.backend.publish(topic, message)
+        except Exception as e:
+            logger.error(f"❌ Failed to publish '{topic}' message: {e}")
+
+    def _deliver(self, topic: str, message: Dict[str, Any]) -> None:
+        for sub in list(self._subscribers.get(topic, ())):
+            try:
+                sub.queue.put_nowait(message)
+                self.counters["delivered"] += 1
+            except asyncio.QueueFull:
+                # Slow consumer: cut it loose instead of letting it hold back the others
+                self._subscribers[topic].discard(sub)
+                sub.close()
+                self.counters["dropped_subscribers"] += 1
+                logger.warning(f"⚠️ Dropped slow '{topic}' subscriber")
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.counters, "subscribers": {t: len(s) for t, s in self._subscribers.items()},
+                "backend": type(self.backend).__name__}
+
+
+def _backend():
+    if settings.EVENT_BROKER_BACKEND == "postgres":
+        return PostgresBackend(settings.get_database_url(), settings.EVENT_BROKER_CHANNEL)
+    return LocalBackend()
+
+event_broker = EventBroker(_backend(), settings.EVENT_SUBSCRIBER_QUEUE)
@@ -1,27 +1,50 @@
-from datetime import datetime
+from app.ai.state import SessionRecord, SessionStore
+from app.core.config import settings
+from app.risk_engine.scoring import RiskWeights, score_one
+from app.services.fusion import risk_fuser
+
+class SessionContext(SessionRecord):
+    __slots__ = ("context",)
 
-class ThreatDecisionEngine:
     def __init__(self):
-        self.weights = {"vision": 0.5, "audio": 0.4, "context": 0.1}
+        super().__init__()
+        self.context = None
+
+class ThreatDecisionEngine:
+    def __init__(self, weights: RiskWeights = None, max_sessions: int = 4096, session_ttl: float = 600.0):
+        # Fusion weights (50% Vision + 40% Audio + 10% Context), per-emotion gain/bias and the DSP signal weights
+        self.weights = weights or RiskWeights()
+        # Last known location context per session; streaming ingest carries no location of its own
+        self.contexts = SessionStore(SessionContext, max_sessions=max_sessions, ttl_seconds=session_ttl)
 
     def compute_risk(self, vision_status, audio_status, context_data=None):
-        vision_risk = 0.0
-        if vision_status:
-            crowd_factor = min(vision_status.get("people_count", 0) / 5.0, 1.0)
-            motion_factor = 1.0 if vision_status.get("motion_detected") else 0.0
-            pose_factor = 1.0 if vision_status.get("pose_risk") else 0.0
-            vision_risk = (0.5 * crowd_factor) + (0.25 * motion_factor) + (0.25 * pose_factor)
-
-        audio_risk = 0.0
-        if audio_status:
-            emotion = audio_status.get("emotion", "").lower()
-            conf = audio_status.get("confidence", 0.0)
-            if emotion in ["angry", "fearful"]: audio_risk = min(conf + 0.3, 1.0)
-            else: audio_risk = conf * 0.4
-
-        context_risk = 0.0 # Context logic can be expanded
-        score = self.weights["vision"] * vision_risk + self.weights["audio"] * audio_risk + self.weights["context"] * context_risk
-        level = "HIGH" if score >= 0.7 else "MEDIUM" if score >= 0.4 else "LOW"
-        return {"vision_risk": round(vision_risk, 2), "audio_risk": round(audio_risk, 2), "context_risk": round(context_risk, 2), "threat_score": round(score, 2), "threat_level": level}
-
-decision_engine = ThreatDecisionEngine()
+        """``context_data`` may carry ``location_risk`` (0-1, see ``app.services.hotspots``)."""
+        risk = score_one(vision_status, audio_status, context_data, self.weights)
+        score = risk["threat_score"]
+        level = "HIGH" if score >= self.weights.high else "MEDIUM" if score >= self.weights.medium else "LOW"
+        return {"vision_risk": round(risk["vision_risk"], 2), "audio_risk": round(risk["audio_risk"], 2),
+                "context_risk": round(risk["context_risk"], 2), "threat_score": round(score, 2), "threat_level": level}
+
+    def set_context(self, session_id, context_data):
+        """Record where a session was last seen; every later ``assess`` of it scores with this context."""
+        self.contexts.get_or_create(session_id).context = context_data
+
+    def context_for(self, session_id):
+        record = self.contexts.get(session_id)
+        return record.context if record is not None else None
+
+    def assess(self, session_id, vision_status, audio_status, observe=False):
+        """
+        Instantaneous risk merged with the session's fused state. ``observe=True`` feeds this
+        reading into the fuser (call it once per new inference result, not per status read).
+        ``threat_level`` then reflects the fused state; the snapshot's own level stays in ``instant_level``.
+        The context term always comes from ``set_context``, so every score the fuser averages was
+        computed the same way.
+        """
+        risk = self.compute_risk(vision_status, audio_status, self.context_for(session_id))
+        fused = risk_fuser.update(session_id, risk["threat_score"]) if observe else risk_fuser.peek(session_id)
+        risk["instant_level"] = risk["threat_level"]
+        risk.update(fused)
+        return risk
+
+decision_engine = ThreatDecisionEngine(max_sessions=settings.SESSION_MAX, session_ttl=settings.SESSION_TTL_SECONDS)
@@ -0,0 +1,26 @@
+from typing import Any, Dict, Optional
+from app.models.event import EmergencyEvent
+from app.models.user import User
+from app.services.broker import event_broker
+
+RESPONDER_TOPIC = "responder"
+
+def event_summary(event: EmergencyEvent) -> Dict[str, Any]:
+    return {
+        "id": event.id,
+        "user_id": event.user_id,
+        "user_name": event.user.full_name if event.user else None,
+        "latitude": event.latitude,
+        "longitude": event.longitude,
+        "risk_score": event.risk_score,
+        "status": event.status,
+        "timestamp": event.timestamp.isoformat() if event.timestamp else None,
+    }
+
+def publish_event(action: str, event: EmergencyEvent, actor: Optional[User] = None) -> None:
+    """Announce an event lifecycle change ("created", "acknowledged", "resolved") to live responder feeds."""
+    event_broker.publish(RESPONDER_TOPIC, {
+        "type": f"event.{action}",
+        "event": event_summary(event),
+        "actor": {"id": actor.id, "name": actor.full_name} if actor else None,
+    })
@@ -0,0 +1,82 @@
+"""
+Streaming per-session risk fusion.
+
+Each observation (one instantaneous ``threat_score``) updates an exponentially weighted average
+in O(1): ``fused += a * (score - fused)`` with ``a = 1 - exp(-dt / tau)``, so the smoothing
+depends on elapsed time rather than on how often frames arrive. ``dt`` is capped at
+``max_step`` so a reading after a long pause cannot take over the state on its own; the rest of
+the pause decays the state towards zero instead. Escalation and de-escalation use separate
+thresholds, so a score hovering around one of them does not flap.
+
+Updates run on the event loop (endpoints call ``update`` after awaiting inference), so records
+need no locking.
+"""
+import math
+import time
+from typing import Any, Dict, Optional
+
+from app.ai.state import SessionRecord, SessionStore
+from app.core.config import settings
+
+
+class FusedRisk(SessionRecord):
+    __slots__ = ("score", "at", "alerting")
+
+    def __init__(self):
+        super().__init__()
+        self.score = 0.0
+        self.at: Optional[float] = None
+        self.alerting = False
+
+
+class RiskFuser:
+    def __init__(self, tau_seconds: float = 6.0, max_step_seconds: float = 2.0, escalate: float = 0.55,
+                 deescalate: float = 0.35, max_sessions: int = 4096, session_ttl: float = 600.0):
+        if deescalate > escalate:
+            raise ValueError("deescalate threshold must not exceed escalate threshold")
+        self.tau = tau_seconds
+        self.max_step = max_step_seconds
+        self.escalate = escalate
+        self.deescalate = deescalate
+        self.sessions = SessionStore(FusedRisk, max_sessions=max_sessions, ttl_seconds=session_ttl)
+
+    def _decayed(self, record: FusedRisk, now: float):
+        """State carried forward to ``now`` (idle time past ``max_step`` fades it) and the step to weigh the new reading by."""
+        if record.at is None:
+            return 0.0, self.max_step
+        dt = max(now - record.at, 0.0)
+        idle = max(dt - self.max_step, 0.0)
+        return record.score * math.exp(-idle / self.tau), min(dt, self.max_step)
+
+    def update(self, session_id: str, score: float, now: float = None) -> Dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        record = self.sessions.get_or_create(session_id)
+        fused, step = self._decayed(record, now)
+        fused += (1.0 - math.exp(-step / self.tau)) * (score - fused)
+        record.score, record.at = fused, now
+        if record.alerting:
+            record.alerting = fused >= self.deescalate
+        else:
+            record.alerting = fused >= self.escalate
+        return self._result(fused, record.alerting)
+
+    def peek(self, session_id: str, now: float = None) -> Dict[str, Any]:
+        """Current state without recording an observation."""
+        record = self.sessions.get(session_id)
+        if record is None:
+            return self._result(0.0, False)
+        fused, _ = self._decayed(record, time.monotonic() if now is None else now)
+        return self._result(fused, record.alerting and fused >= self.deescalate)
+
+    def _result(self, fused: float, alerting: bool) -> Dict[str, Any]:
+        level = "HIGH" if alerting else "MEDIUM" if fused >= self.deescalate else "LOW"
+        return {"fused_score": round(fused, 2), "alerting": alerting, "threat_level": level}
+
+risk_fuser = RiskFuser(
+    tau_seconds=settings.RISK_FUSION_TAU_SECONDS,
+    max_step_seconds=settings.RISK_FUSION_MAX_STEP_SECONDS,
+    escalate=settings.RISK_ESCALATE_THRESHOLD,
+    deescalate=settings.RISK_DEESCALATE_THRESHOLD,
+    max_sessions=settings.SESSION_MAX,
+    session_ttl=settings.SESSION_TTL_SECONDS,
+)
@@ -0,0 +1,218 @@
+"""
+Location context risk from a precomputed hotspot grid.
+
+The map is cut into geohash cells (``HOTSPOT_GEOHASH_PRECISION``; cells are addressed by their
+integer latitude/longitude indices instead of base32 strings) and the day into
+``HOTSPOT_BUCKET_HOURS`` buckets of local solar time. Each past incident adds 1 to its cell and
+half to the 8 neighbouring cells in its time bucket. An incident is an event a person raised by
+hand (SOS) or a responder acknowledged or resolved; AI detections on their own do not count, or
+a session staying in alert would keep raising the risk at its own location. User-defined unsafe
+zones are painted onto every cell they overlap, at every hour, and only count for their owner.
+A lookup is a few dict reads: ``max(own zone risk, 1 - exp(-incidents / HOTSPOT_SATURATION_EVENTS))``.
+
+A background thread keeps the grid current: each pass reads only action logs newer than the
+last one it saw (by id), counting an event at its first qualifying log, and reloads the zones,
+which are few. It also runs early when a zone changes.
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[int, int]
+INCIDENT_ACTIONS = ("sos_triggered", "acknowledge", "resolve")
+EARTH_RADIUS_M = 6371000.0
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+class HotspotGrid:
+    def __init__(self, precision: int = 6, bucket_hours: int = 3, saturation_events: float = 5.0,
+                 refresh_seconds: float = 60.0, batch_size: int = 5000):
+        # A geohash of n characters has 5n bits, interleaved starting with longitude
+        self.precision = precision
+        self.lon_bits = (5 * precision + 1) // 2
+        self.lat_bits = 5 * precision // 2
+        self.lat_step = 180.0 / (1 << self.lat_bits)
+        self.lon_step = 360.0 / (1 << self.lon_bits)
+        self.bucket_hours = bucket_hours
+        self.saturation = saturation_events
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self._incidents: Dict[Tuple[Cell, int], float] = defaultdict(float)
+        self._zones: Dict[Cell, Dict[int, float]] = {} # cell -> owner id -> risk
+        self._last_log_id = 0
+        self.counters = {"events": 0, "zones": 0, "refreshes": 0}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    # --- grid geometry ---
+    def cell(self, latitude: float, longitude: float) -> Cell:
+        i = min(int((latitude + 90.0) / self.lat_step), (1 << self.lat_bits) - 1)
+        j = int((longitude + 180.0) / self.lon_step) % (1 << self.lon_bits)
+        return max(i, 0), j
+
+    def geohash(self, cell: Cell) -> str:
+        i, j = cell
+        chars, bits, value = [], 0, 0
+        lat_bit, lon_bit = self.lat_bits, self.lon_bits
+        for n in range(5 * self.precision):
+            if n % 2 == 0:
+                lon_bit -= 1
+                value = (value << 1) | ((j >> lon_bit) & 1)
+            else:
+                lat_bit -= 1
+                value = (value << 1) | ((i >> lat_bit) & 1)
+            bits += 1
+            if bits == 5:
+                chars.append(BASE32[value])
+                bits, value = 0, 0
+        return "".join(chars)
+
+    def _neighbours(self, cell: Cell):
+        i, j = cell
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                if (di or dj) and 0 <= i + di < (1 << self.lat_bits):
+                    yield i + di, (j + dj) % (1 << self.lon_bits)
+
+    def bucket(self, longitude: float, when: datetime) -> int:
+        """Time-of-day bucket in local solar time (UTC shifted by longitude), so no timezone lookup is needed."""
+        if when.tzinfo is not None:
+            when = when.astimezone(timezone.utc)
+        hour = (when.hour + when.minute / 60.0 + longitude / 15.0) % 24.0
+        return int(hour // self.bucket_hours)
+
+    # --- hot path ---
+    def risk_at(self, latitude: float, longitude: float, when: Optional[datetime] = None, user_id: Optional[int] = None) -> float:
+        """Incident risk here at ``when``, raised to ``user_id``'s own unsafe zones."""
+        cell = self.cell(latitude, longitude)
+        incidents = self._incidents.get((cell, self.bucket(longitude, when or datetime.now(timezone.utc))), 0.0)
+        owners = self._zones.get(cell)
+        return max(owners.get(user_id, 0.0) if owners else 0.0, 1.0 - math.exp(-incidents / self.saturation))
+
+    # --- updates ---
+    def add_event(self, latitude: float, longitude: float, when: datetime) -> None:
+        cell = self.cell(latitude, longitude)
+        bucket = self.bucket(longitude, when)
+        self._incidents[(cell, bucket)] += 1.0
+        for n in self._neighbours(cell):
+            self._incidents[(n, bucket)] += 0.5
+        self.counters["events"] += 1
+
+    def build_zones(self, zones) -> Dict[Cell, float]:
+        """Cells overlapped by each (latitude, longitude, radius_m, risk) circle."""
+        cells: Dict[Cell, float] = {}
+        for lat, lon, radius, risk in zones:
+            dlat = math.degrees(radius / EARTH_RADIUS_M)
+            dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+            (i0, j0), (i1, j1) = self.cell(lat - dlat, lon - dlon), self.cell(lat + dlat, lon + dlon)
+            half_diag = _distance_m(0.0, 0.0, self.lat_step / 2, self.lon_step / 2)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1) if j0 <= j1 else [*range(j0, 1 << self.lon_bits), *range(0, j1 + 1)]:
+                    c_lat = -90.0 + (i + 0.5) * self.lat_step
+                    c_lon = -180.0 + (j + 0.5) * self.lon_step
+                    if _distance_m(lat, lon, c_lat, c_lon) <= radius + half_diag:
+                        cells[(i, j)] = max(cells.get((i, j), 0.0), risk)
+            centre = self.cell(lat, lon)
+            cells[centre] = max(cells.get(centre, 0.0), risk)
+        return cells
+
+    def load_zones(self, zones) -> None:
+        """Replace the zones with (owner_id, latitude, longitude, radius_m, risk) rows."""
+        by_owner = defaultdict(list)
+        for owner_id, lat, lon, radius, risk in zones:
+            by_owner[owner_id].append((lat, lon, radius or 0.0, 1.0 if risk is None else risk))
+        cells: Dict[Cell, Dict[int, float]] = {}
+        for owner_id, circles in by_owner.items():
+            for cell, risk in self.build_zones(circles).items():
+                cells.setdefault(cell, {})[owner_id] = risk
+        self._zones = cells
+        self.counters["zones"] = sum(len(c) for c in by_owner.values())
+
+    def refresh(self, db=None) -> int:
+        """One incremental pass over the DB (``db`` or a session of its own): new incidents since the last pass, plus the current zones."""
+        from sqlalchemy import exists
+        from sqlalchemy.orm import aliased
+        from app.db.session import SessionLocal
+        from app.models.event import EmergencyEvent
+        from app.models.responder import ResponderActionLog
+        from app.models.zone import UnsafeZone
+
+        log, earlier = ResponderActionLog, aliased(ResponderActionLog)
+        added = 0
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            while True:
+                rows = (db.query(log.id, EmergencyEvent.latitude, EmergencyEvent.longitude, EmergencyEvent.timestamp)
+                        .join(EmergencyEvent, EmergencyEvent.id == log.event_id)
+                        .filter(log.id > self._last_log_id, log.action.in_(INCIDENT_ACTIONS))
+                        # An SOS that is later acknowledged and resolved is still one incident
+                        .filter(~exists().where(earlier.event_id == log.event_id, earlier.action.in_(INCIDENT_ACTIONS), earlier.id < log.id))
+                        .order_by(log.id).limit(self.batch_size).all())
+                for log_id, lat, lon, ts in rows:
+                    self._last_log_id = log_id
+                    if lat is not None and lon is not None:
+                        self.add_event(lat, lon, ts or datetime.now(timezone.utc))
+                        added += 1
+                if len(rows) < self.batch_size:
+                    break
+            zones = db.query(UnsafeZone.owner_id, UnsafeZone.latitude, UnsafeZone.longitude, UnsafeZone.radius_m, UnsafeZone.risk).all()
+        finally:
+            if own_session:
+                db.close()
+        self.load_zones(zones)
+        self.counters["refreshes"] += 1
+        return added
+
+    def request_refresh(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="hotspot-grid", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        self._thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                started = time.perf_counter()
+                added = self.refresh()
+                if added:
+                    logger.info(f"🗺️ Hotspot grid: +{added} incidents in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                logger.error(f"❌ Hotspot grid refresh failed: {e}")
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.counters, "cells": len(self._incidents), "zone_cells": len(self._zones), "last_log_id": self._last_log_id}
+
+
+def _distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(math.sqrt(a), 1.0))
+
+
+hotspot_grid = HotspotGrid(
+    precision=settings.HOTSPOT_GEOHASH_PRECISION,
+    bucket_hours=settings.HOTSPOT_BUCKET_HOURS,
+    saturation_events=settings.HOTSPOT_SATURATION_EVENTS,
+    refresh_seconds=settings.HOTSPOT_REFRESH_SECONDS,
+)
@@ -0,0 +1,36 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Set
+
+class StatusNotifier:
+    """
+    Wakes status-stream subscribers when a session's inference state changes.
+
+    Endpoints call ``notify(session_id)`` on the event loop after an engine has updated the
+    session; each subscriber owns one ``asyncio.Event``, so a burst of updates collapses into a
+    single wake-up.
+    """
+    def __init__(self):
+        self._events: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+
+    def subscribe(self, session_id: str) -> asyncio.Event:
+        event = asyncio.Event()
+        self._events[session_id].add(event)
+        return event
+
+    def unsubscribe(self, session_id: str, event: asyncio.Event) -> None:
+        events = self._events.get(session_id)
+        if events is not None:
+            events.discard(event)
+            if not events:
+                del self._events[session_id]
+
+    def notify(self, session_id: str) -> None:
+        for event in self._events.get(session_id, ()):
+            event.set()
+
+    @property
+    def subscribers(self) -> int:
+        return sum(len(events) for events in self._events.values())
+
+status_notifier = StatusNotifier()
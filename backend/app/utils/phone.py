@@ -0,0 +1,29 @@
+import re
+from typing import Optional
+from app.core.config import settings
+
+_SEPARATORS = re.compile(r"[\s\-().]")
+
+def normalize_phone(raw: Optional[str], country_code: str = None, national_digits: int = None) -> Optional[str]:
+    """
+    E.164 form of a phone number ("+919822012345"), or None if it cannot be one (empty, letters,
+    short service codes like "112"). Numbers without "+"/"00" are national: trunk zeros are
+    dropped and ``PHONE_DEFAULT_COUNTRY_CODE`` is prepended unless the number is already longer
+    than a national number.
+    """
+    if not raw:
+        return None
+    country_code = country_code or settings.PHONE_DEFAULT_COUNTRY_CODE
+    national_digits = national_digits or settings.PHONE_NATIONAL_DIGITS
+    number = _SEPARATORS.sub("", raw.strip())
+    if number.startswith("+"):
+        digits = number[1:]
+    elif number.startswith("00"):
+        digits = number[2:]
+    else:
+        digits = number.lstrip("0")
+        if len(digits) <= national_digits:
+            digits = country_code + digits
+    if not digits.isdigit() or not 8 <= len(digits) <= 15 or digits[0] == "0":
+        return None
+    return "+" + digits
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import app.models
+from app.db.base_class import Base
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database with every table."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_user(db, email: str, full_name: str = "User", role: str = "user", **fields) -> User:
+    user = User(email=email, full_name=full_name, hashed_password="x", role=role, **fields)
+    db.add(user)
+    db.flush()
+    return user
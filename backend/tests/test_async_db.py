@@ -0,0 +1,109 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import app.models
+from app.api.v1 import deps
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.db.base_class import Base
+from app.main import app
+from app.models.contact import EmergencyContact
+from app.models.event import Alert, EmergencyEvent
+from app.models.responder import ResponderActionLog
+from app.ai.state import SessionStore
+from app.api.v1.endpoints import dashboard, emergency
+from app.services.decision import SessionContext, decision_engine
+from app.services.fusion import risk_fuser
+from conftest import add_user
+
+
+def test_async_url_swaps_driver():
+    pg = Settings(DATABASE_URL="postgresql://u:p@db:5432/wsa")
+    assert pg.get_async_database_url() == "postgresql+asyncpg://u:p@db:5432/wsa"
+    assert Settings(DATABASE_URL="postgres+psycopg2://u:p@db/wsa").get_async_database_url() == "postgresql+asyncpg://u:p@db/wsa"
+    assert Settings(DATABASE_URL="sqlite:///./wsa.db").get_async_database_url() == "sqlite+aiosqlite:///./wsa.db"
+
+
+def test_explicit_async_url_wins():
+    s = Settings(DATABASE_URL="postgresql://u:p@db/wsa", ASYNC_DATABASE_URL="postgresql+asyncpg://other/wsa")
+    assert s.get_async_database_url() == "postgresql+asyncpg://other/wsa"
+
+
+@pytest.fixture
+def async_app(tmp_path):
+    """The app with get_async_db on aiosqlite, plus a sync session on the same file to seed and inspect."""
+    pytest.importorskip("aiosqlite")
+    path = tmp_path / "wsa.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = add_user(db, "victim@example.com", "Victim", phone_number="9876543210")
+    db.add(EmergencyContact(owner_id=user.id, name="Mom", phone_number="+91 98765 43211"))
+    db.commit()
+
+    # Same options as app.db.session; NullPool so no connection outlives the request's event loop
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    async def get_async_db():
+        async with sessions() as session:
+            yield session
+    app.dependency_overrides[deps.get_async_db] = get_async_db
+    headers = {"Authorization": f"Bearer {create_access_token(user.email)}"}
+    yield TestClient(app), headers, db, user
+    app.dependency_overrides.clear()
+    db.close()
+    engine.dispose()
+
+
+def test_sos_runs_on_the_async_session(async_app):
+    http, headers, db, user = async_app
+    response = http.post("/api/v1/emergency/sos", data={"latitude": 1.0, "longitude": 2.0}, headers=headers)
+    assert response.status_code == 200
+    event = response.json()
+    assert event["status"] == "triggered" and event["user_id"] == user.id
+    assert [a["contact_name"] for a in event["alerts"]] == ["Mom"]
+    assert [log["action"] for log in event["action_logs"]] == ["sos_triggered"]
+    assert db.query(Alert).one().phone_e164 == "+919876543211"
+
+
+def test_ml_inference_runs_on_the_async_session(async_app, monkeypatch):
+    http, headers, db, user = async_app
+    published = []
+    monkeypatch.setattr(emergency, "publish_event", lambda action, event, actor: published.append((action, event.status)))
+    quiet = http.post("/api/v1/emergency/ml-inference", data={"latitude": 1.0, "longitude": 2.0}, headers=headers)
+    assert quiet.status_code == 200 and quiet.json()["status"] == "monitored" and quiet.json()["alerts"] == []
+    assert published == [] # monitored readings stay off the responder feed
+
+    now = time.monotonic()
+    for step in range(30): # a session that has been at full risk for the last half minute
+        risk_fuser.update(str(user.id), 1.0, now=now - 30 + step)
+    alert = http.post("/api/v1/emergency/ml-inference", data={"latitude": 1.0, "longitude": 2.0}, headers=headers)
+    assert alert.status_code == 200
+    event = alert.json()
+    assert event["status"] == "triggered" and len(event["alerts"]) == 1
+    assert [log["action"] for log in event["action_logs"]] == ["ai_threat_detected"]
+    assert published == [("created", "triggered")]
+    assert db.query(EmergencyEvent).count() == 2 and db.query(ResponderActionLog).count() == 1
+
+
+def test_streaming_scores_use_the_location_of_the_last_scan(async_app, monkeypatch):
+    http, headers, _, user = async_app
+    monkeypatch.setattr(decision_engine, "contexts", SessionStore(SessionContext))
+    monkeypatch.setattr(emergency.hotspot_grid, "risk_at", lambda lat, lon, when=None, user_id=None: 0.8)
+    session_id = str(user.id)
+    assert dashboard.build_status(session_id)["risk"]["context_risk"] == 0.0
+    scan = http.post("/api/v1/emergency/ml-inference", data={"latitude": 1.0, "longitude": 2.0}, headers=headers)
+    assert scan.status_code == 200
+    # The scan, status reads and what streaming ingest feeds the fuser all carry the same context term
+    assert dashboard.build_status(session_id)["risk"]["context_risk"] == 0.8
+    assert decision_engine.assess(session_id, None, None, observe=True)["context_risk"] == 0.8
+
+
+def test_async_endpoints_reject_bad_tokens(async_app):
+    http, _, _, _ = async_app
+    response = http.post("/api/v1/emergency/sos", data={"latitude": 1.0, "longitude": 2.0}, headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 403
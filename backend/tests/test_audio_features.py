@@ -0,0 +1,49 @@
+import json
+import numpy as np
+import pytest
+from app.ai.audio.features import Wav2Vec2Features
+
+transformers = pytest.importorskip("transformers")
+
+CONFIG = {
+    "do_normalize": True,
+    "feature_extractor_type": "Wav2Vec2FeatureExtractor",
+    "feature_size": 1,
+    "padding_side": "right",
+    "padding_value": 0.0,
+    "return_attention_mask": True,
+    "sampling_rate": 16000,
+}
+
+@pytest.fixture
+def extractors(tmp_path):
+    (tmp_path / "preprocessor_config.json").write_text(json.dumps(CONFIG))
+    reference = transformers.Wav2Vec2FeatureExtractor.from_pretrained(str(tmp_path))
+    return reference, Wav2Vec2Features.from_pretrained(str(tmp_path))
+
+def test_single_waveform_matches_transformers(extractors):
+    reference, ours = extractors
+    y = np.random.default_rng(0).normal(0, 0.1, 16000).astype(np.float32)
+    expected = reference(y, sampling_rate=16000, return_tensors="np")["input_values"]
+    actual = ours(y, sampling_rate=16000)["input_values"]
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected)
+
+def test_equal_length_batch_matches_transformers(extractors):
+    reference, ours = extractors
+    batch = [np.random.default_rng(i).normal(0, 0.2, 8000) for i in range(3)] # float64 input is cast like upstream
+    expected = reference(batch, sampling_rate=16000, return_tensors="np")["input_values"]
+    assert np.array_equal(ours(batch, sampling_rate=16000)["input_values"], expected)
+
+def test_padded_batch_matches_transformers(extractors):
+    reference, ours = extractors
+    batch = [np.random.default_rng(i).normal(0, 0.1, n).astype(np.float32) for i, n in enumerate((4000, 9000, 6000))]
+    expected = reference(batch, sampling_rate=16000, padding=True, return_tensors="np")
+    actual = ours(batch, sampling_rate=16000, padding=True)
+    assert np.array_equal(actual["input_values"], expected["input_values"])
+    assert np.array_equal(actual["attention_mask"], expected["attention_mask"])
+
+def test_rejects_other_sampling_rates(extractors):
+    _, ours = extractors
+    with pytest.raises(ValueError):
+        ours(np.zeros(800, dtype=np.float32), sampling_rate=8000)
@@ -0,0 +1,19 @@
+import asyncio
+from app.services.broker import EventBroker, LocalBackend
+
+def test_slow_subscriber_is_dropped_without_blocking_others():
+    async def scenario():
+        broker = EventBroker(LocalBackend(), queue_size=2)
+        await broker.start()
+        slow, fast = broker.subscribe("responder"), broker.subscribe("responder")
+        received = []
+        for i in range(3):
+            broker.publish("responder", {"n": i})
+            await asyncio.sleep(0)
+            received.append(await fast.get())
+        assert [m["n"] for m in received] == [0, 1, 2]
+        assert await slow.get() is None # queue overflowed on the third message
+        assert broker.metrics["dropped_subscribers"] == 1
+        assert broker.metrics["subscribers"] == {"responder": 1}
+        await broker.stop()
+    asyncio.run(scenario())
@@ -1,8 +1,21 @@
+import pytest
 from fastapi.testclient import TestClient
+from app.api.v1 import deps
 from app.main import app
+from conftest import add_user
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def signed_in(db):
+    """Routes read the in-memory test database as a signed-in user."""
+    user = add_user(db, "tester@example.com")
+    db.commit()
+    app.dependency_overrides[deps.get_db] = lambda: db
+    app.dependency_overrides[deps.get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.clear()
+
 def test_root():
     response = client.get("/")
     assert response.status_code == 200
@@ -26,3 +39,36 @@ def test_settings_get():
     response = client.get("/api/v1/settings/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+def test_ingest_socket_rejects_bad_token():
+    import pytest
+    from starlette.websockets import WebSocketDisconnect
+    with client.websocket_connect("/api/v1/dashboard/ingest/ws") as ws:
+        ws.send_json({"token": "not-a-jwt"})
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+def test_ingest_records_are_length_prefixed():
+    import struct
+    from app.api.v1.endpoints.dashboard import parse_records, TAG_VIDEO, TAG_AUDIO
+    data = struct.pack(">BI", TAG_VIDEO, 3) + b"jpg" + struct.pack(">BI", TAG_AUDIO, 0)
+    assert [(tag, bytes(payload)) for tag, payload in parse_records(data)] == [(TAG_VIDEO, b"jpg"), (TAG_AUDIO, b"")]
+
+def test_status_change_key_ignores_timestamps():
+    from app.api.v1.endpoints.dashboard import status_change_key
+    def status(ts, people=1):
+        return {"vision": {"people_count": people, "pose_risk": False, "motion_detected": True, "active": True, "timestamp": ts},
+                "audio": {"emotion": "neutral", "confidence": 0.5, "active": True, "timestamp": ts},
+                "risk": {"threat_score": 0.2, "threat_level": "LOW", "fused_score": 0.2, "alerting": False},
+                "system": {"vision_active": True, "audio_active": True}}
+    assert status_change_key(status("12:00:00")) == status_change_key(status("12:00:01"))
+    assert status_change_key(status("12:00:00")) != status_change_key(status("12:00:01", people=2))
+
+def test_socket_auth_tolerates_a_client_leaving_mid_handshake():
+    import asyncio
+    from starlette.websockets import WebSocketDisconnect
+    class Gone:
+        async def receive_json(self):
+            raise WebSocketDisconnect(code=1001)
+    assert asyncio.run(deps.websocket_user(Gone())) is None
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from app.ai.executor import InferenceExecutor, Superseded
+
+
+def test_same_key_never_runs_concurrently():
+    executor = InferenceExecutor("test", workers=4, max_pending=16)
+    active, overlaps, lock = [0], [], threading.Lock()
+
+    def work(i):
+        with lock:
+            active[0] += 1
+            overlaps.append(active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return i
+
+    first = executor.submit(work, 0, key=("vision", "1"))
+    time.sleep(0.005) # first is running
+    held = [executor.submit(work, i, key=("vision", "1")) for i in (1, 2, 3)]
+    assert first.result(1) == 0
+    assert held[-1].result(1) == 3
+    for f in held[:-1]:
+        with pytest.raises(Superseded):
+            f.result(1)
+    assert max(overlaps) == 1
+    executor.shutdown()
+
+
+def test_other_keys_run_while_one_is_held():
+    executor = InferenceExecutor("test", workers=2, max_pending=16)
+    gate = threading.Event()
+    blocked = executor.submit(gate.wait, 1, key="a")
+    time.sleep(0.005)
+    executor.submit(lambda: None, key="a") # held behind the running "a"
+    assert executor.submit(lambda: "b", key="b").result(1) == "b"
+    gate.set()
+    assert blocked.result(1) is True
+    executor.shutdown()
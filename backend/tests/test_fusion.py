@@ -0,0 +1,36 @@
+from app.services.fusion import RiskFuser
+
+def fuser():
+    return RiskFuser(tau_seconds=6.0, max_step_seconds=2.0, escalate=0.55, deescalate=0.35)
+
+def test_single_spike_does_not_alert():
+    f = fuser()
+    for t in range(10):
+        f.update("s", 0.1, now=t)
+    result = f.update("s", 1.0, now=10)
+    assert not result["alerting"]
+    assert f.update("s", 0.1, now=11)["threat_level"] != "HIGH"
+
+def test_sustained_medium_risk_escalates():
+    f = fuser()
+    results = [f.update("s", 0.6, now=t) for t in range(30)]
+    assert not results[0]["alerting"]
+    assert results[-1]["alerting"] and results[-1]["threat_level"] == "HIGH"
+
+def test_hysteresis_and_idle_decay():
+    f = fuser()
+    for t in range(30):
+        f.update("s", 0.9, now=t)
+    # Dropping just below the escalate threshold keeps the alert
+    assert all(f.update("s", 0.5, now=t)["alerting"] for t in range(30, 40))
+    assert f.peek("s", now=40)["alerting"]
+    # Long silence fades the state without new readings
+    assert f.peek("s", now=200) == {"fused_score": 0.0, "alerting": False, "threat_level": "LOW"}
+
+def test_sampling_rate_does_not_change_the_time_constant():
+    slow, fast = fuser(), fuser()
+    for t in range(10):
+        slow.update("s", 0.8, now=float(t))
+    for i in range(50):
+        fast.update("s", 0.8, now=i * 0.2)
+    assert abs(slow.peek("s", now=9.8)["fused_score"] - fast.peek("s", now=9.8)["fused_score"]) < 0.05
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import event
+from app.models.user import User
+from app.models.event import EmergencyEvent, Alert
+from app.models.responder import ResponderActionLog
+from app.api.v1.endpoints.emergency import get_history, get_received_alerts
+from conftest import add_user
+
+def seed(db, n_events):
+    user = add_user(db, "u@example.com", phone_number="+100")
+    responder = add_user(db, "r@example.com", "Responder", role="responder")
+    for i in range(n_events):
+        e = EmergencyEvent(user_id=user.id, latitude=1.0, longitude=2.0, risk_score=0.9, status="triggered")
+        db.add(e)
+        db.flush()
+        db.add_all([Alert(event_id=e.id, contact_name="c", contact_phone="+200", message="m") for _ in range(2)])
+        db.add_all([ResponderActionLog(responder_id=responder.id, event_id=e.id, action="acknowledge", note="n"),
+                     ResponderActionLog(responder_id=None, event_id=e.id, action="sos_triggered", note="n")])
+    db.commit()
+    db.expire_all()
+    return db.query(User).filter(User.email == "u@example.com").one()
+
+def count_queries(db, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+@pytest.mark.parametrize("n_events", [5, 60])
+def test_history_query_count_is_constant(db, n_events):
+    user = seed(db, n_events)
+    results, queries = count_queries(db, lambda: get_history(db=db, current_user=user, limit=50, offset=0))
+    assert len(results) == min(n_events, 50)
+    assert all(len(r["alerts"]) == 2 and len(r["action_logs"]) == 2 for r in results)
+    assert {log["responder_name"] for log in results[0]["action_logs"]} == {"Responder", "System"}
+    assert queries <= 3
+
+def test_history_pages_do_not_overlap(db):
+    user = seed(db, 7)
+    first = get_history(db=db, current_user=user, limit=4, offset=0)
+    second = get_history(db=db, current_user=user, limit=4, offset=4)
+    assert len(first) == 4 and len(second) == 3
+    assert not {r["id"] for r in first} & {r["id"] for r in second}
+
+def test_received_alerts_match_any_phone_format_in_one_query(db):
+    victim = seed(db, 3)
+    contact = add_user(db, "c@example.com", "Contact", phone_number="+91 98220 12345")
+    events = db.query(EmergencyEvent).order_by(EmergencyEvent.id).all()
+    db.add_all([Alert(event_id=e.id, contact_name="Contact", contact_phone=phone, message="m")
+                for e, phone in zip(events, ["09822012345", "+919822012345", "98220-12345"])])
+    db.commit()
+    db.refresh(contact) # loaded like get_current_user would
+    results, queries = count_queries(db, lambda: get_received_alerts(db=db, current_user=contact, limit=50, offset=0))
+    assert len(results) == 3
+    assert {r["victim_name"] for r in results} == {victim.full_name}
+    assert queries == 1
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+from app.api.v1 import deps
+from app.main import app
+from app.models.event import EmergencyEvent
+from app.models.responder import ResponderActionLog
+from app.services.hotspots import HotspotGrid
+from conftest import add_user
+
+NIGHT = datetime(2024, 5, 1, 22, 30, tzinfo=timezone.utc)
+NOON = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_cells_are_geohash_cells():
+    grid = HotspotGrid(precision=6)
+    assert grid.geohash(grid.cell(57.64911, 10.40744)) == "u4pruy"
+    assert grid.geohash(grid.cell(-33.8688, 151.2093)) == "r3gx2f"
+
+def test_incidents_raise_risk_in_their_cell_and_hour_only():
+    grid = HotspotGrid(precision=6, bucket_hours=3, saturation_events=5.0)
+    for _ in range(5):
+        grid.add_event(0.0, 0.0, NIGHT)
+    assert round(grid.risk_at(0.0, 0.0, NIGHT), 2) == 0.63
+    assert grid.risk_at(0.0, 0.0, NOON) == 0.0
+    assert 0.0 < grid.risk_at(0.0, 0.0 + grid.lon_step, NIGHT) < grid.risk_at(0.0, 0.0, NIGHT) # neighbour
+    assert grid.risk_at(1.0, 1.0, NIGHT) == 0.0
+
+def test_unsafe_zone_covers_its_radius_at_all_hours_for_its_owner():
+    grid = HotspotGrid(precision=7) # ~150 m cells
+    grid.load_zones([(1, 12.9716, 77.5946, 300.0, 0.8)])
+    assert grid.risk_at(12.9716, 77.5946, NOON, user_id=1) == 0.8
+    assert grid.risk_at(12.9730, 77.5946, NIGHT, user_id=1) == 0.8 # ~155 m north
+    assert grid.risk_at(12.9900, 77.5946, NOON, user_id=1) == 0.0 # ~2 km north
+    assert grid.risk_at(12.9716, 77.5946, NOON, user_id=2) == 0.0
+    assert grid.risk_at(12.9716, 77.5946, NOON) == 0.0
+
+def test_refresh_counts_raised_and_confirmed_incidents_once(db):
+    user = add_user(db, "u@example.com")
+    def event(action_logs, status="triggered"):
+        e = EmergencyEvent(user_id=user.id, latitude=10.0, longitude=20.0, risk_score=0.9, status=status, timestamp=NIGHT)
+        db.add(e)
+        db.flush()
+        db.add_all([ResponderActionLog(responder_id=user.id, event_id=e.id, action=a) for a in action_logs])
+    event(["sos_triggered", "acknowledge", "resolve"]) # one incident, not three
+    event(["ai_threat_detected"]) # AI alone: not an incident
+    event(["ai_threat_detected", "acknowledge"], status="acknowledged") # confirmed by a responder
+    event([], status="monitored")
+    db.commit()
+    grid = HotspotGrid()
+    assert grid.refresh(db) == 2
+    assert grid.refresh(db) == 0
+    assert grid.metrics["events"] == 2
+
+@pytest.fixture
+def client(db):
+    users = {"owner": add_user(db, "owner@example.com"), "other": add_user(db, "other@example.com")}
+    db.commit()
+    current = {"user": users["owner"]}
+    app.dependency_overrides[deps.get_db] = lambda: db
+    app.dependency_overrides[deps.get_current_user] = lambda: current["user"]
+    yield TestClient(app), users, current
+    app.dependency_overrides.clear()
+
+def test_zones_are_private_to_their_owner(client):
+    http, users, current = client
+    created = http.post("/api/v1/zones/", json={"name": "underpass", "latitude": 12.97, "longitude": 77.59, "radius_m": 200})
+    assert created.status_code == 200
+    zone = created.json()
+    assert zone["owner_id"] == users["owner"].id and zone["radius_m"] == 200
+    assert [z["id"] for z in http.get("/api/v1/zones/").json()] == [zone["id"]]
+
+    current["user"] = users["other"]
+    assert http.get("/api/v1/zones/").json() == []
+    assert http.delete(f"/api/v1/zones/{zone['id']}").status_code == 404
+
+    current["user"] = users["owner"]
+    assert http.delete(f"/api/v1/zones/{zone['id']}").json() == {"ok": True}
+    assert http.get("/api/v1/zones/").json() == []
+
+def test_zone_fields_are_validated(client):
+    http, _, _ = client
+    assert http.post("/api/v1/zones/", json={"name": "x", "latitude": 123.0, "longitude": 0.0}).status_code == 422
+    assert http.post("/api/v1/zones/", json={"name": "x", "latitude": 0.0, "longitude": 0.0, "risk": 2.0}).status_code == 422
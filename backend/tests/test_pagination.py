@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException, Response
+from app.models.event import EmergencyEvent
+from app.api.v1.endpoints.responder import get_all_events
+from conftest import add_user
+
+FILTERS = dict(status=None, user_id=None, min_risk=None, max_risk=None, since=None, until=None)
+
+def seed(db, n):
+    responder = add_user(db, "r@example.com", "Responder", role="responder")
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        # Three events per minute: pages must break ties on id
+        db.add(EmergencyEvent(user_id=responder.id, latitude=0.0, longitude=0.0, risk_score=i / n,
+                              status="triggered" if i % 2 else "resolved", timestamp=start + timedelta(minutes=i // 3)))
+    db.commit()
+    return responder
+
+def walk(db, user, limit, **filters):
+    ids, cursor = [], None
+    while True:
+        response = Response()
+        page = get_all_events(response=response, db=db, current_user=user, cursor=cursor, limit=limit, **{**FILTERS, **filters})
+        assert len(page) <= limit
+        ids += [e["id"] for e in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+def test_pages_cover_every_event_once_newest_first(db):
+    user = seed(db, 23)
+    ids = walk(db, user, limit=5)
+    assert ids == sorted(ids, reverse=True) and len(ids) == 23
+
+def test_filters_apply_across_pages(db):
+    user = seed(db, 23)
+    ids = walk(db, user, limit=3, status="triggered", min_risk=0.3)
+    expected = [e.id for e in db.query(EmergencyEvent).filter(EmergencyEvent.status == "triggered", EmergencyEvent.risk_score >= 0.3)]
+    assert sorted(ids) == sorted(expected)
+
+def test_invalid_cursor_is_rejected(db):
+    user = seed(db, 1)
+    with pytest.raises(HTTPException) as exc:
+        get_all_events(response=Response(), db=db, current_user=user, cursor="not-a-cursor", limit=5, **FILTERS)
+    assert exc.value.status_code == 400
+
+def test_create_indexes_adds_the_risk_index_to_an_existing_database(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, inspect
+    from app.db import create_indexes
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    EmergencyEvent.__table__.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_emergency_events_risk_timestamp_id") # a database from before the index
+    monkeypatch.setattr(create_indexes, "engine", engine)
+    create_indexes.create_indexes()
+    indexes = {i["name"]: i["column_names"] for i in inspect(engine).get_indexes("emergency_events")}
+    assert indexes["ix_emergency_events_risk_timestamp_id"] == ["risk_score", "timestamp", "id"]
+    engine.dispose()
@@ -0,0 +1,13 @@
+from app.utils.phone import normalize_phone
+
+def test_formats_of_the_same_number_normalize_equally():
+    forms = ["+91 98220 12345", "+91-9822-012345", "0091 9822012345", "09822012345", "9822012345", "(982) 201-2345"]
+    assert {normalize_phone(f, country_code="91", national_digits=10) for f in forms} == {"+919822012345"}
+
+def test_international_numbers_keep_their_country_code():
+    assert normalize_phone("+1 (415) 555-0132", country_code="91") == "+14155550132"
+    assert normalize_phone("14155550132", country_code="91", national_digits=10) == "+14155550132"
+
+def test_non_numbers_are_rejected():
+    for raw in (None, "", "112", "1091", "call me", "+0123456789"):
+        assert normalize_phone(raw) is None
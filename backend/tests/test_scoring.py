@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+from app.risk_engine.engine import RiskEngine
+from app.risk_engine.replay import load_file, replay
+from app.risk_engine.scoring import RiskWeights, columns_from_status, score_batch, score_one
+from app.services.decision import ThreatDecisionEngine
+
+VISION = [None, {"people_count": 6, "motion_detected": True, "pose_risk": True}, {"people_count": 2}, {}]
+AUDIO = [{"emotion": "fearful", "confidence": 0.8, "scream": True, "loudness_db": -12.0}, None,
+         {"emotion": "Happy", "confidence": 0.5, "loudness_db": -40.0}, {"emotion": "angry", "confidence": 0.2}]
+
+def test_batch_matches_single_observations():
+    engine = ThreatDecisionEngine()
+    batch = score_batch(columns_from_status(VISION, AUDIO), engine.weights)
+    for i, (v, a) in enumerate(zip(VISION, AUDIO)):
+        single = engine.compute_risk(v, a)
+        assert single["threat_score"] == round(float(batch["threat_score"][i]), 2)
+        assert single["audio_risk"] == round(float(batch["audio_risk"][i]), 2)
+
+def test_distress_emotions_use_gain_and_bias():
+    risk = ThreatDecisionEngine().compute_risk(None, {"emotion": "fearful", "confidence": 0.5})
+    assert risk["audio_risk"] == 0.8 # 1.0 * 0.5 + 0.3
+    tuned = ThreatDecisionEngine(RiskWeights(emotion_gain={"fearful": 1.0}, emotion_bias={"fearful": 0.0}))
+    assert tuned.compute_risk(None, {"emotion": "fearful", "confidence": 0.5})["audio_risk"] == 0.5
+
+def test_risk_engine_formula_is_preserved():
+    engine = RiskEngine()
+    score = engine.calculate_risk({"emotion": "fear", "confidence": 0.5}, {"pose_risk_score": 0.5, "people_count": 5})
+    assert score == round(0.4 * 0.8 * 0.5 + 0.4 * 0.5 + 0.2 * 0.5, 2)
+
+def test_integer_emotion_codes_are_accepted():
+    weights = RiskWeights()
+    codes = np.array([weights.emotions.index("angry"), len(weights.emotions)])
+    risk = score_batch({"emotion": codes, "confidence": np.array([0.5, 0.5])}, weights)
+    assert np.allclose(risk["audio_risk"], [0.8, 0.2])
+
+def test_scalar_path_is_exactly_the_batch_formula():
+    rng = np.random.default_rng(0)
+    emotions = ["angry", "Fearful", "happy", "", None, "panic"]
+    vision = [{"people_count": int(rng.integers(0, 9)), "motion_detected": bool(rng.integers(2)),
+               **({"pose_risk_score": float(rng.random())} if rng.random() < 0.5 else {"pose_risk": bool(rng.integers(2))})}
+              for _ in range(500)] + [None, {}]
+    audio = [{"emotion": emotions[rng.integers(len(emotions))], "confidence": float(rng.random()), "scream": bool(rng.integers(2)),
+              "loudness_db": None if rng.random() < 0.2 else float(rng.uniform(-50, 0))} for _ in range(500)] + [{}, None]
+    context = [{"location_risk": float(rng.uniform(-0.2, 1.2))} for _ in range(500)] + [None, {}]
+    for weights in (RiskWeights(), RiskEngine().weights):
+        batch = score_batch(columns_from_status(vision, audio, context), weights)
+        for i, (v, a, c) in enumerate(zip(vision, audio, context)):
+            single = score_one(v, a, c, weights)
+            for name, value in single.items():
+                assert value == batch[name][i], (name, v, a, c)
+
+def test_replay_fuses_each_session_and_reports_instant_high_separately(tmp_path):
+    high = {"vision": {"people_count": 6, "motion_detected": True, "pose_risk": True},
+            "audio": {"emotion": "fearful", "confidence": 1.0, "scream": True, "loudness_db": -5.0}}
+    quiet = {"vision": {}, "audio": {}}
+    rows = ([dict(quiet, session_id="spike", timestamp=t) for t in range(5)] + [dict(high, session_id="spike", timestamp=5)]
+            + [dict(high, session_id="sustained", timestamp=t) for t in range(6)])
+    path = tmp_path / "obs.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in reversed(rows))) # out of order on purpose
+    columns = load_file(str(path))
+    [row] = replay(columns, [{"name": "current", "tau_seconds": 6.0, "max_step_seconds": 2.0, "escalate": 0.55, "deescalate": 0.35}], repeat=1)
+    assert row["sessions"] == 2
+    assert row["instant_high_rate"] == round(7 / 12, 4)
+    # A single HIGH reading does not raise the fused alert; a sustained one does, once
+    assert row["alerts"] == 1
+    assert 0 < row["trigger_rate"] < row["instant_high_rate"]
@@ -0,0 +1,18 @@
+import numpy as np
+
+from app.ai.vision.tracker import PersonTracker
+
+
+def _detect(tracker, box, now):
+    return tracker.update(np.array([box], dtype=np.float32), np.array([0.9]), [None], [False], now)
+
+
+def test_velocity_holds_under_steady_motion_with_predictions():
+    tracker = PersonTracker(smoothing=0.5)
+    for step in range(8):
+        now = float(step)
+        if step:
+            tracker.predict(now - 0.05) # tracked frame just before each detector run
+        _detect(tracker, [10 * step, 0, 10 * step + 50, 100], now)
+    velocity = tracker.tracks[0].velocity
+    assert np.allclose(velocity, [10, 0, 10, 0], atol=0.2)
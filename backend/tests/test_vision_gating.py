@@ -0,0 +1,29 @@
+import cv2
+import numpy as np
+
+from app.ai.vision.engine import VisionEngine
+
+
+class CountingEngine(VisionEngine):
+    """Real gating/tracking logic with the model pass replaced by one fixed person."""
+
+    def __init__(self, **kwargs):
+        super().__init__("unused", **kwargs)
+        self.model_people = object()
+        self.passes = 0
+
+    def _analyze(self, frame):
+        self.passes += 1
+        return np.array([[10, 10, 60, 110]], dtype=np.float32), np.array([0.9]), [None], [False], False
+
+
+def test_static_cap_forces_a_model_pass_before_more_tracking():
+    engine = CountingEngine(max_static_frames=2, detect_every=5)
+    frame = cv2.imencode(".jpg", np.full((120, 160, 3), 128, np.uint8))[1].tobytes()
+    passes = []
+    for _ in range(4):
+        engine.process_frame(frame, "s")
+        passes.append(engine.passes)
+    # First frame runs the models, the static scene is gated up to the cap, and the cap goes straight to the models
+    assert passes == [1, 1, 1, 2]
+    assert engine.metrics["tracked"] == 0
@@ -2,15 +2,24 @@ import React, { useState, useEffect } from 'react';
 import api from '../services/api';
 import { History, ShieldAlert, Calendar, MapPin, Activity } from 'lucide-react';
 
+const PAGE_SIZE = 50;
+
 const AlertHistory = () => {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [hasMore, setHasMore] = useState(false);
+
+  const fetchPage = async (offset) => {
+    const res = await api.get('/emergency/history', { params: { limit: PAGE_SIZE, offset } });
+    setEvents(prev => offset === 0 ? res.data : [...prev, ...res.data]);
+    setHasMore(res.data.length === PAGE_SIZE);
+  };
 
   useEffect(() => {
     const fetchHistory = async () => {
       try {
-        const res = await api.get('/emergency/history');
-        setEvents(res.data);
+        await fetchPage(0);
       } catch (e) {
         console.error("Failed to fetch history", e);
       } finally {
@@ -20,6 +29,17 @@ const AlertHistory = () => {
     fetchHistory();
   }, []);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await fetchPage(events.length);
+    } catch (e) {
+      console.error("Failed to fetch history", e);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusColor = (status) => {
     if (status === 'triggered') return 'text-rose-500 bg-rose-500/10 border-rose-500/20';
     if (status === 'resolved') return 'text-emerald-500 bg-emerald-500/10 border-emerald-500/20';
@@ -103,6 +123,15 @@ const AlertHistory = () => {
               )}
             </div>
           ))}
+          {hasMore && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="py-3 rounded-2xl border border-zinc-800 text-xs font-black uppercase tracking-widest text-zinc-400 hover:border-zinc-700 hover:text-white transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load older incidents'}
+            </button>
+          )}
         </div>
       )}
     </div>
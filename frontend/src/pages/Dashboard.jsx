@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import api from '../services/api';
+import api, { openEventStream } from '../services/api';
 import { AlertTriangle, MapPin, Mic, Camera, ShieldCheck, Activity } from 'lucide-react';
 import { Card, CardContent } from '@/components/ui-card';
 
@@ -7,20 +7,21 @@ const Dashboard = () => {
   const [location, setLocation] = useState(null);
   const [status, setStatus] = useState('Idle');
   const [riskScore, setRiskScore] = useState(0);
+  // Whether the backend triggered the incident; its alert rule is not a fixed score cut-off
+  const [triggered, setTriggered] = useState(false);
   const [systemReady, setSystemReady] = useState(false);
 
   useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        const res = await api.get('/dashboard/status');
-        if (res.data.system.audio_ready && res.data.system.vision_ready) {
-          setSystemReady(true);
-        }
-      } catch (e) {}
+    // Only readiness is shown here, so the stream is closed once both models are up
+    const events = openEventStream('/dashboard/status/stream');
+    events.onmessage = (e) => {
+      const data = JSON.parse(e.data);
+      if (data.system.audio_ready && data.system.vision_ready) {
+        setSystemReady(true);
+        events.close();
+      }
     };
-    checkStatus();
-    const interval = setInterval(checkStatus, 3000);
-    return () => clearInterval(interval);
+    return () => events.close();
   }, []);
 
   useEffect(() => {
@@ -56,12 +57,21 @@ const Dashboard = () => {
       const response = await api.post('/emergency/sos', formData);
       setStatus('SOS Sent Successfully!');
       setRiskScore(response.data.risk_score);
+      setTriggered(true);
     } catch (err) {
       setStatus('Failed to send SOS');
       console.error(err);
     }
   };
 
+  const showScanResult = (event) => {
+    // The backend decides (scan level or the session's fused state) and answers with the event status
+    const isTriggered = event.status === 'triggered';
+    setRiskScore(event.risk_score);
+    setTriggered(isTriggered);
+    setStatus(isTriggered ? 'High Risk Detected!' : 'Monitoring...');
+  };
+
   const runInference = async (type) => {
     if (!navigator.mediaDevices || !navigator.mediaDevices.getUserMedia) {
       alert("Hardware access is blocked by the browser. Please use 'localhost' instead of '0.0.0.0' or use HTTPS.");
@@ -100,8 +110,7 @@ const Dashboard = () => {
           
           setStatus('Analyzing Audio...');
           const response = await api.post('/emergency/ml-inference', formData);
-          setRiskScore(response.data.risk_score);
-          setStatus(response.data.risk_score >= 0.7 ? 'High Risk Detected!' : 'Monitoring...');
+          showScanResult(response.data);
           stream.getTracks().forEach(t => t.stop());
         };
         mediaRecorder.start();
@@ -110,8 +119,7 @@ const Dashboard = () => {
       }
 
       const response = await api.post('/emergency/ml-inference', formData);
-      setRiskScore(response.data.risk_score);
-      setStatus(response.data.risk_score >= 0.7 ? 'High Risk Detected!' : 'Monitoring...');
+      showScanResult(response.data);
     } catch (err) {
       setStatus('Inference failed');
       console.error(err);
@@ -156,7 +164,7 @@ const Dashboard = () => {
                    </div>
                    <div className="w-full bg-zinc-800 h-2 rounded-full overflow-hidden">
                       <div 
-                        className={`h-full transition-all duration-1000 ${riskScore >= 0.7 ? 'bg-rose-500' : 'bg-emerald-500'}`}
+                        className={`h-full transition-all duration-1000 ${triggered ? 'bg-rose-500' : 'bg-emerald-500'}`}
                         style={{ width: `${riskScore * 100}%` }}
                       />
                    </div>
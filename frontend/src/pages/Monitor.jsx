@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui-card';
 import { Camera, Mic, Activity, ShieldCheck, AlertTriangle, Brain, Eye, Mic2, Loader2 } from 'lucide-react';
-import api from '@/services/api';
+import api, { openSocket, openEventStream } from '@/services/api';
 
 export default function Monitor() {
   const [status, setStatus] = useState(null);
@@ -90,63 +90,127 @@ export default function Monitor() {
   };
 
   // 3. Backend Ingestion Loops
-  const startIngestionLoops = (stream) => {
+  // Record tags of the /dashboard/ingest/ws protocol: tag byte + 4-byte big-endian length + payload
+  const TAG_VIDEO = 1, TAG_AUDIO = 2, TAG_AUDIO_START = 3;
+
+  const packRecord = async (tag, blob) => {
+    const payload = new Uint8Array(await blob.arrayBuffer());
+    const record = new Uint8Array(5 + payload.byteLength);
+    const view = new DataView(record.buffer);
+    view.setUint8(0, tag);
+    view.setUint32(1, payload.byteLength);
+    record.set(payload, 5);
+    return record;
+  };
+
+  // Resolves with an authenticated ingest socket, or null to fall back to the HTTP endpoints
+  const connectIngestSocket = () => new Promise((resolve) => {
+    let socket;
+    try { socket = openSocket('/dashboard/ingest/ws'); } catch (e) { return resolve(null); }
+    const timer = setTimeout(() => { socket.close(); resolve(null); }, 3000);
+    socket.addEventListener('message', (e) => {
+      if (JSON.parse(e.data).type === 'ready') { clearTimeout(timer); resolve(socket); }
+    });
+    socket.addEventListener('close', () => { clearTimeout(timer); resolve(null); });
+  });
+
+  const startIngestionLoops = async (stream) => {
+    // Capture size/format advertised by the backend; falls back to the old defaults
+    let capture = { width: 640, format: 'image/jpeg', quality: 0.6 };
+    try {
+      const res = await api.get('/dashboard/ingest/config');
+      capture = { ...capture, ...res.data.vision };
+    } catch (e) {}
+
+    let socket = await connectIngestSocket();
+    const socketOpen = () => socket && socket.readyState === WebSocket.OPEN;
+    let restartRecorder = () => {};
+    if (socket) {
+      socket.addEventListener('message', (e) => {
+        const msg = JSON.parse(e.data);
+        if (msg.type === 'audio' && msg.status === 'restart') restartRecorder();
+      });
+      // Lost the socket: continue over HTTP, with a new recording so the backend gets a fresh header
+      socket.addEventListener('close', () => {
+        socket = null;
+        if (stream.active) restartRecorder();
+      });
+    }
+
     const visionInterval = setInterval(async () => {
-      if (!stream.active) return clearInterval(visionInterval);
+      if (!stream.active) {
+        if (socketOpen()) socket.close();
+        return clearInterval(visionInterval);
+      }
       const canvas = canvasRef.current;
       const video = videoRef.current;
       if (!canvas || !video || video.videoWidth === 0) return;
 
-      canvas.width = video.videoWidth;
-      canvas.height = video.videoHeight;
-      canvas.getContext('2d').drawImage(video, 0, 0);
+      const scale = Math.min(1, capture.width / video.videoWidth);
+      canvas.width = Math.round(video.videoWidth * scale);
+      canvas.height = Math.round(video.videoHeight * scale);
+      canvas.getContext('2d').drawImage(video, 0, 0, canvas.width, canvas.height);
       
       canvas.toBlob(async (blob) => {
+        // Browsers without an encoder for the requested type hand back PNG, which is far larger
+        if (blob.type !== capture.format && capture.format !== 'image/jpeg') {
+          capture = { ...capture, format: 'image/jpeg' };
+        }
+        if (socketOpen()) return socket.send(await packRecord(TAG_VIDEO, blob));
         const formData = new FormData();
-        formData.append('file', blob, 'frame.jpg');
+        formData.append('file', blob, blob.type === 'image/webp' ? 'frame.webp' : 'frame.jpg');
         try { 
           await api.post('/dashboard/ingest/vision', formData, {
             headers: { 'Content-Type': 'multipart/form-data' }
           }); 
         } catch(e) {}
-      }, 'image/jpeg', 0.6);
+      }, capture.format, capture.quality);
     }, 2000);
 
+    // One continuous recording sent as 1 s timeslices; the backend keeps a decoder per session
     const audioTrack = stream.getAudioTracks()[0];
-    const mediaRecorder = new MediaRecorder(new MediaStream([audioTrack]), { mimeType: 'audio/webm' });
-    mediaRecorder.ondataavailable = async (e) => {
-      if (e.data.size > 1000) {
+    let currentRecorder = null;
+    const startRecorder = () => {
+      const mediaRecorder = new MediaRecorder(new MediaStream([audioTrack]), { mimeType: 'audio/webm' });
+      currentRecorder = mediaRecorder;
+      let seq = 0;
+      mediaRecorder.ondataavailable = async (e) => {
+        if (!e.data.size) return;
+        const piece = seq++;
+        if (socketOpen()) return socket.send(await packRecord(piece === 0 ? TAG_AUDIO_START : TAG_AUDIO, e.data));
         const formData = new FormData();
         formData.append('file', e.data, 'audio.webm');
+        formData.append('seq', piece);
         try { 
-          await api.post('/dashboard/ingest/audio', formData, {
+          const res = await api.post('/dashboard/ingest/audio', formData, {
             headers: { 'Content-Type': 'multipart/form-data' }
           }); 
+          if (res.data.status === 'restart') restartRecorder();
         } catch(e) {}
-      }
+      };
+      mediaRecorder.start(1000);
     };
-    mediaRecorder.start();
-    const audioInterval = setInterval(() => {
-      if (!stream.active) return clearInterval(audioInterval);
-      if (mediaRecorder.state === 'recording') {
-        mediaRecorder.stop();
-        mediaRecorder.start();
-      }
-    }, 5000);
+    // The backend lost this stream's decoder (or the transport changed): start over with a fresh WebM header
+    restartRecorder = () => {
+      if (!currentRecorder || currentRecorder.state !== 'recording') return;
+      currentRecorder.ondataavailable = null;
+      currentRecorder.stop();
+      startRecorder();
+    };
+    startRecorder();
   };
 
-  // 4. Polling for AI Status
+  // 4. AI Status, pushed by the backend whenever it changes
   useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        const res = await api.get('/dashboard/status');
-        setStatus(res.data);
-        if (res.data.system.audio_ready && res.data.system.vision_ready) {
-          setSystemReady(true);
-        }
-      } catch (e) {}
-    }, 1500);
-    return () => clearInterval(interval);
+    const events = openEventStream('/dashboard/status/stream');
+    events.onmessage = (e) => {
+      const data = JSON.parse(e.data);
+      setStatus(data);
+      if (data.system.audio_ready && data.system.vision_ready) {
+        setSystemReady(true);
+      }
+    };
+    return () => events.close();
   }, [streaming]);
 
   const getThreatColor = (level) => {
@@ -20,11 +20,26 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// WebSocket on the same API base; the token goes in the first message since browsers cannot set headers
+export const openSocket = (path) => {
+  const socket = new WebSocket(getBaseURL().replace(/^http/, 'ws') + path);
+  socket.addEventListener('open', () => {
+    socket.send(JSON.stringify({ token: localStorage.getItem('token') }));
+  });
+  return socket;
+};
+
+// Server-sent events; EventSource cannot send headers either, so the token goes in the query string
+export const openEventStream = (path) =>
+  new EventSource(`${getBaseURL()}${path}?token=${encodeURIComponent(localStorage.getItem('token') || '')}`);
+
 export const responderApi = {
   getEvents: () => api.get('/responder/events'),
   acknowledgeEvent: (eventId) => api.post(`/responder/events/${eventId}/acknowledge`),
   resolveEvent: (eventId) => api.post(`/responder/events/${eventId}/resolve`),
   getLogs: () => api.get('/responder/logs'),
+  // Live feed: named events event.created / event.acknowledged / event.resolved
+  streamEvents: () => openEventStream('/responder/events/stream'),
 };
 
 export default api;
\ No newline at end of file
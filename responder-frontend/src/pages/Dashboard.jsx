@@ -4,25 +4,57 @@ import { useAuth } from '../services/AuthContext';
 import { Shield, AlertCircle, Activity, Clock, LogOut, Map, User, Phone, CheckCircle, Navigation } from 'lucide-react';
 
 export default function Dashboard() {
-  const [events, setEvents] = useState([]);
+  // Loaded incidents (newest first) and the cursor of the next older page, updated together
+  const [feed, setFeed] = useState({ events: [], nextCursor: null });
+  const { events, nextCursor } = feed;
   const [logs, setLogs] = useState([]);
   const { user, logout } = useAuth();
 
+  // Newest page merged in at the head, so older pages the responder already loaded stay put
   const fetchData = async () => {
     try {
       const [eventsRes, logsRes] = await Promise.all([
         responderApi.getEvents(),
         responderApi.getLogs()
       ]);
-      setEvents(eventsRes.data);
+      const page = eventsRes.data;
+      const cursor = eventsRes.headers['x-next-cursor'] || null;
+      setFeed(prev => {
+        const known = new Set(prev.events.map(e => e.id));
+        // More new incidents than one page: what is loaded no longer joins up, so start over from this page
+        if (!prev.events.length || (cursor && !known.has(page[page.length - 1].id))) {
+          return { events: page, nextCursor: cursor };
+        }
+        const fresh = new Set(page.map(e => e.id));
+        return { ...prev, events: [...page, ...prev.events.filter(e => !fresh.has(e.id))] };
+      });
       setLogs(logsRes.data);
     } catch (err) { console.error(err); }
   };
 
+  const loadOlder = async () => {
+    try {
+      const res = await responderApi.getEvents({ cursor: nextCursor });
+      setFeed(prev => ({ events: [...prev.events, ...res.data], nextCursor: res.headers['x-next-cursor'] || null }));
+    } catch (err) { console.error(err); }
+  };
+
   useEffect(() => {
     fetchData();
-    const interval = setInterval(fetchData, 3000);
-    return () => clearInterval(interval);
+    let interval = null;
+    // Refresh on lifecycle events instead of polling; (re)connecting also resyncs anything missed
+    const stream = responderApi.streamEvents();
+    ['event.created', 'event.acknowledged', 'event.resolved'].forEach((type) => stream.addEventListener(type, fetchData));
+    stream.onopen = fetchData;
+    stream.onerror = () => {
+      if (stream.readyState === EventSource.CLOSED && !interval) {
+        interval = setInterval(fetchData, 3000); // feed unavailable: fall back to polling
+      }
+    };
+    return () => {
+      stream.close();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   const handleAction = async (id, action) => {
@@ -153,6 +185,14 @@ export default function Dashboard() {
                 </div>
               ))
             )}
+            {nextCursor && (
+              <button
+                onClick={loadOlder}
+                className="w-full py-3 rounded-xl border border-slate-800 text-[10px] font-black uppercase tracking-widest text-slate-500 hover:text-white hover:border-slate-700 transition-all"
+              >
+                Load older incidents
+              </button>
+            )}
           </div>
         </section>
 
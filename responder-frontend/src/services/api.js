@@ -23,10 +23,16 @@ api.interceptors.request.use((config) => {
 export const responderApi = {
   login: (formData) => api.post('/login/access-token', formData),
   getMe: () => api.get('/users/me'),
-  getEvents: () => api.get('/responder/events'),
+  // Keyset-paginated: pass the previous response's X-Next-Cursor header as `cursor`
+  getEvents: (params = {}) => api.get('/responder/events', { params }),
   acknowledgeEvent: (eventId) => api.post(`/responder/events/${eventId}/acknowledge`),
   resolveEvent: (eventId) => api.post(`/responder/events/${eventId}/resolve`),
-  getLogs: () => api.get('/responder/logs'),
+  getLogs: (params = {}) => api.get('/responder/logs', { params }),
+  // Live feed: named events event.created / event.acknowledged / event.resolved
+  streamEvents: () => {
+    const token = localStorage.getItem('responder_token');
+    return new EventSource(`${api.defaults.baseURL}/responder/events/stream?token=${encodeURIComponent(token || '')}`);
+  },
 };
 
 export default api;